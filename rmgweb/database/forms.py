@@ -35,6 +35,7 @@ from django.utils.safestring import mark_safe
 from rmgpy.molecule.molecule import Molecule
 import rmgpy
 import copy
+import re
 import sys
 
 
@@ -263,8 +264,88 @@ class EniSearchForm(forms.Form):
             raise forms.ValidationError('Invalid SMILES entry.')
         return str(self.cleaned_data['deposit'])
     
+def parseMoleculeList(text):
+    """
+    Return a list of the :class:`Molecule` objects given in `text`, which may
+    contain adjacency lists separated by blank lines and SMILES strings, one
+    per line.
+    """
+    molecules = []
+    for block in re.split(r'\n\s*\n', text.strip().replace('\r', '')):
+        lines = [line.strip() for line in block.split('\n') if line.strip()]
+        if not lines:
+            continue
+        # SMILES never start with a digit, but adjacency list lines do
+        if any([line.startswith('multiplicity') or line[0].isdigit() for line in lines[:2]]):
+            molecules.append(Molecule().fromAdjacencyList(block))
+        else:
+            for line in lines:
+                molecules.append(Molecule().fromSMILES(str(line)))
+    return molecules
+
+class EniBatchForm(forms.Form):
+    """
+    Form for screening a list of detergents against a list of deposits
+    """
+    detergents = forms.CharField(label="Detergents", widget=forms.widgets.Textarea(attrs={'rows': 12, 'cols': 50}))
+    deposits = forms.CharField(label="Deposits", widget=forms.widgets.Textarea(attrs={'rows': 12, 'cols': 50}))
+    format = forms.ChoiceField(label="Output Format", choices=(('html', 'Table'), ('csv', 'CSV'), ('json', 'JSON')), initial='html')
+
+    def clean_detergents(self):
+        """
+        Return the list of detergent molecules
+        """
+        try:
+            return parseMoleculeList(str(self.cleaned_data['detergents']))
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            raise forms.ValidationError('Invalid SMILES or adjacency list entry.')
+
+    def clean_deposits(self):
+        """
+        Return the list of deposit molecules
+        """
+        try:
+            return parseMoleculeList(str(self.cleaned_data['deposits']))
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            raise forms.ValidationError('Invalid SMILES or adjacency list entry.')
+
+class DatabaseTableFilterForm(forms.Form):
+    """
+    Form for filtering the entries shown in a database table
+    """
+    label = forms.CharField(label="Label contains", required=False)
+    start = forms.IntegerField(label="From index", required=False)
+    end = forms.IntegerField(label="To index", required=False)
+    format = forms.ChoiceField(label="Data Format", required=False)
+
+    def __init__(self, *args, **kwargs):
+        dataFormats = kwargs.pop('dataFormats', [])
+        super(DatabaseTableFilterForm, self).__init__(*args, **kwargs)
+        self.fields['format'].choices = [('', 'All')] + [(dataFormat, dataFormat) for dataFormat in dataFormats]
+
+    def filter(self, entries):
+        """
+        Return the (entry, dataFormat) tuples in `entries` that match the
+        filter; the unfiltered list is returned if the form is invalid
+        """
+        if not self.is_valid():
+            return entries
+        label = self.cleaned_data['label'].lower()
+        start = self.cleaned_data['start']
+        end = self.cleaned_data['end']
+        dataFormat = self.cleaned_data['format']
+        return [(entry, entryFormat) for entry, entryFormat in entries
+                if (not label or label in entry.label.lower())
+                and (start is None or entry.index >= start)
+                and (end is None or entry.index <= end)
+                and (not dataFormat or entryFormat == dataFormat)]
+
 class ThermoEntryEditForm(forms.Form):
-    """ 
+    """
     Form for editing thermo database entries
     """
     entry = forms.CharField(label="Database Entry", widget = forms.Textarea(attrs={'cols': 80, 'rows': 40, 'class':'data_entry'}), required=True)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#	RMG Website - A Django-powered website for Reaction Mechanism Generator
+#
+#	Copyright (c) 2011 Prof. William H. Green (whgreen@mit.edu) and the
+#	RMG Team (rmg_dev@mit.edu)
+#
+#	Permission is hereby granted, free of charge, to any person obtaining a
+#	copy of this software and associated documentation files (the 'Software'),
+#	to deal in the Software without restriction, including without limitation
+#	the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#	and/or sell copies of the Software, and to permit persons to whom the
+#	Software is furnished to do so, subject to the following conditions:
+#
+#	The above copyright notice and this permission notice shall be included in
+#	all copies or substantial portions of the Software.
+#
+#	THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#	FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#	DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Delete the cached responses of the RMG-Java service, e.g. after RMG-Java has
+been redeployed with a different database::
+
+    python manage.py purge_rmgjava_cache [--expired]
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from rmgweb.database.rmgjava import RMGJavaCache
+
+class Command(BaseCommand):
+    help = 'Delete the cached responses of the RMG-Java service.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--expired', action='store_true', dest='expired', default=False,
+                            help='Only delete the responses older than RMG_JAVA_CACHE_TTL.')
+
+    def handle(self, *args, **options):
+        cache = RMGJavaCache(path=settings.RMG_JAVA_CACHE_PATH, ttl=settings.RMG_JAVA_CACHE_TTL)
+        count = cache.purge(expiredOnly=options['expired'])
+        self.stdout.write('Deleted {0:d} cached RMG-Java response(s) from {1}'.format(count, cache.path))
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#	RMG Website - A Django-powered website for Reaction Mechanism Generator
+#
+#	Copyright (c) 2011 Prof. William H. Green (whgreen@mit.edu) and the
+#	RMG Team (rmg_dev@mit.edu)
+#
+#	Permission is hereby granted, free of charge, to any person obtaining a
+#	copy of this software and associated documentation files (the 'Software'),
+#	to deal in the Software without restriction, including without limitation
+#	the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#	and/or sell copies of the Software, and to permit persons to whom the
+#	Software is furnished to do so, subject to the following conditions:
+#
+#	The above copyright notice and this permission notice shall be included in
+#	all copies or substantial portions of the Software.
+#
+#	THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#	FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#	DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+This module contains a client for the RMG-Java PopulateReactions service,
+which the website uses to estimate kinetics with RMG-Java, and a cache of
+its responses.
+
+The service reads a PopulateReactions input file from a TCP connection,
+writes back the resulting species dictionary and reactions, and then closes
+the connection, so each query needs a connection of its own.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+################################################################################
+
+class RMGJavaError(Exception):
+    """
+    An exception raised when the RMG-Java service cannot be queried.
+    """
+    pass
+
+class RMGJavaClient(object):
+    """
+    A client for the RMG-Java PopulateReactions service running at
+    `host`:`port`. The attributes are:
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `host`              The host name of the RMG-Java service
+    `port`              The port of the RMG-Java service
+    `timeout`           The socket timeout in seconds
+    `connections`       The maximum number of simultaneous connections
+    `retryInterval`     The number of seconds to wait after a failed query
+                        before trying to connect again
+    =================== ========================================================
+
+    Once the service is found to be down or misbehaving (refusing connections,
+    timing out, dropping connections or sending an empty or unreadable
+    response), queries fail immediately until `retryInterval` seconds have
+    passed, rather than each one waiting for the service to time out.
+    """
+
+    bufferSize = 65536
+
+    def __init__(self, host='localhost', port=5000, timeout=10, connections=4, retryInterval=60):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.connections = connections
+        self.retryInterval = retryInterval
+        self.semaphore = threading.BoundedSemaphore(connections)
+        self.lock = threading.Lock()
+        self.failedAt = None
+
+    def is_available(self):
+        """
+        Return ``False`` if the service failed within the last
+        `retryInterval` seconds, or ``True`` otherwise.
+        """
+        with self.lock:
+            return self.failedAt is None or time.time() - self.failedAt >= self.retryInterval
+
+    def set_failed(self):
+        """
+        Record that a query failed now, so that queries fail immediately for
+        the next `retryInterval` seconds.
+        """
+        with self.lock:
+            self.failedAt = time.time()
+
+    def query(self, request):
+        """
+        Send the PopulateReactions input `request` to the service and return
+        its complete response. Raises :class:`RMGJavaError` if the service
+        cannot be reached, times out or sends no response, or recently did.
+        """
+        if not self.is_available():
+            raise RMGJavaError('RMG-Java service at {0}:{1} is unavailable; not retrying until {2:g} s after the last failure.'.format(self.host, self.port, self.retryInterval))
+        with self.semaphore:
+            try:
+                client_socket = socket.create_connection((self.host, self.port), self.timeout)
+            except (IOError, socket.error), e:
+                self.set_failed()
+                raise RMGJavaError('Unable to connect to RMG-Java service at {0}:{1}: {2!s}'.format(self.host, self.port, e))
+            try:
+                client_socket.sendall(request)
+                chunks = []
+                while True:
+                    chunk = client_socket.recv(self.bufferSize)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            except (IOError, socket.error), e:
+                # Including socket.timeout, if the service stopped responding
+                self.set_failed()
+                raise RMGJavaError('Error while querying RMG-Java service at {0}:{1}: {2!s}'.format(self.host, self.port, e))
+            finally:
+                client_socket.close()
+        if not chunks:
+            self.set_failed()
+            raise RMGJavaError('RMG-Java service at {0}:{1} closed the connection without responding.'.format(self.host, self.port))
+        with self.lock:
+            self.failedAt = None
+        return ''.join(chunks)
+
+    def query_many(self, requests):
+        """
+        Send each of the PopulateReactions inputs in `requests` to the service,
+        using up to `connections` connections at once. Returns a list of the
+        responses in the same order as the requests, with the
+        :class:`RMGJavaError` raised by a request in place of its response if
+        it failed.
+        """
+        results = [None] * len(requests)
+
+        def worker(index, request):
+            try:
+                results[index] = self.query(request)
+            except RMGJavaError, e:
+                results[index] = e
+
+        threads = [threading.Thread(target=worker, args=(index, request)) for index, request in enumerate(requests)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+################################################################################
+
+class RMGJavaCache(object):
+    """
+    A cache on disk of the responses of the RMG-Java service, which only
+    change when RMG-Java is redeployed. Each response is stored as a JSON
+    file in the directory at `path`, named after a hash of its key, and
+    is discarded `ttl` seconds after it was stored. If `path` is ``None``
+    nothing is cached.
+    """
+
+    def __init__(self, path, ttl=None):
+        self.path = path
+        self.ttl = ttl
+
+    def get_filename(self, key):
+        """
+        Return the path of the file the response for `key` is stored in.
+        """
+        return os.path.join(self.path, hashlib.sha1(json.dumps(key)).hexdigest() + '.json')
+
+    def is_expired(self, filename):
+        """
+        Return ``True`` if the cached response in `filename` is older than
+        the time to live.
+        """
+        return self.ttl is not None and time.time() - os.stat(filename).st_mtime > self.ttl
+
+    def get(self, key):
+        """
+        Return the response cached for `key`, or ``None`` if there is none.
+        """
+        if self.path is None:
+            return None
+        filename = self.get_filename(key)
+        try:
+            if self.is_expired(filename):
+                return None
+            with open(filename) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        """
+        Cache the JSON-serializable response `value` for `key`.
+        """
+        if self.path is None:
+            return
+        filename = self.get_filename(key)
+        try:
+            if not os.path.exists(self.path):
+                os.makedirs(self.path)
+            # Write to a temporary file first so other processes never
+            # read a partly written response
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(value, f)
+            os.rename(tmp_path, filename)
+        except (IOError, OSError), e:
+            print "Unable to cache RMG-Java response in {0}: {1!s}".format(filename, e)
+
+    def purge(self, expiredOnly=False):
+        """
+        Delete the cached responses, or only those that have expired if
+        `expiredOnly` is ``True``. Returns the number of responses deleted.
+        """
+        if self.path is None or not os.path.isdir(self.path):
+            return 0
+        count = 0
+        for name in os.listdir(self.path):
+            filename = os.path.join(self.path, name)
+            if not name.endswith('.json') or (expiredOnly and not self.is_expired(filename)):
+                continue
+            os.remove(filename)
+            count += 1
+        return count
@@ -33,14 +33,24 @@ This module contains additional classes and functions used by the database
 app that don't belong to any other module.
 """
 
-import socket
+import copy
+import cPickle
+import gc
+import hashlib
+import subprocess
 import sys
 import os
+import tempfile
+import threading
+import time
+import weakref
 import rmgweb.settings
 import pybel
 import openbabel as ob
 import xlrd
 import itertools
+import multiprocessing
+import numpy
 
 
 from rmgpy.kinetics import Arrhenius
@@ -50,6 +60,7 @@ from rmgpy.reaction import Reaction
 from rmgpy.data.base import Entry
 from rmgpy.data.kinetics import TemplateReaction, DepositoryReaction
 from rmgweb.main.tools import *
+from rmgweb.database.rmgjava import RMGJavaCache, RMGJavaClient, RMGJavaError
 
 from rmgpy.data.thermo import ThermoDatabase
 from rmgpy.data.kinetics import KineticsDatabase
@@ -71,6 +82,11 @@ class RMGWebDatabase(object):
         self.database.solvation = SolvationDatabase()
         self.database.loadForbiddenStructures(os.path.join(rmgweb.settings.DATABASE_PATH, 'forbiddenStructures.py'))
         self.timestamps = {}
+        self.snapshot_path = rmgweb.settings.DATABASE_SNAPSHOT_PATH
+        self.snapshot_checked = False
+        self.last_checked = {}
+        self.versions = dict((component, 0) for component in ['thermo', 'transport', 'solvation', 'kinetics', 'statmech'])
+        self.entry_indices = weakref.WeakKeyDictionary()
 
     @property
     def kinetics(self):
@@ -117,25 +133,18 @@ class RMGWebDatabase(object):
         """
         Return True if the file at `path` has been modified since `reset_timestamp(path)` was last called.
         """
-        # If path doesn't denote a file and were previously
-        # tracking it, then it has been removed or the file type
-        # has changed, so return True.
-        if not os.path.isfile(path):
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            # If path doesn't exist and we were previously
+            # tracking it, then it has been removed, so return True.
             return path in self.timestamps
 
-        # If path wasn't being tracked then it's new, so return True
-        elif path not in self.timestamps:
-            return True
-
+        # If path wasn't being tracked then it's new, so return True.
         # Force restart when modification time has changed, even
         # if time now older, as that could indicate older file
         # has been restored.
-        elif os.stat(path).st_mtime != self.timestamps[path]:
-            return True
-
-        # All the checks have been passed, so the file was not modified
-        else:
-            return False
+        return self.timestamps.get(path) != mtime
 
     def is_dir_modified(self, dirpath):
         """
@@ -155,90 +164,393 @@ class RMGWebDatabase(object):
         # Passed all tests.
         return False
 
+    def is_check_due(self, dirpath):
+        """
+        Return True if the directory at dirpath should be checked for
+        modifications, i.e. if it has not been checked within the last
+        ``DATABASE_CHECK_INTERVAL`` seconds or has been expired.
+        """
+        now = time.time()
+        last_checked = self.last_checked.get(dirpath)
+        if last_checked is not None and now - last_checked < rmgweb.settings.DATABASE_CHECK_INTERVAL:
+            return False
+        self.last_checked[dirpath] = now
+        return True
+
+    def expire(self, path):
+        """
+        Force the next call to load() to check the directories containing the
+        file at `path`, e.g. after an entry has been saved through the website.
+        """
+        for dirpath in self.last_checked.keys():
+            if path.startswith(dirpath):
+                del self.last_checked[dirpath]
+
+    def get_modified_files(self, dirpath):
+        """
+        Return a list of the files in the directory tree at dirpath that have
+        been modified, added or removed since reset_dir_timestamps(dirpath).
+        """
+        modified = []
+        to_check = set([path for path in self.timestamps if path.startswith(dirpath)])
+        for root, dirs, files in os.walk(dirpath):
+            for name in files:
+                path = os.path.join(root, name)
+                if self.is_file_modified(path):
+                    modified.append(path)
+                to_check.discard(path)
+        # Anything left in to_check has probably been removed
+        for path in to_check:
+            if self.is_file_modified(path):
+                modified.append(path)
+        return modified
+
+    def is_dir_loaded(self, dirpath):
+        """
+        Return True if any file in the directory at dirpath is being tracked,
+        i.e. if the directory has been loaded before.
+        """
+        return any(path.startswith(dirpath) for path in self.timestamps)
+
+    def reset_file_timestamps(self, paths):
+        """
+        Reset the timestamps of the given files, and stop tracking any of them
+        that no longer exist.
+        """
+        for path in paths:
+            if os.path.isfile(path):
+                self.reset_timestamp(path)
+            else:
+                self.timestamps.pop(path, None)
+
     ################################################################################
 
+    def get_snapshot_key(self):
+        """
+        Return a key identifying the current state of the RMG database on disk.
+        The key is built from the git commit of the database repository and
+        the modification times of all files in it.
+        """
+        try:
+            commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                             cwd=rmgweb.settings.DATABASE_PATH,
+                                             stderr=subprocess.STDOUT).strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = ''
+        key = hashlib.sha1(commit)
+        for root, dirs, files in os.walk(rmgweb.settings.DATABASE_PATH):
+            # Walk in a fixed order so that the key is reproducible
+            dirs[:] = sorted([name for name in dirs if name != '.git'])
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                key.update('{0}\t{1!r}\n'.format(path, os.stat(path).st_mtime))
+        return key.hexdigest()
+
+    def save_snapshot(self, path, key):
+        """
+        Pickle the loaded database and its file timestamps to `path`, labeled
+        with the snapshot `key`. The snapshot is written to a temporary file
+        and then moved into place, so other processes never read a partial file.
+        """
+        directory = os.path.dirname(path)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                # The key is pickled separately so it can be checked without
+                # unpickling the whole database
+                cPickle.dump(key, f, cPickle.HIGHEST_PROTOCOL)
+                cPickle.dump((self.database, self.timestamps), f, cPickle.HIGHEST_PROTOCOL)
+            os.rename(tmp_path, path)
+        except:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        print "Saved database snapshot {0} in process {1}".format(path, os.getpid())
+
+    def load_snapshot(self, path):
+        """
+        Load the entire RMG database from the snapshot at `path` if it was made
+        from the database as it currently exists on disk. Otherwise parse the
+        whole database and write a new snapshot for other processes to use.
+        """
+        import rmgpy.data.rmg
+        self.snapshot_checked = True
+        key = self.get_snapshot_key()
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    if cPickle.load(f) == key:
+                        database, timestamps = cPickle.load(f)
+                        self.database = database
+                        self.timestamps = timestamps
+                        # RMG-Py looks up families through its module level database
+                        rmgpy.data.rmg.database = database
+                        for component in self.versions:
+                            self.versions[component] += 1
+                        print "Loaded database snapshot {0} in process {1}".format(path, os.getpid())
+                        return
+            except Exception, e:
+                print "Unable to read database snapshot {0}: {1!s}".format(path, e)
+
+        self.load()
+        try:
+            self.save_snapshot(path, key)
+        except Exception, e:
+            print "Unable to save database snapshot {0}: {1!s}".format(path, e)
+
     def load(self, component='', section=''):
         """
         Load the requested `component` of the RMG database if modified since last loaded.
+
+        Each directory is checked for modifications at most once every
+        ``DATABASE_CHECK_INTERVAL`` seconds, unless expired with :meth:`expire`.
+        Whenever a component is reloaded its counter in `versions` is
+        incremented, so that results cached from it can be discarded.
+
+        If a database snapshot is configured, the first call in each process
+        loads the entire database from it (see :meth:`load_snapshot`).
         """
+        if self.snapshot_path and not self.snapshot_checked:
+            self.load_snapshot(self.snapshot_path)
+
         if component in ['thermo', '']:
             if section in ['depository', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'thermo', 'depository')
-                if self.is_dir_modified(dirpath):
+                if self.is_check_due(dirpath) and self.is_dir_modified(dirpath):
                     self.database.thermo.loadDepository(dirpath)
                     self.reset_dir_timestamps(dirpath)
+                    self.versions['thermo'] += 1
             if section in ['libraries', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'thermo', 'libraries')
-                if self.is_dir_modified(dirpath):
-                    self.database.thermo.loadLibraries(dirpath)
-                    # put them in our preferred order, so that when we look up thermo in order to estimate kinetics,
-                    # we use our favorite values first.
-                    preferred_order = [
-                        'primaryThermoLibrary',
-                        'DFT_QCI_thermo',
-                        'GRI-Mech3.0',
-                        'CBS_QB3_1dHR',
-                        'KlippensteinH2O2',
-                    ]
-                    new_order = [i for i in preferred_order if i in self.database.thermo.libraryOrder]
-                    for i in self.database.thermo.libraryOrder:
-                        if i not in new_order:
-                            new_order.append(i)
-                    self.database.thermo.libraryOrder = new_order
-                    self.reset_dir_timestamps(dirpath)
+                if self.is_check_due(dirpath):
+                    modified = self.get_modified_files(dirpath)
+                else:
+                    modified = []
+                if modified:
+                    self.load_thermo_libraries(dirpath, modified)
+                    self.versions['thermo'] += 1
             if section in ['groups', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'thermo', 'groups')
-                if self.is_dir_modified(dirpath):
+                if self.is_check_due(dirpath) and self.is_dir_modified(dirpath):
                     self.database.thermo.loadGroups(dirpath)
                     self.reset_dir_timestamps(dirpath)
+                    self.versions['thermo'] += 1
 
         if component in ['transport', '']:
             if section in ['libraries', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'transport', 'libraries')
-                if self.is_dir_modified(dirpath):
+                if self.is_check_due(dirpath) and self.is_dir_modified(dirpath):
                     self.database.transport.loadLibraries(dirpath)
                     self.reset_dir_timestamps(dirpath)
+                    self.versions['transport'] += 1
             if section in ['groups', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'transport', 'groups')
-                if self.is_dir_modified(dirpath):
+                if self.is_check_due(dirpath) and self.is_dir_modified(dirpath):
                     self.database.transport.loadGroups(dirpath)
                     self.reset_dir_timestamps(dirpath)
+                    self.versions['transport'] += 1
 
         if component in ['solvation', '']:
             dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'solvation')
-            if self.is_dir_modified(dirpath):
+            if self.is_check_due(dirpath) and self.is_dir_modified(dirpath):
                 self.database.solvation.load(dirpath)
                 self.reset_dir_timestamps(dirpath)
+                self.versions['solvation'] += 1
 
         if component in ['kinetics', '']:
             if section in ['libraries', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'kinetics', 'libraries')
-                if self.is_dir_modified(dirpath):
-                    self.database.kinetics.loadLibraries(dirpath)
-                    self.reset_dir_timestamps(dirpath)
+                if self.is_check_due(dirpath):
+                    modified = self.get_modified_files(dirpath)
+                else:
+                    modified = []
+                if modified:
+                    self.load_kinetics_libraries(dirpath, modified)
+                    self.versions['kinetics'] += 1
             if section in ['families', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'kinetics', 'families')
-                if self.is_dir_modified(dirpath):
-                    self.database.kinetics.loadFamilies(dirpath, families='all', depositories='all')
-                    self.reset_dir_timestamps(dirpath)
-
-                    # Make sure to load the entire thermo database prior to adding training values to the rules
-                    self.load('thermo', '')
-                    for family in self.database.kinetics.families.values():
-                        oldentries = len(family.rules.entries)
-                        family.addKineticsRulesFromTrainingSet(thermoDatabase=self.database.thermo)
-                        newentries = len(family.rules.entries)
-                        if newentries != oldentries:
-                            print '{0} new entries added to {1} family after adding rules from training set.'.format(
-                                newentries - oldentries, family.label)
-                        # Filling in rate rules in kinetics families by averaging...
-                        family.fillKineticsRulesByAveragingUp()
+                if self.is_check_due(dirpath):
+                    modified = self.get_modified_files(dirpath)
+                else:
+                    modified = []
+                if modified:
+                    self.load_kinetics_families(dirpath, modified)
+                    self.versions['kinetics'] += 1
 
         if component in ['statmech', '']:
             dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'statmech')
-            if self.is_dir_modified(dirpath):
+            if self.is_check_due(dirpath) and self.is_dir_modified(dirpath):
                 self.database.statmech.load(dirpath)
                 self.reset_dir_timestamps(dirpath)
+                self.versions['statmech'] += 1
+
+    def load_thermo_libraries(self, dirpath, modified):
+        """
+        Load the thermo libraries in dirpath. If the libraries have been loaded
+        before, only the libraries whose files are in the list of `modified`
+        files are reloaded.
+        """
+        from rmgpy.data.thermo import ThermoLibrary
+        thermo = self.database.thermo
+        if not self.is_dir_loaded(dirpath):
+            thermo.loadLibraries(dirpath)
+            self.reset_dir_timestamps(dirpath)
+        else:
+            for path in modified:
+                label, ext = os.path.splitext(os.path.basename(path))
+                if ext.lower() != '.py':
+                    continue
+                if os.path.isfile(path):
+                    print "Reloading thermo library {0} in process {1}".format(label, os.getpid())
+                    library = ThermoLibrary()
+                    library.load(path, thermo.local_context, thermo.global_context)
+                    library.label = label
+                    thermo.libraries[label] = library
+                    if label not in thermo.libraryOrder:
+                        thermo.libraryOrder.append(label)
+                else:
+                    thermo.libraries.pop(label, None)
+                    if label in thermo.libraryOrder:
+                        thermo.libraryOrder.remove(label)
+            self.reset_file_timestamps(modified)
+
+        # put them in our preferred order, so that when we look up thermo in order to estimate kinetics,
+        # we use our favorite values first.
+        preferred_order = [
+            'primaryThermoLibrary',
+            'DFT_QCI_thermo',
+            'GRI-Mech3.0',
+            'CBS_QB3_1dHR',
+            'KlippensteinH2O2',
+        ]
+        new_order = [i for i in preferred_order if i in thermo.libraryOrder]
+        for i in thermo.libraryOrder:
+            if i not in new_order:
+                new_order.append(i)
+        thermo.libraryOrder = new_order
+
+    def load_kinetics_libraries(self, dirpath, modified):
+        """
+        Load the kinetics libraries in dirpath. If the libraries have been
+        loaded before, only the libraries containing one of the `modified`
+        files are reloaded.
+        """
+        from rmgpy.data.kinetics import KineticsLibrary
+        kinetics = self.database.kinetics
+        labels = set([os.path.dirname(os.path.relpath(path, dirpath)) for path in modified])
+        if not self.is_dir_loaded(dirpath) or '' in labels:
+            kinetics.loadLibraries(dirpath)
+            self.reset_dir_timestamps(dirpath)
+            return
+
+        for label in sorted(labels):
+            library_file = os.path.join(dirpath, label, 'reactions.py')
+            if os.path.isfile(library_file):
+                print "Reloading kinetics library {0} in process {1}".format(label, os.getpid())
+                library = KineticsLibrary(label=label)
+                library.load(library_file, kinetics.local_context, kinetics.global_context)
+                kinetics.libraries[label] = library
+                if label not in kinetics.libraryOrder:
+                    kinetics.libraryOrder.append(label)
+            else:
+                kinetics.libraries.pop(label, None)
+                if label in kinetics.libraryOrder:
+                    kinetics.libraryOrder.remove(label)
+        self.reset_file_timestamps(modified)
+
+    def load_kinetics_families(self, dirpath, modified):
+        """
+        Load the kinetics families in dirpath and fill in their rate rules.
+        If the families have been loaded before, only the families containing
+        one of the `modified` files are reloaded and retrained.
+        """
+        from rmgpy.data.kinetics import KineticsFamily
+        kinetics = self.database.kinetics
+        labels = set([os.path.relpath(path, dirpath).split(os.sep)[0] for path in modified])
+        shared = [path for path in modified if os.path.dirname(os.path.relpath(path, dirpath)) == '']
+        if not self.is_dir_loaded(dirpath) or shared:
+            # Either nothing is loaded yet or a file shared by all families changed
+            kinetics.loadFamilies(dirpath, families='all', depositories='all')
+            self.reset_dir_timestamps(dirpath)
+            families = kinetics.families.values()
+        else:
+            families = []
+            for label in sorted(labels):
+                family_path = os.path.join(dirpath, label)
+                if os.path.isdir(family_path):
+                    print "Reloading kinetics family {0} in process {1}".format(label, os.getpid())
+                    family = KineticsFamily(label=label)
+                    family.load(family_path, kinetics.local_context, kinetics.global_context, depositoryLabels='all')
+                    kinetics.families[label] = family
+                    families.append(family)
+                else:
+                    kinetics.families.pop(label, None)
+            self.reset_file_timestamps(modified)
+
+        # Make sure to load the entire thermo database prior to adding training values to the rules
+        self.load('thermo', '')
+        for family in families:
+            oldentries = len(family.rules.entries)
+            family.addKineticsRulesFromTrainingSet(thermoDatabase=self.database.thermo)
+            newentries = len(family.rules.entries)
+            if newentries != oldentries:
+                print '{0} new entries added to {1} family after adding rules from training set.'.format(
+                    newentries - oldentries, family.label)
+            # Filling in rate rules in kinetics families by averaging...
+            family.fillKineticsRulesByAveragingUp()
+
+    def get_entry_index(self, db):
+        """
+        Return a dictionary of the entries in the database `db` by their
+        index. The dictionary is built the first time it is needed for each
+        loaded database, and kept up to date by :meth:`set_entry`.
+        """
+        try:
+            return self.entry_indices[db]['entries']
+        except KeyError:
+            pass
+        entries = {}
+        for entry in db.entries.values():
+            # Some depositories hold lists of entries
+            for item in entry if isinstance(entry, list) else [entry]:
+                entries.setdefault(item.index, item)
+        indices = [index for index in entries if index > 0]
+        self.entry_indices[db] = {
+            'entries': entries,
+            'first': min(indices) if indices else None,
+            'last': max(indices) if indices else None,
+        }
+        return entries
+
+    def get_entry(self, db, index):
+        """
+        Return the entry in the database `db` with the given `index`, or
+        ``None`` if there is no such entry.
+        """
+        return self.get_entry_index(db).get(index)
+
+    def get_index_bounds(self, db):
+        """
+        Return the lowest and highest positive entry indices in the database
+        `db`, or ``None`` for both if it has no such entries.
+        """
+        self.get_entry_index(db)
+        return self.entry_indices[db]['first'], self.entry_indices[db]['last']
+
+    def set_entry(self, db, key, entry):
+        """
+        Store `entry` in the database `db` under `key`, keeping the index of
+        its entries up to date.
+        """
+        db.entries[key] = entry
+        entries = self.get_entry_index(db)
+        entries[entry.index] = entry
+        if entry.index > 0:
+            record = self.entry_indices[db]
+            record['first'] = min(record['first'] or entry.index, entry.index)
+            record['last'] = max(record['last'] or entry.index, entry.index)
 
     def get_transport_database(self, section, subsection):
         """
@@ -347,16 +659,113 @@ class RMGWebDatabase(object):
 
 ################################################################################
 
+# Resonance structures and thermo of species, keyed on the thermo version
+thermo_cache = LRUCache(rmgweb.settings.THERMO_CACHE_SIZE)
+
+def getCachedThermo(species, database, label, estimate):
+    """
+    Generate the resonance structures of the :class:`Species` object
+    `species` and return ``estimate(species)``, reusing the structures and
+    result cached for an isomorphic species under the same `label` until the
+    thermo database is reloaded. The species is given its own copy of the
+    cached structures.
+    """
+    key = (database.versions['thermo'], label, getMoleculeKey(species.molecule[0]))
+    cached = thermo_cache.get(key)
+    if cached is None:
+        species.generate_resonance_structures()
+        molecules = copy.deepcopy(species.molecule)
+        result = estimate(species)
+        thermo_cache.set(key, (molecules, result))
+    else:
+        molecules, result = cached
+        species.molecule = copy.deepcopy(molecules)
+    return result
+
 def generateSpeciesThermo(species, database):
     """
     Generate the thermodynamics data for a given :class:`Species` object
     `species` using the provided `database`.
     """
-    species.generate_resonance_structures()
-    species.thermo = database.thermo.getThermoData(species)
+    # Copy the thermo, since callers are free to modify it
+    species.thermo = copy.deepcopy(getCachedThermo(species, database, 'thermo', database.thermo.getThermoData))
+
+def getAllSpeciesThermoData(species, database):
+    """
+    Return all of the thermodynamics data available for a given
+    :class:`Species` object `species` in the provided `database`, as a list
+    of ``(data, library, entry)`` tuples. The data are copies, which callers
+    are free to modify, while the libraries and entries are those of the
+    database.
+    """
+    return [(copy.deepcopy(data), library, entry)
+            for data, library, entry in getCachedThermo(species, database, 'all', database.thermo.getAllThermoData)]
         
 ################################################################################
 
+def getMoleculeKey(molecule):
+    """
+    Return a hashable key that identifies the structure of the given
+    :class:`Molecule` object `molecule`, regardless of its atom ordering.
+    """
+    try:
+        return (molecule.toAugmentedInChI(), molecule.toSMILES())
+    except Exception:
+        # Not every structure can be converted to InChI, so fall back to
+        # the (non-canonical) adjacency list
+        return molecule.toAdjacencyList(removeH=False)
+
+def getSpeciesFingerprint(species):
+    """
+    Return a hashable fingerprint of the given :class:`Species` or
+    :class:`Molecule` object `species`. Isomorphic species, including
+    different resonance structures, always have the same fingerprint.
+    """
+    molecule = species.molecule[0] if isinstance(species, Species) else species
+    # The number of neighbours of each atom does not change between
+    # resonance structures, unlike the bond orders
+    degrees = sorted([(atom.element.symbol, len(atom.bonds)) for atom in molecule.atoms])
+    return (molecule.getFormula(), tuple(degrees))
+
+def getReactionFingerprint(reaction):
+    """
+    Return a hashable fingerprint of the given :class:`Reaction` object
+    `reaction`. Reactions that are isomorphic in either direction always have
+    the same fingerprint.
+    """
+    reactants = tuple(sorted([getSpeciesFingerprint(species) for species in reaction.reactants]))
+    products = tuple(sorted([getSpeciesFingerprint(species) for species in reaction.products]))
+    return tuple(sorted([reactants, products]))
+
+class ReactionIndex(object):
+    """
+    A mapping from reactions to values that finds the value stored for an
+    isomorphic reaction, only running full isomorphism checks against the
+    reactions sharing its fingerprint.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+
+    def get(self, reaction, default=None):
+        """
+        Return the value stored for a reaction isomorphic (in either
+        direction) to `reaction`, or `default` if there is none.
+        """
+        for rxn, value in self.buckets.get(getReactionFingerprint(reaction), []):
+            if reaction.isIsomorphic(rxn):
+                return value
+        return default
+
+    def add(self, reaction, value):
+        """
+        Store `value` for `reaction`.
+        """
+        self.buckets.setdefault(getReactionFingerprint(reaction), []).append((reaction, value))
+
+# Results of generateReactions(), keyed on the search and database versions
+reaction_cache = LRUCache(rmgweb.settings.KINETICS_SEARCH_CACHE_SIZE)
+
 def generateReactions(database, reactants, products=None, only_families=None, resonance=True):
     """
     Generate the reactions (and associated kinetics) for a given set of
@@ -367,94 +776,289 @@ def generateReactions(database, reactants, products=None, only_families=None, re
 
     If `only_families` is a list of strings, only those labeled families are 
     used: no libraries and no RMG-Java kinetics are returned.
+
+    Results are cached until the kinetics or thermo database is reloaded.
     """
-    from rmgpy.rmg.model import getFamilyLibraryObject
-    # get RMG-py reactions
-    reaction_list = database.kinetics.generate_reactions(reactants, products, only_families=only_families, resonance=resonance)
-    if len(reactants) == 1:
-        # if only one reactant, react it with itself bimolecularly, with RMG-py
-        # the java version already does this (it includes A+A reactions when you react A)
-        reactants2 = [reactants[0], reactants[0]]
-        reaction_list.extend(database.kinetics.generate_reactions(reactants2, products, only_families=only_families, resonance=resonance))
-    
+    # Return copies so callers can change the reactions without changing the cache
+    return copyReactions(getCachedReactions(database, reactants, products, only_families, resonance))
+
+def getCachedReactions(database, reactants, products=None, only_families=None, resonance=True):
+    """
+    Return the cached list of reactions found by :func:`generateReactions`
+    for the given arguments, generating it if needed. The reactions are
+    shared with the cache, so must not be changed; use :func:`copyReactions`
+    to get copies of those that need to be.
+    """
+    if isinstance(only_families, list):
+        families_key = tuple(only_families)
+    else:
+        families_key = only_families
+    key = (
+        database.versions['kinetics'],
+        database.versions['thermo'],
+        tuple([getMoleculeKey(molecule) for molecule in reactants]),
+        tuple([getMoleculeKey(molecule) for molecule in products]) if products is not None else None,
+        families_key,
+        resonance,
+    )
+    reaction_data_list = reaction_cache.get(key)
+    if reaction_data_list is None:
+        reaction_data_list = generateReactionsFromDatabase(database, reactants, products, only_families, resonance)
+        reaction_cache.set(key, reaction_data_list)
+    return reaction_data_list
+
+def copyReactions(reactions):
+    """
+    Return deep copies of the given `reactions`, which still share the
+    depositories, libraries, entries and templates they came from with the
+    database rather than copying them too.
+    """
+    memo = {}
+    for reaction in reactions:
+        for name in ['depository', 'library', 'entry']:
+            item = getattr(reaction, name, None)
+            if item is not None:
+                memo[id(item)] = item
+        for item in getattr(reaction, 'template', None) or []:
+            memo[id(item)] = item
+    return copy.deepcopy(reactions, memo)
+
+def generateReactionsFromDatabase(database, reactants, products=None, only_families=None, resonance=True):
+    """
+    Generate the reactions (and associated kinetics) for a given set of
+    `reactants` and an optional set of `products` without using the cache.
+    See :func:`generateReactions`.
+
+    If ``KINETICS_SEARCH_PROCESSES`` is greater than one, the families are
+    searched in parallel by a pool of worker processes.
+    """
+    if rmgweb.settings.KINETICS_SEARCH_PROCESSES > 1:
+        # Search the libraries here and the families in the worker processes
+        estimates = []
+        if only_families is None:
+            for reaction in generateLibraryReactions(database, reactants, products):
+                estimates.append((reaction, None))
+        labels = sorted([label for label in database.kinetics.families
+                         if only_families is None or label in only_families])
+        tasks = [(label, reactants, products, resonance) for label in labels]
+        pool = getSearchPool(database)
+        try:
+            results = pool.map(generateFamilyReactions, tasks)
+        finally:
+            releaseSearchPool(pool)
+        for family_estimates in results:
+            for reaction, kineticsList in family_estimates:
+                for rxn, reference in kineticsList:
+                    if reference is not None:
+                        # Point the reaction back at our own depository entry
+                        resolveDepositoryReaction(database, rxn, reference)
+                estimates.append((reaction, [rxn for rxn, reference in kineticsList]))
+    else:
+        # get RMG-py reactions
+        reaction_list = database.kinetics.generate_reactions(reactants, products, only_families=only_families, resonance=resonance)
+        if len(reactants) == 1:
+            # if only one reactant, react it with itself bimolecularly, with RMG-py
+            # the java version already does this (it includes A+A reactions when you react A)
+            reactants2 = [reactants[0], reactants[0]]
+            reaction_list.extend(database.kinetics.generate_reactions(reactants2, products, only_families=only_families, resonance=resonance))
+        estimates = []
+        for reaction in reaction_list:
+            # If the reaction already has kinetics (e.g. from a library),
+            # assume the kinetics are satisfactory
+            if reaction.kinetics is not None:
+                estimates.append((reaction, None))
+            else:
+                estimates.append((reaction, estimateReactionKinetics(reaction)))
+
     # get RMG-py kinetics
     reaction_data_list = []
-    template_reactions = []
-    for reaction in reaction_list:
-        # If the reaction already has kinetics (e.g. from a library),
-        # assume the kinetics are satisfactory
-        if reaction.kinetics is not None:
+    template_reactions = ReactionIndex()
+    for reaction, kineticsList in estimates:
+        if kineticsList is None:
             reaction_data_list.append(reaction)
-        else:
-            # Set the reaction kinetics
-            # Only reactions from families should be missing kinetics
-            assert isinstance(reaction, TemplateReaction)
+            continue
 
-            # Determine if we've already processed an isomorphic reaction with a different template
+        # Determine if we've already processed an isomorphic reaction with a different template
+        t_rxn = template_reactions.get(reaction)
+        if t_rxn is not None:
+            assert set(reaction.template) != set(t_rxn.template), 'There should not be duplicate reactions with identical templates.'
+            duplicate = True
+        else:
+            # We haven't encountered this reaction yet, so add it to the index
             duplicate = False
-            for t_rxn in template_reactions:
-                if reaction.isIsomorphic(t_rxn):
-                    assert set(reaction.template) != set(t_rxn.template), 'There should not be duplicate reactions with identical templates.'
-                    duplicate = True
+            template_reactions.add(reaction, reaction)
+
+        for rxn in kineticsList:
+            if duplicate and not (isinstance(rxn, TemplateReaction) and rxn.estimator == 'rate rules'):
+                # We've already processed this reaction with a different template,
+                # so we only need the new rate rule estimates
+                continue
+            reaction_data_list.append(rxn)
+
+    return reaction_data_list
+
+def estimateReactionKinetics(reaction):
+    """
+    Return a list of reactions, one for each kinetics estimate that the
+    family of the given :class:`TemplateReaction` `reaction` provides for it.
+    """
+    from rmgpy.rmg.model import getFamilyLibraryObject
+    # Only reactions from families should be missing kinetics
+    assert isinstance(reaction, TemplateReaction)
+
+    # Get all of the kinetics for the reaction
+    family = getFamilyLibraryObject(reaction.family)
+    kineticsList = family.getKinetics(reaction, templateLabels=reaction.template, degeneracy=reaction.degeneracy, returnAllKinetics=True)
+    if family.ownReverse and hasattr(reaction,'reverse'):
+        kineticsListReverse = family.getKinetics(reaction.reverse, templateLabels=reaction.reverse.template, degeneracy=reaction.reverse.degeneracy, returnAllKinetics=True)
+        for kinetics, source, entry, isForward in kineticsListReverse:
+            for kinetics0, source0, entry0, isForward0 in kineticsList:
+                if source0 is not None and source is not None and entry0 is entry and isForward != isForward0:
+                    # We already have this estimate from the forward direction, so don't duplicate it in the results
                     break
             else:
-                # We haven't encountered this reaction yet, so add it to the list
-                template_reactions.append(reaction)
-
-            # Get all of the kinetics for the reaction
-            family = getFamilyLibraryObject(reaction.family)
-            kineticsList = family.getKinetics(reaction, templateLabels=reaction.template, degeneracy=reaction.degeneracy, returnAllKinetics=True)
-            if family.ownReverse and hasattr(reaction,'reverse'):
-                kineticsListReverse = family.getKinetics(reaction.reverse, templateLabels=reaction.reverse.template, degeneracy=reaction.reverse.degeneracy, returnAllKinetics=True)
-                for kinetics, source, entry, isForward in kineticsListReverse:
-                    for kinetics0, source0, entry0, isForward0 in kineticsList:
-                        if source0 is not None and source is not None and entry0 is entry and isForward != isForward0:
-                            # We already have this estimate from the forward direction, so don't duplicate it in the results
-                            break
-                    else:
-                        kineticsList.append([kinetics, source, entry, not isForward])
-                # We're done with the "reverse" attribute, so delete it to save a bit of memory
-                delattr(reaction,'reverse')
-            # Make a new reaction object for each kinetics result
-            for kinetics, source, entry, isForward in kineticsList:
-                if duplicate and source != 'rate rules':
-                    # We've already processed this reaction with a different template,
-                    # so we only need the new rate rule estimates
-                    continue
+                kineticsList.append([kinetics, source, entry, not isForward])
+        # We're done with the "reverse" attribute, so delete it to save a bit of memory
+        delattr(reaction,'reverse')
 
-                if isForward:
-                    reactant_species = reaction.reactants[:]
-                    product_species = reaction.products[:]
-                else:
-                    reactant_species = reaction.products[:]
-                    product_species = reaction.reactants[:]
-                
-                if source == 'rate rules' or source == 'group additivity':
-                    rxn = TemplateReaction(
-                        reactants = reactant_species,
-                        products = product_species,
-                        kinetics = kinetics,
-                        degeneracy = reaction.degeneracy,
-                        reversible = reaction.reversible,
-                        family = reaction.family,
-                        estimator = source,
-                        template = reaction.template,
-                    )
-                else:
-                    rxn = DepositoryReaction(
-                        reactants = reactant_species,
-                        products = product_species,
-                        kinetics = kinetics,
-                        degeneracy = reaction.degeneracy,
-                        reversible = reaction.reversible,
-                        depository = source,
-                        family = reaction.family,
-                        entry = entry,
-                    )                    
-                    
-                reaction_data_list.append(rxn)
+    # Make a new reaction object for each kinetics result
+    reaction_data_list = []
+    for kinetics, source, entry, isForward in kineticsList:
+        if isForward:
+            reactant_species = reaction.reactants[:]
+            product_species = reaction.products[:]
+        else:
+            reactant_species = reaction.products[:]
+            product_species = reaction.reactants[:]
+
+        if source == 'rate rules' or source == 'group additivity':
+            rxn = TemplateReaction(
+                reactants = reactant_species,
+                products = product_species,
+                kinetics = kinetics,
+                degeneracy = reaction.degeneracy,
+                reversible = reaction.reversible,
+                family = reaction.family,
+                estimator = source,
+                template = reaction.template,
+            )
+        else:
+            rxn = DepositoryReaction(
+                reactants = reactant_species,
+                products = product_species,
+                kinetics = kinetics,
+                degeneracy = reaction.degeneracy,
+                reversible = reaction.reversible,
+                depository = source,
+                family = reaction.family,
+                entry = entry,
+            )
+
+        reaction_data_list.append(rxn)
 
     return reaction_data_list
+
+def generateLibraryReactions(database, reactants, products=None):
+    """
+    Generate the reactions for a given set of `reactants` and an optional set
+    of `products` from the kinetics libraries only.
+    """
+    reaction_list = database.kinetics.generate_reactions_from_libraries(reactants, products)
+    if len(reactants) == 1:
+        reactants2 = [reactants[0], reactants[0]]
+        reaction_list.extend(database.kinetics.generate_reactions_from_libraries(reactants2, products))
+    return reaction_list
+
+def generateFamilyReactions(task):
+    """
+    Generate the reactions for a single kinetics family and estimate their
+    kinetics. This runs in a worker process of the kinetics search pool, so
+    `task` is a tuple of the family label, reactants, products and resonance
+    flag, and the reactions returned must be cheap to send back.
+
+    Returns a list of ``(reaction, kineticsList)`` tuples, where each item in
+    `kineticsList` is a ``(reaction, reference)`` tuple. For a depository
+    estimate the reference is the ``(depository label, entry index)`` of the
+    entry, which :func:`resolveDepositoryReaction` uses to set the depository
+    and entry again in the parent process.
+    """
+    label, reactants, products, resonance = task
+    reaction_list = database.kinetics.generate_reactions_from_families(reactants, products, only_families=[label], resonance=resonance)
+    if len(reactants) == 1:
+        reactants2 = [reactants[0], reactants[0]]
+        reaction_list.extend(database.kinetics.generate_reactions_from_families(reactants2, products, only_families=[label], resonance=resonance))
+
+    results = []
+    for reaction in reaction_list:
+        kineticsList = []
+        for rxn in estimateReactionKinetics(reaction):
+            reference = None
+            if isinstance(rxn, DepositoryReaction):
+                # Don't send the whole depository back with the reaction
+                reference = (rxn.depository.label, rxn.entry.index)
+                rxn.depository = None
+                rxn.entry = None
+            kineticsList.append((rxn, reference))
+        results.append((reaction, kineticsList))
+    return results
+
+def resolveDepositoryReaction(database, reaction, reference):
+    """
+    Set the depository and entry of the :class:`DepositoryReaction`
+    `reaction` from the ``(depository label, entry index)`` `reference`
+    returned by :func:`generateFamilyReactions`.
+    """
+    depositoryLabel, index = reference
+    family = database.kinetics.families[reaction.family]
+    for depository in family.depositories:
+        if depository.label == depositoryLabel:
+            reaction.depository = depository
+            # The depository itself is keyed on 'index:label', not the index
+            reaction.entry = database.get_entry_index(depository)[index]
+            break
+    else:
+        raise ValueError('Unable to find depository {0} in family {1}.'.format(depositoryLabel, reaction.family))
+
+# The pool of worker processes used for kinetics searches, the database
+# versions it was forked from, and the number of searches using each pool
+search_pool = None
+search_pool_versions = None
+search_pool_users = {}
+search_pool_lock = threading.Lock()
+
+def getSearchPool(database):
+    """
+    Return the pool of worker processes used to search the kinetics families.
+    The workers are forked from this process, so they share its loaded
+    database; the pool is replaced whenever the database has been reloaded
+    since it was created. Each call must be matched by a call to
+    :func:`releaseSearchPool` once the search is done with the pool.
+    """
+    global search_pool, search_pool_versions
+    versions = sorted(database.versions.items())
+    with search_pool_lock:
+        if search_pool is None or search_pool_versions != versions:
+            old_pool = search_pool
+            search_pool = multiprocessing.Pool(rmgweb.settings.KINETICS_SEARCH_PROCESSES)
+            search_pool_versions = versions
+            search_pool_users[search_pool] = 0
+            if old_pool is not None and search_pool_users[old_pool] == 0:
+                # Otherwise the last search using it closes it
+                del search_pool_users[old_pool]
+                old_pool.terminate()
+        search_pool_users[search_pool] += 1
+        return search_pool
+
+def releaseSearchPool(pool):
+    """
+    Release the `pool` returned by :func:`getSearchPool`, closing it if it
+    has been replaced and no other search is still using it.
+    """
+    with search_pool_lock:
+        search_pool_users[pool] -= 1
+        if pool is not search_pool and search_pool_users[pool] == 0:
+            del search_pool_users[pool]
+            pool.terminate()
     
 ################################################################################
 
@@ -476,6 +1080,21 @@ def reactionHasReactants(reaction, reactants):
             return True
     return False
 
+# Cache of the responses from the RMG-Java service
+rmgjava_cache = RMGJavaCache(
+    path = rmgweb.settings.RMG_JAVA_CACHE_PATH,
+    ttl = rmgweb.settings.RMG_JAVA_CACHE_TTL,
+)
+
+# Client for the RMG-Java service used to estimate kinetics
+rmgjava_client = RMGJavaClient(
+    host = rmgweb.settings.RMG_JAVA_HOST,
+    port = rmgweb.settings.RMG_JAVA_PORT,
+    timeout = rmgweb.settings.RMG_JAVA_TIMEOUT,
+    connections = rmgweb.settings.RMG_JAVA_CONNECTIONS,
+    retryInterval = rmgweb.settings.RMG_JAVA_RETRY_INTERVAL,
+)
+
 def getRMGJavaKineticsFromReaction(reaction):
     """
     Get the kinetics for the given `reaction` (with reactants and products as :class:`Species`)
@@ -506,7 +1125,96 @@ def getRMGJavaKinetics(reactantList, productList=None):
     to the RMG-Java service, then parse the output to find the kinetics of
     the reaction we are interested in.
     """
-    
+    return getRMGJavaKineticsList([(reactantList, productList)])[0]
+
+def getRMGJavaKineticsList(queries):
+    """
+    Get the kinetics as estimated by RMG-Java for each ``(reactantList,
+    productList)`` tuple in `queries`, sending the queries to the RMG-Java
+    service at the same time. Returns a list with the list of reactions
+    found for each query. See :func:`getRMGJavaKinetics`.
+
+    The responses are cached on disk by reactant set, so repeated queries
+    do not contact the service again.
+    """
+    requests = [getRMGJavaRequest(reactantList) for reactantList, productList in queries]
+    keys = [getRMGJavaCacheKey(reactantList) for reactantList, productList in queries]
+
+    # Only query the service for the reactant sets that aren't cached
+    responses = {}
+    for key in keys:
+        cached = rmgjava_cache.get(key)
+        if cached is not None:
+            # JSON gives us unicode strings, but RMG-Py expects str
+            species_list, reactions_list = cached
+            cached = ([(str(name), str(adjlist)) for name, adjlist in species_list], [str(line) for line in reactions_list])
+        responses[key] = cached
+    missing = sorted(dict([(key, request) for key, request in zip(keys, requests) if responses[key] is None]).items())
+    if missing:
+        print "SENDING {0:d} REQUEST(S) FOR RMG-JAVA SEARCH TO SERVER".format(len(missing))
+        results = rmgjava_client.query_many([request for key, request in missing])
+        print "FINISHED REQUEST(S) TO SERVER"
+        for (key, request), response in zip(missing, results):
+            if isinstance(response, RMGJavaError):
+                print >> sys.stderr, 'Unable to query RMG-Java for kinetics. (Is the RMG-Java server running?)'
+                print >> sys.stderr, str(response)
+                sys.stderr.flush()
+                continue
+            # Clean response from server
+            try:
+                responses[key] = cleanRMGJavaResponse(response)
+            except:
+                # Return an empty reaction list if an error occurred on the java server side,
+                # instead of having the website crash.
+                rmgjava_client.set_failed()
+                print "AN ERROR OCCURRED IN THE JAVA SERVER."
+                print response
+                continue
+            rmgjava_cache.set(key, responses[key])
+
+    reactionLists = []
+    for key, (reactantList, productList) in zip(keys, queries):
+        if responses[key] is None:
+            reactionLists.append([])
+        else:
+            species_list, reactions_list = responses[key]
+            reactionLists.append(parseRMGJavaResponse(species_list, reactions_list, reactantList, productList))
+    return reactionLists
+
+def getRMGJavaCacheKey(reactantList):
+    """
+    Return the key under which the RMG-Java response for the given
+    `reactantList` is cached, which identifies the set of distinct reactants
+    regardless of their order.
+    """
+    return tuple(sorted(set([getMoleculeKey(reactant) for reactant in reactantList])))
+
+def getRMGJavaRequest(reactantList):
+    """
+    Return the PopulateReactions input used to query RMG-Java for the
+    reactions of the :class:`Molecule` objects in `reactantList`.
+    """
+    # Generate species list for Java request
+    popreactants = ''
+    added_reactants = set()
+    for index, reactant in enumerate(reactantList):
+        assert isinstance(reactant, Molecule)
+        reactant.clearLabeledAtoms()
+        for r in added_reactants:
+            if r.isIsomorphic(reactant):
+                break # already added this reactant
+        else: # exhausted the added_reactants list without finding duplicate and breaking
+            added_reactants.add(reactant)
+            popreactants += 'reactant{0:d} (molecule/cm3) 1\n{1}\n\n'.format(index+1, reactant.toAdjacencyList(removeLonePairs=True))
+    popreactants += 'END\n'
+    return popreactants
+
+def cleanRMGJavaResponse(response):
+    """
+    Split the `response` of the RMG-Java service to a PopulateReactions job
+    into a list of the (name, adjacency list) of each species and a list of
+    the reaction lines.
+    """
     def formSpecies(species):
         """
         This function takes a species string from RMG-Java containing both name
@@ -517,26 +1225,26 @@ def getRMGJavaKinetics(reactantList, productList=None):
         adjlist = "\n".join(lines[1:])
         return species_name, adjlist
 
-    def cleanResponse(response):
-        """
-        This function cleans up response from PopulateReactions server and gives a
-        species dictionary and reactions list.
-        """
-    
-        # Split species dictionary from reactions list
-        response = response.split("\n\n\n")
-        species_list = response[0].split("\n\n")
-        reactions = response[1].split("\n\n")
-        reactions = reactions[1]
-    
-        # split species into adjacency lists with names
-        species_dict = [formSpecies(item) for item in species_list]
-    
-        # split reactions into list of single line reactions
-        reactions_list = reactions.split("\n")
-    
-        return species_dict, reactions_list
-    
+    # Split species dictionary from reactions list
+    response = response.split("\n\n\n")
+    species_list = response[0].split("\n\n")
+    reactions = response[1].split("\n\n")
+    reactions = reactions[1]
+
+    # split species into adjacency lists with names
+    species_dict = [formSpecies(item) for item in species_list]
+
+    # split reactions into list of single line reactions
+    reactions_list = reactions.split("\n")
+
+    return species_dict, reactions_list
+
+def parseRMGJavaResponse(species_list, reactions_list, reactantList, productList=None):
+    """
+    Return a list of the reactions with the given reactants and, optionally,
+    products in the RMG-Java response to a PopulateReactions job for the
+    given `reactantList`, as split by :func:`cleanRMGJavaResponse`.
+    """
     def searchReaction(reactionline, reactantNames, productNames):
         """
         Reads reaction line and returns True if reaction occurs:
@@ -600,14 +1308,14 @@ def getRMGJavaKinetics(reactantList, productList=None):
     
         return reactants, products, kinetics, entry
     
-    def identifySpecies(species_dict, molecule):
+    def identifySpecies(species_index, molecule):
         """
-        Given a species_dict list and the species adjacency list, identifies
-        whether species is found in the list and returns its name if found.
+        Given a species_index dictionary of the (name, molecule) pairs in the
+        species dictionary for each formula, identifies whether the species
+        `molecule` is found in it and returns its name if found.
         """
         resonance_isomers = molecule.generate_resonance_structures()
-        for name, adjlist in species_dict:
-            listmolecule = Molecule().fromAdjacencyList(adjlist, saturateH=True)
+        for name, listmolecule in species_index.get(molecule.getFormula(), []):
             for isomer in resonance_isomers:
                 if isomer.isIsomorphic(listmolecule):
                     return name
@@ -616,65 +1324,27 @@ def getRMGJavaKinetics(reactantList, productList=None):
     productList = productList or []
     reactionList = []
 
-    # Generate species list for Java request
-    popreactants = ''
-    added_reactants = set()
-    for index, reactant in enumerate(reactantList):
-        assert isinstance(reactant, Molecule)
-        reactant.clearLabeledAtoms()
-        for r in added_reactants:
-            if r.isIsomorphic(reactant):
-                break # already added this reactant
-        else: # exhausted the added_reactants list without finding duplicate and breaking
-            added_reactants.add(reactant)
-            popreactants += 'reactant{0:d} (molecule/cm3) 1\n{1}\n\n'.format(index+1, reactant.toAdjacencyList(removeLonePairs=True))
-    popreactants += 'END\n'
-    
-    
-    # First send search request to PopulateReactions server
-    client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    client_socket.settimeout(10)
-    try:
-        client_socket.connect(("localhost", 5000))
-    except IOError:
-        print >> sys.stderr, 'Unable to query RMG-Java for kinetics. (Is the RMG-Java server running?)'
-        sys.stderr.flush()
-        return reactionList
-    
-    # Send request to server
-    print "SENDING REQUEST FOR RMG-JAVA SEARCH TO SERVER"
-    client_socket.sendall(popreactants)
-    partial_response = client_socket.recv(512)
-    response = partial_response
-    while partial_response:
-        partial_response = client_socket.recv(512)
-        response += partial_response
-    client_socket.close()
-    print "FINISHED REQUEST. CLOSED CONNECTION TO SERVER"
-    # Clean response from server
-    try:
-        species_dict, reactions_list = cleanResponse(response)
-    except:
-        # Return an empty reaction list if an error occurred on the java server side,
-        # instead of having the website crash.
-        print "AN ERROR OCCURRED IN THE JAVA SERVER."
-        print response
-        return []
+    # Build each species in the response once, and index them by formula
+    species_dict = {}
+    species_index = {}
+    for name, adjlist in species_list:
+        listmolecule = Molecule().fromAdjacencyList(adjlist, saturateH=True)
+        species_dict[name] = listmolecule
+        species_index.setdefault(listmolecule.getFormula(), []).append((name, listmolecule))
 
     # Name the species in reaction
     reactantNames = []
     for reactant in reactantList:
-        reactantNames.append(identifySpecies(species_dict, reactant))
+        reactantNames.append(identifySpecies(species_index, reactant))
     productNames = []
     for product in productList:
-        productNames.append(identifySpecies(species_dict, product))
-        # identifySpecies(species_dict, product) returns "False" if it can't find product
-        if not identifySpecies(species_dict, product):
+        productName = identifySpecies(species_index, product)
+        productNames.append(productName)
+        # identifySpecies(species_index, product) returns "False" if it can't find product
+        if not productName:
             print "Could not find this requested product in the species dictionary from RMG-Java:"
             print str(product)
     
-    species_dict = dict([(key, Molecule().fromAdjacencyList(value,saturateH=True)) for key, value in species_dict])
-    
     # Both products were actually found in species dictionary or were blank
     reaction = None
     if all(productNames):
@@ -717,108 +1387,87 @@ def getRMGJavaKinetics(reactantList, productList=None):
     
     return reactionList
 
-def getAbrahamAB(smiles):
+# The Platts functional groups used to estimate the Abraham descriptors,
+# loaded from groups.xls when first needed
+platts_groups = {}
+platts_groups_lock = threading.Lock()
 
-    class functionalgroup():
-        """
-        functional group definitions and the associated A and B values for the Abraham hydrogen bonding descriptors
-        """
-        def __init__(self,SMART, name, data):
-            self.name = name
-            self.smarts = SMART
-            self.value = float()
-            self.value = data
-    
-    class query():
-        """
-        Defines the properties of a molecular query which may be the detergent molecule or dirt molecule
-        """
-        def __init__(self):
-            self.name = str()
-            self.smiles = str()
-            self.A = float()
-            self.B = float()
-        
-        def MatchPlattsAGroups(self, smiles):
-            
-            # Load functional group database
-            current_dir = os.getcwd()
-            filepath = os.path.join(current_dir, 'groups.xls')
-            wb = xlrd.open_workbook(filepath)
-            wb.sheet_names()
-        
-            data = wb.sheet_by_name(u'PlattsA')
-            col1 = data.col_values(0)
-            col2 = data.col_values(1)
-            col3 = data.col_values(2)
-        
-            databaseA = []
-            for (SMART, name, A) in zip(col1, col2, col3):
-                    databaseA.append(functionalgroup(SMART, name, A))
-            
-            platts_A = 0
-            mol = pybel.readstring("smi", smiles)
-            for x in databaseA:
-                # Initialize with dummy SMLES to check for validity of real one
-                smarts = pybel.Smarts("CC")
-                smarts.obsmarts = ob.OBSmartsPattern()
-                success = smarts.obsmarts.Init(x.smarts.__str__())
-                if success:
-                    smarts = pybel.Smarts(x.smarts.__str__())
-                else:
-                    print "Invalid SMARTS pattern", x.smarts.__str__()
-                    break
-                matched = smarts.findall(mol)
-                x.num = len(matched)
-                if (x.num > 0):
-                    print "Found group", x.smarts.__str__(), 'named', x.name, 'with contribution', x.value, 'to A', x.num, 'times'
-                platts_A += (x.num) * (x.value)
-                        
-            self.A = platts_A + 0.003
-               
-        def MatchPlattsBGroups(self, smiles):
-            
+def getPlattsGroups(sheet):
+    """
+    Return a list of the ``(smarts, name, value, pattern)`` of the Platts
+    functional groups in the `sheet` of groups.xls, where `pattern` is the
+    compiled :class:`pybel.Smarts` object. The spreadsheet is only read once.
+    """
+    with platts_groups_lock:
+        if sheet not in platts_groups:
             # Load functional group database
-            current_dir = os.getcwd()
-            filepath = os.path.join(current_dir, 'groups.xls')
+            filepath = os.path.join(rmgweb.settings.PROJECT_PATH, 'groups.xls')
             wb = xlrd.open_workbook(filepath)
-            wb.sheet_names()
-        
-            data = wb.sheet_by_name(u'PlattsB')
-            col1 = data.col_values(0)
-            col2 = data.col_values(1)
-            col3 = data.col_values(2)
-        
-            databaseB = []
-            for (SMART, name, B) in zip(col1, col2, col3):
-                    databaseB.append(functionalgroup(SMART, name, B))
-            
-            platts_B = 0
-            mol = pybel.readstring("smi", smiles)
-            for x in databaseB:
-                # Initialize with dummy SMLES to check for validity of real one
-                smarts = pybel.Smarts("CC")
-                smarts.obsmarts = ob.OBSmartsPattern()
-                success = smarts.obsmarts.Init(x.smarts.__str__())
-                if success:
-                    smarts = pybel.Smarts(x.smarts.__str__())
-                else:
-                    print "Invalid SMARTS pattern", x.smarts.__str__()
+            data = wb.sheet_by_name(sheet)
+
+            groups = []
+            for (SMART, name, value) in zip(data.col_values(0), data.col_values(1), data.col_values(2)):
+                SMART = str(SMART)
+                # Check the validity of the pattern first, as pybel fails badly on invalid ones
+                if not ob.OBSmartsPattern().Init(SMART):
+                    print "Invalid SMARTS pattern", SMART
                     break
-                matched = smarts.findall(mol)
-                x.num = len(matched)
-                if (x.num > 0):
-                    print "Found group", x.smarts.__str__(), 'named', x.name, 'with contribution', x.value, 'to B', x.num, 'times'
-                platts_B += (x.num) * (x.value)
-            
-            self.B = platts_B + 0.071 
+                groups.append((SMART, name, value, pybel.Smarts(SMART)))
+            platts_groups[sheet] = groups
+        return platts_groups[sheet]
 
-    molecule = query()
-    molecule.smiles = smiles
-    molecule.MatchPlattsAGroups(molecule.smiles)
-    molecule.MatchPlattsBGroups(molecule.smiles)
-    
-    return molecule.A, molecule.B
+def getAbrahamABList(smilesList):
+    """
+    Return a list of the Abraham hydrogen bonding descriptors A and B
+    estimated by Platts group additivity for each of the molecules in
+    `smilesList`, as ``(A, B)`` tuples.
+    """
+    groupsA = getPlattsGroups(u'PlattsA')
+    groupsB = getPlattsGroups(u'PlattsB')
+
+    # Count the occurrences of each group in each molecule
+    countsA = numpy.zeros((len(smilesList), len(groupsA)))
+    countsB = numpy.zeros((len(smilesList), len(groupsB)))
+    for i, smiles in enumerate(smilesList):
+        mol = pybel.readstring("smi", smiles)
+        for counts, groups, descriptor in [(countsA, groupsA, 'A'), (countsB, groupsB, 'B')]:
+            for j, (SMART, name, value, pattern) in enumerate(groups):
+                counts[i,j] = len(pattern.findall(mol))
+                if counts[i,j] > 0:
+                    print "Found group", SMART, 'named', name, 'with contribution', value, 'to', descriptor, int(counts[i,j]), 'times'
+
+    A = numpy.dot(countsA, numpy.array([value for SMART, name, value, pattern in groupsA])) + 0.003
+    B = numpy.dot(countsB, numpy.array([value for SMART, name, value, pattern in groupsB])) + 0.071
+    return [(float(a), float(b)) for a, b in zip(A, B)]
+
+def getAbrahamAB(smiles):
+    """
+    Return the Abraham hydrogen bonding descriptors A and B estimated by
+    Platts group additivity for the molecule with the given `smiles`.
+    """
+    return getAbrahamABList([smiles])[0]
+
+
+def getEniBindingStrengths(detergentSmiles, depositSmiles):
+    """
+    Estimate the binding strengths between each of the detergents and each of
+    the deposits with the given SMILES from their Abraham descriptors, which
+    are computed once per distinct molecule. Returns the arrays of detergent
+    and deposit A and B values and the matrices of the log binding constants
+    with the detergent as the donor (logK_AB) and as the acceptor (logK_BA).
+    """
+    uniqueSmiles = sorted(set(detergentSmiles) | set(depositSmiles))
+    descriptors = dict(zip(uniqueSmiles, getAbrahamABList(uniqueSmiles)))
+
+    detergentAB = numpy.array([descriptors[smiles] for smiles in detergentSmiles]).reshape(-1, 2)
+    depositAB = numpy.array([descriptors[smiles] for smiles in depositSmiles]).reshape(-1, 2)
+
+    # Estimating the binding strength assuming the the detergent to be the donor and dirt to be acceptor
+    logK_AB = 7.354 * numpy.outer(detergentAB[:,0], depositAB[:,1])
+    # Estimating the binding strength assuming the the detergent to be the acceptor and dirt to be donor
+    logK_BA = 7.354 * numpy.outer(detergentAB[:,1], depositAB[:,0])
+
+    return detergentAB, depositAB, logK_AB, logK_BA
 
 
 ################################################################################
@@ -826,4 +1475,23 @@ def getAbrahamAB(smiles):
 # Initialize module level database instance
 database = RMGWebDatabase()
 
+def preload():
+    """
+    Load the entire RMG database into the module level database instance.
+
+    This is meant to be called in a parent process before it forks its
+    workers (e.g. ``gunicorn --preload rmgweb.wsgi``), so that the workers
+    share the loaded database copy-on-write rather than each loading their
+    own copy. Garbage is collected afterwards so that the workers do not
+    inherit the garbage of loading. This does not keep the database pages
+    fully shared: the garbage collector of each worker still walks the
+    objects of the database and writes to their headers, which copies the
+    pages it touches. Where the runtime has ``gc.freeze()`` (Python 3.7 and
+    later) the database objects are moved out of the collector's reach.
+    """
+    database.load()
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+
 ################################################################################
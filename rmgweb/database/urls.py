@@ -97,6 +97,7 @@ urlpatterns = [
     url(r'^group/(?P<adjlist>[\S\s]+)$', views.groupEntry),
 
     # Eni detergent-dirt binding strength
+    url(r'^eni/batch/$', views.EniBatch),
     url(r'^eni', views.EniSearch),
 
     # AJAX request url
@@ -28,8 +28,10 @@
 #
 ################################################################################
 
+import copy
 import StringIO  # cStringIO is faster, but can't do Unicode
 import cookielib
+import csv
 import json
 import math
 import os
@@ -45,10 +47,12 @@ except ImportError:
     from BeautifulSoup import BeautifulSoup
 from django.contrib.auth.decorators import login_required
 from django.contrib.staticfiles.templatetags.staticfiles import static
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.core.urlresolvers import reverse
-from django.http import Http404, HttpResponseRedirect, HttpResponse
+from django.http import Http404, HttpResponseRedirect, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render_to_response
 from django.template import RequestContext
+from django.template.loader import get_template, render_to_string
 
 import rmgpy
 from rmgpy.data.base import Entry, LogicAnd, LogicNode, LogicOr
@@ -72,12 +76,15 @@ from rmgpy.quantity import Quantity
 from rmgpy.exceptions import AtomTypeError
 
 import rmgweb.settings
-from rmgweb.database.forms import DivErrorList, EniSearchForm, KineticsEntryEditForm, \
+from rmgweb.database.forms import DatabaseTableFilterForm, DivErrorList, EniBatchForm, EniSearchForm, KineticsEntryEditForm, \
                                   KineticsSearchForm, MoleculeSearchForm, RateEvaluationForm
-from rmgweb.database.tools import database, generateReactions, generateSpeciesThermo, reactionHasReactants
-from rmgweb.main.tools import getStructureInfo, moleculeFromURL, moleculeToAdjlist, groupToInfo
-
-#from rmgweb.main.tools import moleculeToURL, moleculeFromURL
+from rmgweb.database.tools import database, copyReactions, generateReactions, generateSpeciesThermo, getAllSpeciesThermoData, \
+                                  getCachedReactions, reactionHasReactants, ReactionIndex
+from rmgweb.main.tools import getStructureInfo, moleculeFromURL, moleculeToURL, groupFromURL, groupToInfo, \
+                              getJSONObject, getLog10RateCoefficients, LRUCache, structureURLs
+from rmgweb.main.templatetags.render_kinetics import getArrheniusFit, getRateCoefficientData
+from rmgweb.main.templatetags.render_thermo import getThermoPlotData
+from rmgweb.main.unitContext import getUnitContext
 
 ################################################################################
 
@@ -139,6 +146,92 @@ def export(request, type):
     # Redirect to requested compressed database
     return HttpResponseRedirect('export/{0}'.format(file))
 
+def getEntryTableRow(entry, dataFormat):
+    """
+    Return the template variables for one row of a thermo, transport,
+    solvation or statmech database table.
+    """
+    return {
+        'index': entry.index,
+        'label': entry.label,
+        'structure': getStructureInfo(entry),
+        'dataFormat': dataFormat,
+    }
+
+def renderDatabaseTable(request, template, rowTemplate, entries, getRow, context):
+    """
+    Render a table of database entries. `entries` is a list of
+    (entry, dataFormat) tuples, which is filtered by the query string and then
+    either paginated or, if ``stream`` is given, streamed row by row. Rows are
+    built with `getRow` only for the entries that are actually sent, since
+    drawing the structures is the slow part.
+    """
+    form = DatabaseTableFilterForm(request.GET, dataFormats=sorted(set(dataFormat for entry, dataFormat in entries)))
+    entries = form.filter(entries)
+
+    query = request.GET.copy()
+    query.pop('page', None)
+    query.pop('stream', None)
+    context.update({'filterForm': form, 'query': query.urlencode()})
+
+    if request.GET.get('stream'):
+        # Send the page around the table first, then each row as it is built
+        context.update({'entries': [], 'stream': True})
+        page = render_to_string(template, context, context_instance=RequestContext(request))
+        head, tail = page.split('<!--rows-->', 1)
+        row = get_template(rowTemplate)
+        def streamTable():
+            yield head
+            for entry, dataFormat in entries:
+                context['entry'] = getRow(entry, dataFormat)
+                yield row.render(context)
+            yield tail
+        return StreamingHttpResponse(streamTable())
+
+    paginator = Paginator(entries, rmgweb.settings.DATABASE_TABLE_PAGE_SIZE)
+    try:
+        page = paginator.page(request.GET.get('page', 1))
+    except PageNotAnInteger:
+        page = paginator.page(1)
+    except EmptyPage:
+        page = paginator.page(paginator.num_pages)
+
+    context.update({
+        'entries': [getRow(entry, dataFormat) for entry, dataFormat in page.object_list],
+        'page': page,
+    })
+    return render_to_response(template, context, context_instance=RequestContext(request))
+
+# The plot data sent for the results pages, keyed on the database versions,
+# the page, the result and the units
+plot_data_cache = LRUCache(rmgweb.settings.PLOT_DATA_CACHE_SIZE)
+
+def getPlotDataResponse(request, getModels, getData):
+    """
+    Return a JSON response with the plot data of one of the models shown on
+    a results page, as selected by the 1-based ``plot`` index in the query
+    string from the list returned by `getModels`. The data are generated by
+    `getData` in the requesting user's units, so the page itself can be sent
+    without them and each chart fetches its series separately. The response
+    is cached until the database is reloaded.
+    """
+    try:
+        index = int(request.GET['plot']) - 1
+    except ValueError:
+        raise Http404
+    key = (tuple(sorted(database.versions.items())), request.path, index, getUnitContext(request.user).signature)
+    content = plot_data_cache.get(key)
+    if content is None:
+        models = getModels()
+        if not 0 <= index < len(models):
+            raise Http404
+        data = getData(models[index], request.user)
+        if data is None:
+            raise Http404
+        content = getJSONObject(data)
+        plot_data_cache.set(key, content)
+    return HttpResponse(content, content_type='application/json')
+
 #################################################################################################################################################
 
 def transport(request, section='', subsection=''):
@@ -168,8 +261,6 @@ def transport(request, section='', subsection=''):
 
         entries = []
         for entry in entries0:
-
-            structure = getStructureInfo(entry.item)
             
             if isinstance(entry.data, CriticalPointGroupContribution): dataFormat = 'CriticalPointGroupContribution'
             elif isinstance(entry.data, TransportData): dataFormat = 'TransportData'
@@ -181,9 +272,9 @@ def transport(request, section='', subsection=''):
             else:
                 dataFormat = 'Other'
                 
-            entries.append((entry.index,entry.label,structure,dataFormat))
+            entries.append((entry, dataFormat))
 
-        return render_to_response('transportTable.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entries': entries}, context_instance=RequestContext(request))
+        return renderDatabaseTable(request, 'transportTable.html', 'transportTableRow.html', entries, getEntryTableRow, {'section': section, 'subsection': subsection, 'databaseName': db.name})
 
     else:
         # No subsection was specified, so render an outline of the transport
@@ -210,16 +301,14 @@ def transportEntry(request, section, subsection, index):
     
     index = int(index)
     if index != 0 and index != -1:
-        for entry in db.entries.values():
-            if entry.index == index:
-                break
-        else:
+        entry = database.get_entry(db, index)
+        if entry is None:
             raise Http404
     else:
-        if index == 0:
-            index = min(entry.index for entry in db.entries.values() if entry.index > 0)
-        else:
-            index = max(entry.index for entry in db.entries.values() if entry.index > 0)
+        first, last = database.get_index_bounds(db)
+        index = first if index == 0 else last
+        if index is None:
+            raise Http404
         return HttpResponseRedirect(reverse(transportEntry,
                                             kwargs={'section': section,
                                                     'subsection': subsection,
@@ -241,6 +330,7 @@ def transportEntry(request, section, subsection, index):
     reference = entry.reference
     return render_to_response('transportEntry.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entry': entry, 'structure': structure, 'reference': reference, 'referenceType': referenceType, 'transport': transport}, context_instance=RequestContext(request))
 
+@structureURLs('adjlist')
 def transportData(request, adjlist):
     """
     Returns an entry with the transport data when an adjacency list
@@ -250,8 +340,7 @@ def transportData(request, adjlist):
     # Load the transport database if necessary
     database.load('transport')
 
-    adjlist = str(urllib.unquote(adjlist))
-    molecule = Molecule().fromAdjacencyList(adjlist)
+    molecule = moleculeFromURL(adjlist)
     species = Species(molecule=[molecule])
     species.generate_resonance_structures()
     
@@ -306,8 +395,6 @@ def solvation(request, section='', subsection=''):
 
         entries = []
         for entry in entries0:
-
-            structure = getStructureInfo(entry.item)
             
             if isinstance(entry.data, SoluteData): dataFormat = 'SoluteData'
             elif isinstance(entry.data, SolventData): dataFormat = 'SolventData'
@@ -319,9 +406,9 @@ def solvation(request, section='', subsection=''):
             else:
                 dataFormat = 'Other'
                 
-            entries.append((entry.index,entry.label,structure,dataFormat))
+            entries.append((entry, dataFormat))
 
-        return render_to_response('solvationTable.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entries': entries}, context_instance=RequestContext(request))
+        return renderDatabaseTable(request, 'solvationTable.html', 'solvationTableRow.html', entries, getEntryTableRow, {'section': section, 'subsection': subsection, 'databaseName': db.name})
 
     else:
         # No subsection was specified, so render an outline of the solvation
@@ -350,16 +437,14 @@ def solvationEntry(request, section, subsection, index):
     
     index = int(index)
     if index != 0 and index != -1:
-        for entry in db.entries.values():
-            if entry.index == index:
-                break
-        else:
+        entry = database.get_entry(db, index)
+        if entry is None:
             raise Http404
     else:
-        if index == 0:
-            index = min(entry.index for entry in db.entries.values() if entry.index > 0)
-        else:
-            index = max(entry.index for entry in db.entries.values() if entry.index > 0)
+        first, last = database.get_index_bounds(db)
+        index = first if index == 0 else last
+        if index is None:
+            raise Http404
         return HttpResponseRedirect(reverse(solvationEntry,
                                             kwargs={'section': section,
                                                     'subsection': subsection,
@@ -381,6 +466,7 @@ def solvationEntry(request, section, subsection, index):
     reference = entry.reference
     return render_to_response('solvationEntry.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entry': entry, 'structure': structure, 'reference': reference, 'referenceType': referenceType, 'solvation': solvation}, context_instance=RequestContext(request))
 
+@structureURLs('solute_adjlist')
 def solvationData(request, solute_adjlist, solvent=''):
     """
     Returns an entry with the solute data for a given molecule
@@ -456,15 +542,13 @@ def statmech(request, section='', subsection=''):
 
         entries = []
         for entry in entries0:
-
-            structure = getStructureInfo(entry.item)
             
             if isinstance(entry.data, GroupFrequencies): dataFormat = 'GroupFrequencies'
             else: dataFormat = 'Other'
                 
-            entries.append((entry.index,entry.label,structure,dataFormat))
+            entries.append((entry, dataFormat))
 
-        return render_to_response('statmechTable.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entries': entries}, context_instance=RequestContext(request))
+        return renderDatabaseTable(request, 'statmechTable.html', 'statmechTableRow.html', entries, getEntryTableRow, {'section': section, 'subsection': subsection, 'databaseName': db.name})
 
     else:
         # No subsection was specified, so render an outline of the statmech
@@ -493,16 +577,14 @@ def statmechEntry(request, section, subsection, index):
     
     index = int(index)
     if index != 0 and index != -1:
-        for entry in database.entries.values():
-            if entry.index == index:
-                break
-        else:
+        entry = database.get_entry(db, index)
+        if entry is None:
             raise Http404
     else:
-        if index == 0:
-            index = min(entry.index for entry in db.entries.values() if entry.index > 0)
-        else:
-            index = max(entry.index for entry in db.entries.values() if entry.index > 0)
+        first, last = database.get_index_bounds(db)
+        index = first if index == 0 else last
+        if index is None:
+            raise Http404
         return HttpResponseRedirect(reverse(statmechEntry,
                                             kwargs={'section': section,
                                                     'subsection': subsection,
@@ -524,6 +606,7 @@ def statmechEntry(request, section, subsection, index):
     reference = entry.reference
     return render_to_response('statmechEntry.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entry': entry, 'structure': structure, 'reference': reference, 'referenceType': referenceType, 'statmech': statmech}, context_instance=RequestContext(request))
 
+@structureURLs('adjlist')
 def statmechData(request, adjlist):
     """
     Returns an entry with the statmech data for a given molecule
@@ -533,8 +616,7 @@ def statmechData(request, adjlist):
     # Load the statmech database if necessary
     database.load('statmech')
 
-    adjlist = str(urllib.unquote(adjlist))
-    molecule = Molecule().fromAdjacencyList(adjlist)
+    molecule = moleculeFromURL(adjlist)
     species = Species(molecule = [molecule])
     species.generate_resonance_structures()
     # Get the statmech data for the molecule
@@ -581,8 +663,6 @@ def thermo(request, section='', subsection=''):
         entries = []
         for entry in entries0:
 
-            structure = getStructureInfo(entry.item)
-
             if isinstance(entry.data, ThermoData): dataFormat = 'Group additivity'
             elif isinstance(entry.data, Wilhoit): dataFormat = 'Wilhoit'
             elif isinstance(entry.data, NASA): dataFormat = 'NASA'
@@ -595,9 +675,9 @@ def thermo(request, section='', subsection=''):
             else:
                 dataFormat = 'Other'
                 
-            entries.append((entry.index,entry.label,structure,dataFormat))
+            entries.append((entry, dataFormat))
 
-        return render_to_response('thermoTable.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entries': entries}, context_instance=RequestContext(request))
+        return renderDatabaseTable(request, 'thermoTable.html', 'thermoTableRow.html', entries, getEntryTableRow, {'section': section, 'subsection': subsection, 'databaseName': db.name})
 
     else:
         # No subsection was specified, so render an outline of the thermo
@@ -627,16 +707,14 @@ def thermoEntry(request, section, subsection, index):
         raise Http404
     index = int(index)
     if index != 0 and index != -1:
-        for entry in db.entries.values():
-            if entry.index == index:
-                break
-        else:
+        entry = database.get_entry(db, index)
+        if entry is None:
             raise Http404
     else:
-        if index == 0:
-            index = min(entry.index for entry in db.entries.values() if entry.index > 0)
-        else:
-            index = max(entry.index for entry in db.entries.values() if entry.index > 0)
+        first, last = database.get_index_bounds(db)
+        index = first if index == 0 else last
+        if index is None:
+            raise Http404
         return HttpResponseRedirect(reverse(thermoEntry,
                                             kwargs={'section': section,
                                                     'subsection': subsection,
@@ -676,6 +754,7 @@ def thermoEntry(request, section, subsection, index):
     return render_to_response('thermoEntry.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entry': entry, 'structure': structure, 'reference': reference, 'referenceType': referenceType, 'thermo': thermo, 'nasa_string':nasa_string}, context_instance=RequestContext(request))
 
 
+@structureURLs('adjlist')
 def thermoData(request, adjlist):
     """
     Returns an image of the provided adjacency list `adjlist` for a molecule.
@@ -687,14 +766,21 @@ def thermoData(request, adjlist):
     database.load('thermo')
     from rmgpy.chemkin import writeThermoEntry
 
-    adjlist = str(urllib.unquote(adjlist))
-    molecule = Molecule().fromAdjacencyList(adjlist)
+    molecule = moleculeFromURL(adjlist)
     species = Species(molecule=[molecule])
-    species.generate_resonance_structures()
     
+    if 'plot' in request.GET:
+        # Only the requested result needs its heat capacity limits for plotting
+        def getData(result, user):
+            findCp0andCpInf(species, result[0])
+            return getThermoPlotData(result[0], user)
+        return getPlotDataResponse(request, lambda: getAllSpeciesThermoData(species, database), getData)
+
     # Get the thermo data for the molecule
+    thermoDataResults = getAllSpeciesThermoData(species, database)
+
     thermoDataList = []
-    for data, library, entry in database.thermo.getAllThermoData(species):
+    for data, library, entry in thermoDataResults:
         # Make sure we calculate Cp0 and CpInf
         findCp0andCpInf(species, data)
         # Round trip conversion via Wilhoit for proper fitting
@@ -724,7 +810,7 @@ def thermoData(request, adjlist):
     # Get the structure of the item we are viewing
     structure = getStructureInfo(molecule)
 
-    return render_to_response('thermoData.html', {'molecule': molecule, 'structure': structure, 'thermoDataList': thermoDataList, 'symmetryNumber': symmetryNumber, 'plotWidth': 500, 'plotHeight': 400 + 15 * len(thermoDataList)}, context_instance=RequestContext(request))
+    return render_to_response('thermoData.html', {'molecule': molecule, 'key': moleculeToURL(molecule), 'structure': structure, 'thermoDataList': thermoDataList, 'symmetryNumber': symmetryNumber, 'plotWidth': 500, 'plotHeight': 400 + 15 * len(thermoDataList)}, context_instance=RequestContext(request))
 
 ################################################################################
 
@@ -741,40 +827,63 @@ def getDatabaseTreeAsList(database, entries):
         tree.extend(getDatabaseTreeAsList(database, entry.children))
     return tree
 
+# Rendered kinetics trees, keyed on the section, subsection and kinetics version
+kinetics_tree_cache = LRUCache(rmgweb.settings.KINETICS_TREE_CACHE_SIZE)
+
 def getKineticsTreeHTML(database, section, subsection, entries):
     """
     Return a string of HTML markup used for displaying information about
     kinetics entries in a given `database` as a tree of unordered lists.
     """
-    html = ''
-    for entry in entries:
-        # Write current node
-        url = reverse(kineticsEntry, kwargs={'section': section, 'subsection': subsection, 'index': entry.index})
-        html += '<li class="kineticsEntry">\n'
-        html += '<div class="kineticsLabel">'
-        if len(entry.children) > 0:
-            html += '<img id="button_{0}" class="treeButton" src="{1}"/>'.format(entry.index, static('img/tree-collapse.png'))
-        else:
-            html += '<img class="treeButton" src="{0}"/>'.format(static('img/tree-blank.png'))
-        html += '<a href="{0}">{1}. {2}</a>\n'.format(url, entry.index, entry.label)
-        html += '<div class="kineticsData">\n'
-        if entry.data is not None:
-            for T in [300,400,500,600,800,1000,1500,2000]:
-                html += '<span class="kineticsDatum">{0:.2f}</span> '.format(math.log10(entry.data.getRateCoefficient(T, P=1e5)))
-        html += '</div>\n'
-        # Recursively descend children (depth-first)
-        if len(entry.children) > 0:
-            html += '<ul id="children_{0}" class="kineticsSubTree">\n'.format(entry.index)
-            html += getKineticsTreeHTML(database, section, subsection, entry.children)
-            html += '</ul>\n'
-        html += '</li>\n'
-    return html
+    # Evaluate the rate coefficients of all the nodes at once
+    Tlist = [300,400,500,600,800,1000,1500,2000]
+    nodes = [entry for entry in getDatabaseTreeAsList(database, entries) if entry.data is not None]
+    log10k = getLog10RateCoefficients([entry.data for entry in nodes], Tlist, P=1e5)
+    rates = dict([(id(entry), row) for entry, row in zip(nodes, log10k)])
+
+    collapse = static('img/tree-collapse.png')
+    blank = static('img/tree-blank.png')
+
+    html = []
+    def writeEntries(entries):
+        for entry in entries:
+            # Write current node
+            url = reverse(kineticsEntry, kwargs={'section': section, 'subsection': subsection, 'index': entry.index})
+            html.append('<li class="kineticsEntry">\n')
+            html.append('<div class="kineticsLabel">')
+            if len(entry.children) > 0:
+                html.append('<img id="button_{0}" class="treeButton" src="{1}"/>'.format(entry.index, collapse))
+            else:
+                html.append('<img class="treeButton" src="{0}"/>'.format(blank))
+            html.append('<a href="{0}">{1}. {2}</a>\n'.format(url, entry.index, entry.label))
+            html.append('<div class="kineticsData">\n')
+            if entry.data is not None:
+                for value in rates[id(entry)]:
+                    html.append('<span class="kineticsDatum">{0:.2f}</span> '.format(value))
+            html.append('</div>\n')
+            # Recursively descend children (depth-first)
+            if len(entry.children) > 0:
+                html.append('<ul id="children_{0}" class="kineticsSubTree">\n'.format(entry.index))
+                writeEntries(entry.children)
+                html.append('</ul>\n')
+            html.append('</li>\n')
+    writeEntries(entries)
+    return ''.join(html)
+
+# Untrained depository of each family, with the kinetics version it was built from
+untrained_cache = {}
 
 def getUntrainedReactions(family):
     """
     Return a depository containing unique reactions for which no
     training data exists.
+
+    The depository is only built once for each family until the kinetics
+    database is reloaded.
     """
+    version, untrained = untrained_cache.get(family.label, (None, None))
+    if untrained is not None and version == database.versions['kinetics']:
+        return untrained
     
     # Load training depository
     for depository in family.depositories:
@@ -785,28 +894,20 @@ def getUntrainedReactions(family):
         raise Exception('Could not find training depository in {0} family.'.format(family.label))
     
     # Load trained reactions
-    trainedReactions = []
+    trainedReactions = ReactionIndex()
     for entry in training.entries.values():
-        for reaction in trainedReactions:
-            if reaction.isIsomorphic(entry.item):
-                break
-        else:
-            trainedReactions.append(entry.item)
+        if trainedReactions.get(entry.item) is None:
+            trainedReactions.add(entry.item, entry.item)
     
     # Load untrained reactions
     untrainedReactions = []
+    untrainedIndex = ReactionIndex()
     for depository in family.depositories:
-        if 'training' not in depository.label:
+        if 'training' not in depository.label and 'untrained' not in depository.label:
             for entry in depository.entries.values():
-                for reaction in trainedReactions:
-                    if reaction.isIsomorphic(entry.item):
-                        break
-                else:
-                    for reaction in untrainedReactions:
-                        if reaction.isIsomorphic(entry.item):
-                            break
-                    else:
-                        untrainedReactions.append(entry.item)
+                if trainedReactions.get(entry.item) is None and untrainedIndex.get(entry.item) is None:
+                    untrainedIndex.add(entry.item, entry.item)
+                    untrainedReactions.append(entry.item)
     
     # Sort reactions by reactant size
     untrainedReactions.sort(key=lambda reaction: sum([1 for r in reaction.reactants for a in r.molecule[0].atoms if a.isNonHydrogen()]))
@@ -823,6 +924,7 @@ def getUntrainedReactions(family):
         )
         count += 1
     
+    untrained_cache[family.label] = (database.versions['kinetics'], untrained)
     return untrained
 
 
@@ -1217,7 +1319,11 @@ def kinetics(request, section='', subsection=''):
             # If there is a tree in this database, only consider the entries
             # that are in the tree
             entries0 = getDatabaseTreeAsList(db, db.top)
-            tree = '<ul class="kineticsTree">\n{0}\n</ul>\n'.format(getKineticsTreeHTML(db, section, subsection, db.top))
+            key = (section, subsection, database.versions['kinetics'])
+            tree = kinetics_tree_cache.get(key)
+            if tree is None:
+                tree = '<ul class="kineticsTree">\n{0}\n</ul>\n'.format(getKineticsTreeHTML(db, section, subsection, db.top))
+                kinetics_tree_cache.set(key, tree)
         else:
             # If there is not a tree, consider all entries
             entries0 = db.entries.values()
@@ -1246,35 +1352,34 @@ def kinetics(request, section='', subsection=''):
             elif isinstance(entry0.data, Lindemann): dataFormat = 'Lindemann'
             elif isinstance(entry0.data, ThirdBody): dataFormat = 'ThirdBody'
 
-            entry = {
-                'index': entry0.index,
-                'label': entry0.label,
-                'dataFormat': dataFormat,
-            }
             if isinstance(db, KineticsGroups):
                 isGroupDatabase = True
-                entry['structure'] = getStructureInfo(entry0.item)
-                entry['parent'] = entry0.parent
-                entry['children'] = entry0.children
-            elif 'rules' in subsection:
-                if isinstance(entry0.item, list):
-                    # if the reactants are not group objects, then this rate rule came from
-                    # the averaging step, and we don't want to show all of the averaged nodes
-                    # in the web view.  We only want to show nodes with direct values or 
-                    # training rates that became rate rules.
-                    continue
-                else:
-                    entry['reactants'] = ' + '.join([getStructureInfo(reactant) for reactant in entry0.item.reactants])
-                    entry['products'] = ' + '.join([getStructureInfo(reactant) for reactant in entry0.item.products])
-                    entry['arrow'] = '&hArr;' if entry0.item.reversible else '&rarr;'
+                # The tree is drawn from the cached HTML above, so the entries
+                # are only needed to wire up its expand/collapse buttons
+                entries.append({
+                    'index': entry0.index,
+                    'label': entry0.label,
+                    'dataFormat': dataFormat,
+                    'parent': entry0.parent,
+                    'children': entry0.children,
+                })
+            elif 'rules' in subsection and isinstance(entry0.item, list):
+                # if the reactants are not group objects, then this rate rule came from
+                # the averaging step, and we don't want to show all of the averaged nodes
+                # in the web view.  We only want to show nodes with direct values or 
+                # training rates that became rate rules.
+                continue
             else:
-                entry['reactants'] = ' + '.join([getStructureInfo(reactant) for reactant in entry0.item.reactants])
-                entry['products'] = ' + '.join([getStructureInfo(reactant) for reactant in entry0.item.products])
-                entry['arrow'] = '&hArr;' if entry0.item.reversible else '&rarr;'
+                entries.append((entry0, dataFormat))
 
-            entries.append(entry)
-            
-        return render_to_response('kineticsTable.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'databaseDesc':db.longDesc,'entries': entries, 'tree': tree, 'isGroupDatabase': isGroupDatabase}, context_instance=RequestContext(request))
+        context = {'section': section, 'subsection': subsection, 'databaseName': db.name, 'databaseDesc':db.longDesc, 'tree': tree, 'isGroupDatabase': isGroupDatabase}
+        if isGroupDatabase:
+            context['entries'] = entries
+            return render_to_response('kineticsTable.html', context, context_instance=RequestContext(request))
+        elif 'untrained' in db.name:
+            context['entries'] = [getKineticsTableRow(entry, dataFormat) for entry, dataFormat in entries]
+            return render_to_response('kineticsTable.html', context, context_instance=RequestContext(request))
+        return renderDatabaseTable(request, 'kineticsTable.html', 'kineticsTableRow.html', entries, getKineticsTableRow, context)
 
     else:
         # No subsection was specified, so render an outline of the kinetics
@@ -1282,14 +1387,26 @@ def kinetics(request, section='', subsection=''):
         kineticsLibraries = [(label, library) for label, library in database.kinetics.libraries.iteritems() if subsection in label]
         kineticsLibraries.sort()
         for family in database.kinetics.families.itervalues():
-            for i in range(0,len(family.depositories)):
-                if 'untrained' in family.depositories[i].name:
-                    family.depositories.pop(i)
+            # Replace any untrained depository from an earlier visit
+            family.depositories = [depository for depository in family.depositories if 'untrained' not in depository.name]
             family.depositories.append(getUntrainedReactions(family))
         kineticsFamilies = [(label, family) for label, family in database.kinetics.families.iteritems() if subsection in label]
         kineticsFamilies.sort()
         return render_to_response('kinetics.html', {'section': section, 'subsection': subsection, 'kineticsLibraries': kineticsLibraries, 'kineticsFamilies': kineticsFamilies}, context_instance=RequestContext(request))
 
+def getKineticsTableRow(entry, dataFormat):
+    """
+    Return the template variables for one row of a kinetics database table.
+    """
+    return {
+        'index': entry.index,
+        'label': entry.label,
+        'dataFormat': dataFormat,
+        'reactants': ' + '.join([getStructureInfo(reactant) for reactant in entry.item.reactants]),
+        'products': ' + '.join([getStructureInfo(product) for product in entry.item.products]),
+        'arrow': '&hArr;' if entry.item.reversible else '&rarr;',
+    }
+
 def kineticsUntrained(request, family):
     database.load('kinetics', 'families')
     entries0 = getUntrainedReactions(database.kinetics.families[family]).entries.values()
@@ -1322,10 +1439,10 @@ def getReactionUrl(reaction, family=None, estimator=None, resonance=True):
         if isinstance(reactant, Group) or isinstance(reactant, LogicNode):
             return ''
         mol = reactant if isinstance(reactant,Molecule) else reactant.molecule[0]
-        kwargs['reactant{0:d}'.format(index+1)] = moleculeToAdjlist(mol)
+        kwargs['reactant{0:d}'.format(index+1)] = moleculeToURL(mol)
     for index, product in enumerate(reaction.products):
         mol = product if isinstance(product,Molecule) else product.molecule[0]
-        kwargs['product{0:d}'.format(index+1)] = moleculeToAdjlist(mol)
+        kwargs['product{0:d}'.format(index+1)] = moleculeToURL(mol)
 
     kwargs['resonance'] = resonance
 
@@ -1356,10 +1473,7 @@ def kineticsEntryNew(request, family, type):
     except ValueError:
         raise Http404
     
-    entries = db.entries.values()
-    if any(isinstance(item, list) for item in entries):
-        # if the entries are lists
-        entries = reduce(lambda x,y: x+y, entries)
+    entries = database.get_entry_index(db).values()
     entry = None
     if request.method == 'POST':
         form = KineticsEntryEditForm(request.POST, error_class=DivErrorList)
@@ -1367,8 +1481,8 @@ def kineticsEntryNew(request, family, type):
             new_entry = form.cleaned_data['entry']
 
             # Set new entry index
-            indices = [entry.index for entry in db.entries.values()]
-            new_entry.index = max(indices or [0]) + 1
+            first, last = database.get_index_bounds(db)
+            new_entry.index = (last or 0) + 1
 
             # Confirm entry does not already exist in depository
             for entry in entries:
@@ -1436,9 +1550,10 @@ def kineticsEntryNew(request, family, type):
                 return HttpResponse(entry_string, content_type="text/plain")
             if True:
                 # save it
-                db.entries[index] = new_entry
+                database.set_entry(db, new_entry.index, new_entry)
                 path = os.path.join(rmgweb.settings.DATABASE_PATH, 'kinetics', 'families', family, '{0}.py'.format(type))
                 db.save(path)
+                database.expire(path)
                 commit_author = '{0.first_name} {0.last_name} <{0.email}>'.format(request.user)
                 commit_message = 'New Entry: {family}/{type}/{index}\n\n{msg}'.format(family=family,
                                                                                       type=type,
@@ -1488,15 +1603,9 @@ def kineticsEntryEdit(request, section, subsection, index):
     except ValueError:
         raise Http404
     
-    entries = db.entries.values()
-    if any(isinstance(item, list) for item in entries):
-        # if the entries are lists
-        entries = reduce(lambda x,y: x+y, entries)
     index = int(index)
-    for entry in entries:
-        if entry.index == index:
-            break
-    else:
+    entry = database.get_entry(db, index)
+    if entry is None:
         raise Http404
     
     if request.method == 'POST':
@@ -1532,9 +1641,10 @@ def kineticsEntryEdit(request, section, subsection, index):
                               context_instance=RequestContext(request))
             if True:
                 # save it
-                db.entries[index] = new_entry
+                database.set_entry(db, new_entry.index, new_entry)
                 path = os.path.join(rmgweb.settings.DATABASE_PATH, 'kinetics', section, subsection + '.py' )
                 db.save(path)
+                database.expire(path)
                 commit_author = "{0.first_name} {0.last_name} <{0.email}>".format(request.user)
                 commit_message = "{1}:{2} {3}\n\nChange to kinetics/{0}/{1} entry {2} submitted through RMG website:\n{3}\n{4}".format(section,subsection,index, form.cleaned_data['change'], commit_author)
                 commit_result = subprocess.check_output(['git', 'commit',
@@ -1593,6 +1703,7 @@ def kineticsEntryEdit(request, section, subsection, index):
                                                         },
                                   context_instance=RequestContext(request))
 
+@structureURLs('adjlist')
 @login_required
 def thermoEntryNew(request, section, subsection, adjlist):
     """
@@ -1602,18 +1713,14 @@ def thermoEntryNew(request, section, subsection, adjlist):
     # Load the thermo database, if necessary
     database.load('thermo')
     
-    adjlist = str(urllib.unquote(adjlist))
-    molecule = Molecule().fromAdjacencyList(adjlist)
+    molecule = moleculeFromURL(adjlist)
 
     try:
         db = database.get_thermo_database(section, subsection)
     except ValueError:
         raise Http404
     
-    entries = db.entries.values()
-    if any(isinstance(item, list) for item in entries):
-        # if the entries are lists
-        entries = reduce(lambda x,y: x+y, entries)
+    entries = database.get_entry_index(db).values()
     entry = None
     if request.method == 'POST':
         form = ThermoEntryEditForm(request.POST, error_class=DivErrorList)
@@ -1621,8 +1728,8 @@ def thermoEntryNew(request, section, subsection, adjlist):
             new_entry = form.cleaned_data['entry']
 
             # Set new entry index
-            indices = [entry.index for entry in db.entries.values()]
-            new_entry.index = max(indices or [0]) + 1
+            first, last = database.get_index_bounds(db)
+            new_entry.index = (last or 0) + 1
 
             # Do not need to confirm entry already exists- should allow the user to store multiple 
             # thermo entries in to the depository or into separate libraries for the same molecule if the data exists.
@@ -1652,9 +1759,10 @@ def thermoEntryNew(request, section, subsection, adjlist):
                 return HttpResponse(entry_string, content_type="text/plain")
             if True:
                 # save it
-                db.entries[index] = new_entry
+                database.set_entry(db, new_entry.index, new_entry)
                 path = os.path.join(rmgweb.settings.DATABASE_PATH, 'thermo', section, subsection + '.py')
                 db.save(path)
+                database.expire(path)
                 commit_author = '{0.first_name} {0.last_name} <{0.email}>'.format(request.user)
                 commit_message = 'New Entry: {section}/{subsection}/{index}\n\n{msg}'.format(section=section,
                                                                                       subsection=subsection,
@@ -1722,15 +1830,9 @@ def thermoEntryEdit(request, section, subsection, index):
     except ValueError:
         raise Http404
     
-    entries = db.entries.values()
-    if any(isinstance(item, list) for item in entries):
-        # if the entries are lists
-        entries = reduce(lambda x,y: x+y, entries)
     index = int(index)
-    for entry in entries:
-        if entry.index == index:
-            break
-    else:
+    entry = database.get_entry(db, index)
+    if entry is None:
         raise Http404
     
     if request.method == 'POST':
@@ -1766,9 +1868,10 @@ def thermoEntryEdit(request, section, subsection, index):
                               context_instance=RequestContext(request))
             if True:
                 # save it
-                db.entries[index] = new_entry
+                database.set_entry(db, new_entry.index, new_entry)
                 path = os.path.join(rmgweb.settings.DATABASE_PATH, 'thermo', section, subsection + '.py' )
                 db.save(path)
+                database.expire(path)
                 commit_author = "{0.first_name} {0.last_name} <{0.email}>".format(request.user)
                 commit_message = "{1}:{2} {3}\n\nChange to thermo/{0}/{1} entry {2} submitted through RMG website:\n{3}\n{4}".format(section,subsection,index, form.cleaned_data['change'], commit_author)
                 commit_result = subprocess.check_output(['git', 'commit',
@@ -1842,23 +1945,16 @@ def kineticsEntry(request, section, subsection, index):
     except ValueError:
         raise Http404
     
-    entries = db.entries.values()
-    if any(isinstance(item, list) for item in entries):
-        # if the entries are lists
-        entries = reduce(lambda x,y: x+y, entries)
-                
     index = int(index)
     if index != 0 and index != -1:
-        for entry in entries:
-            if entry.index == index:
-                break
-        else:
+        entry = database.get_entry(db, index)
+        if entry is None:
             raise Http404
     else:
-        if index == 0:
-            index = min(entry.index for entry in entries if entry.index > 0)
-        else:
-            index = max(entry.index for entry in entries if entry.index > 0)
+        first, last = database.get_index_bounds(db)
+        index = first if index == 0 else last
+        if index is None:
+            raise Http404
         return HttpResponseRedirect(reverse(kineticsEntry,
                                             kwargs={'section': section,
                                                     'subsection': subsection,
@@ -1910,6 +2006,7 @@ def kineticsEntry(request, section, subsection, index):
                                   context_instance=RequestContext(request))
 
 
+@structureURLs('reactant1', 'reactant2', 'reactant3', 'product1', 'product2', 'product3')
 def kineticsGroupEstimateEntry(request, family, estimator, reactant1, product1, reactant2='', reactant3='', product2='', product3='', resonance=True):
     """
     View a kinetics group estimate as an entry.
@@ -2066,20 +2163,20 @@ def kineticsSearch(request):
         form = KineticsSearchForm(request.POST, error_class=DivErrorList)
         if form.is_valid():
             kwargs = {}
-            # Save reactants and products as kwargs without quoting because reverse() automatically quotes urls
-            kwargs['reactant1'] = form.cleaned_data['reactant1']
+            # Name the reactants and products in the URL by their structure keys
+            kwargs['reactant1'] = moleculeToURL(Molecule().fromAdjacencyList(form.cleaned_data['reactant1']))
 
             reactant2 = form.cleaned_data['reactant2']
             if reactant2 != '':
-                kwargs['reactant2'] = reactant2
+                kwargs['reactant2'] = moleculeToURL(Molecule().fromAdjacencyList(reactant2))
 
             product1 = form.cleaned_data['product1']
             if product1 != '':
-                kwargs['product1'] = product1
+                kwargs['product1'] = moleculeToURL(Molecule().fromAdjacencyList(product1))
 
             product2 = form.cleaned_data['product2']
             if product2 != '':
-                kwargs['product2'] = product2
+                kwargs['product2'] = moleculeToURL(Molecule().fromAdjacencyList(product2))
 
             kwargs['resonance'] = form.cleaned_data['resonance']
 
@@ -2089,6 +2186,7 @@ def kineticsSearch(request):
 
     return render_to_response('kineticsSearch.html', {'form': form}, context_instance=RequestContext(request))
 
+@structureURLs('reactant1', 'reactant2', 'reactant3', 'product1', 'product2', 'product3')
 def kineticsResults(request, reactant1, reactant2='', reactant3='', product1='', product2='', product3='', resonance=True):
     """
     A view used to present a list of unique reactions that result from a
@@ -2122,12 +2220,13 @@ def kineticsResults(request, reactant1, reactant2='', reactant3='', product1='',
     # Remove duplicates from the list and count the number of results
     uniqueReactionList = []
     uniqueReactionCount = []
+    uniqueReactionIndex = ReactionIndex()
     for reaction in reactionList:
-        for i, rxn in enumerate(uniqueReactionList):
-            if reaction.isIsomorphic(rxn):
-                uniqueReactionCount[i] += 1
-                break
+        i = uniqueReactionIndex.get(reaction)
+        if i is not None:
+            uniqueReactionCount[i] += 1
         else:
+            uniqueReactionIndex.add(reaction, len(uniqueReactionList))
             uniqueReactionList.append(reaction)
             uniqueReactionCount.append(1)
     
@@ -2146,6 +2245,73 @@ def kineticsResults(request, reactant1, reactant2='', reactant3='', product1='',
         
     return render_to_response('kineticsResults.html', {'reactionDataList': reactionDataList}, context_instance=RequestContext(request))
 
+def getKineticsResults(reactionList):
+    """
+    Return the reactions of `reactionList` that are shown as the numbered
+    results of a kinetics search, leaving out the untrained depositories.
+    """
+    return [reaction for reaction in reactionList
+            if not (isinstance(reaction, DepositoryReaction) and 'untrained' in reaction.depository.name)]
+
+def getReactionKinetics(reaction, reactantList):
+    """
+    Return the kinetics of the `reaction` found by a kinetics search in the
+    direction starting from `reactantList`, and whether that is its forward
+    direction. Reverse kinetics are fitted from the forward Arrhenius or
+    kinetics data, or are ``None`` for other models. The thermo of the
+    species is generated along the way.
+    """
+    # Generate the thermo data for the species involved
+    for reactant in reaction.reactants:
+        generateSpeciesThermo(reactant, database)
+    for product in reaction.products:
+        generateSpeciesThermo(product, database)
+        
+    # If the kinetics are ArrheniusEP, replace them with Arrhenius
+    if isinstance(reaction.kinetics, ArrheniusEP):
+        reaction.kinetics = reaction.kinetics.toArrhenius(reaction.getEnthalpyOfReaction(298))
+
+    forwardKinetics = reaction.kinetics
+    if reactionHasReactants(reaction, reactantList):
+        return forwardKinetics, True
+
+    if isinstance(forwardKinetics, Arrhenius) or isinstance(forwardKinetics, KineticsData):
+        reverseKinetics = reaction.generateReverseRateCoefficient()
+        reverseKinetics.Tmin = forwardKinetics.Tmin
+        reverseKinetics.Tmax = forwardKinetics.Tmax
+        reverseKinetics.Pmin = forwardKinetics.Pmin
+        reverseKinetics.Pmax = forwardKinetics.Pmax
+    else:
+        reverseKinetics = None
+    return reverseKinetics, False
+
+def getNewKineticsEntry(reactantList, productList, family, resonance=True):
+    """
+    Return the text of a new kinetics entry for the reaction of the given
+    `family` between `reactantList` and `productList`, used to fill in the
+    new entry form of the kinetics data page. This needs a search of the
+    family alone, as otherwise the adjacency lists do not store the
+    reaction template properly, so it is only done when the form is used.
+    """
+    additiveList = generateReactions(database, reactantList, productList, only_families=family, resonance=resonance)
+    additiveList = [rxn for rxn in additiveList if isinstance(rxn, TemplateReaction)]
+    reaction = additiveList[0]
+    new_entry = StringIO.StringIO(u'')
+    try:
+        if reactionHasReactants(reaction, reactantList):
+            rmgpy.data.kinetics.saveEntry(new_entry, Entry(label=str(reaction), item=Reaction(reactants=reaction.reactants, products=reaction.products)))
+        else:
+            rmgpy.data.kinetics.saveEntry(new_entry, Entry(label=str(reaction), item=Reaction(reactants=reaction.products, products=reaction.reactants)))
+    except Exception, e:
+        new_entry.write("ENTRY WAS NOT PARSED CORRECTLY.\n")
+        new_entry.write(str(e))
+        pass
+    entry_string = new_entry.getvalue()
+    entry_string = re.sub('^entry\(\n','',entry_string) # remove leading entry(
+    entry_string = re.sub('\s*index = -?\d+,\n','',entry_string) # remove the 'index = 23,' (or -1)line
+    return entry_string
+
+@structureURLs('reactant1', 'reactant2', 'reactant3', 'product1', 'product2', 'product3')
 def kineticsData(request, reactant1, reactant2='', reactant3='', product1='', product2='', product3='', resonance=True):
     """
     A view used to present a list of reactions and the associated kinetics
@@ -2177,8 +2343,28 @@ def kineticsData(request, reactant1, reactant2='', reactant3='', product1='', pr
     else:
         productList = None
 
+    if 'plot' in request.GET:
+        # Only copy and work out the kinetics of the result being plotted
+        def getModels():
+            return getKineticsResults(getCachedReactions(database, reactantList, productList, resonance=resonance))
+        def getData(reaction, user):
+            kinetics, is_forward = getReactionKinetics(copyReactions([reaction])[0], reactantList)
+            data = getRateCoefficientData(kinetics, user)
+            if data is not None:
+                data['fit'] = getArrheniusFit(kinetics)
+            return data
+        return getPlotDataResponse(request, getModels, getData)
+
+    if 'new_entry' in request.GET:
+        # New entries are for the family of the last template reaction found
+        reactionList = getKineticsResults(getCachedReactions(database, reactantList, productList, resonance=resonance))
+        families = [reaction.family for reaction in reactionList if isinstance(reaction, TemplateReaction)]
+        if not families:
+            raise Http404
+        return HttpResponse(getNewKineticsEntry(reactantList, productList, families[-1], resonance), content_type='text/plain')
+
     # Search for the corresponding reaction(s)
-    reactionList = generateReactions(database, reactantList, productList, resonance=resonance)
+    reactionList = getKineticsResults(generateReactions(database, reactantList, productList, resonance=resonance))
 
     kineticsDataList = []
     family = ''
@@ -2198,17 +2384,7 @@ def kineticsData(request, reactant1, reactant2='', reactant3='', product1='', pr
 
     # Go through database and group additivity kinetics entries
     for reaction in reactionList:
-        # Generate the thermo data for the species involved
-        for reactant in reaction.reactants:
-            generateSpeciesThermo(reactant, database)
-        for product in reaction.products:
-            generateSpeciesThermo(product, database)
-            
-        # If the kinetics are ArrheniusEP, replace them with Arrhenius
-        if isinstance(reaction.kinetics, ArrheniusEP):
-            reaction.kinetics = reaction.kinetics.toArrhenius(reaction.getEnthalpyOfReaction(298))
-
-        is_forward = reactionHasReactants(reaction, reactantList)
+        kinetics, is_forward = getReactionKinetics(reaction, reactantList)
 
         reactants = ' + '.join([getStructureInfo(reactant) for reactant in reaction.reactants])
         arrow = '&hArr;' if reaction.reversible else '&rarr;'
@@ -2231,54 +2407,26 @@ def kineticsData(request, reactant1, reactant2='', reactant3='', product1='', pr
             entry = Entry(data=reaction.kinetics)
             family = reaction.family
         elif isinstance(reaction, DepositoryReaction):
-            if 'untrained' in reaction.depository.name:
-                continue
             source = '%s' % (reaction.depository.name)
             href = reverse(kineticsEntry, kwargs={'section': 'families', 'subsection': reaction.depository.label, 'index': reaction.entry.index})
-            entry = reaction.entry
+            # Copy the entry, as it belongs to the database but is numbered below
+            entry = copy.copy(reaction.entry)
         elif isinstance(reaction, LibraryReaction):
             source = reaction.library.name
             href = reverse(kineticsEntry, kwargs={'section': 'libraries', 'subsection': reaction.library.label, 'index': reaction.entry.index})
-            entry = reaction.entry
-        
-        forwardKinetics = reaction.kinetics
+            # Copy the entry, as it belongs to the database but is numbered below
+            entry = copy.copy(reaction.entry)
         
         entry.result = len(kineticsDataList) + 1
 
         if is_forward:
-            kineticsDataList.append([reactants, arrow, products, entry, forwardKinetics, source, href, is_forward])
+            kineticsDataList.append([reactants, arrow, products, entry, kinetics, source, href, is_forward])
         else:
-            if isinstance(forwardKinetics, Arrhenius) or isinstance(forwardKinetics, KineticsData):
-                reverseKinetics = reaction.generateReverseRateCoefficient()
-                reverseKinetics.Tmin = forwardKinetics.Tmin
-                reverseKinetics.Tmax = forwardKinetics.Tmax
-                reverseKinetics.Pmin = forwardKinetics.Pmin
-                reverseKinetics.Pmax = forwardKinetics.Pmax
-            else:
-                reverseKinetics = None
-            kineticsDataList.append([products, arrow, reactants, entry, reverseKinetics, source, href, is_forward])
+            kineticsDataList.append([products, arrow, reactants, entry, kinetics, source, href, is_forward])
 
-    # Construct new entry form from group-additive result
-    # Need to get group-additive reaction from generateReaction with only_families
-    # +--> otherwise, adjacency list doesn't store reaction template properly
+    # The new entry form is only filled in from the family when it is used
     if family:
-        additiveList = generateReactions(database, reactantList, productList, only_families=family, resonance=resonance)
-        additiveList = [rxn for rxn in additiveList if isinstance(rxn, TemplateReaction)]
-        reaction = additiveList[0]
-        new_entry = StringIO.StringIO(u'')
-        try:
-            if reactionHasReactants(reaction, reactantList):
-                rmgpy.data.kinetics.saveEntry(new_entry, Entry(label=str(reaction), item=Reaction(reactants=reaction.reactants, products=reaction.products)))
-            else:
-                rmgpy.data.kinetics.saveEntry(new_entry, Entry(label=str(reaction), item=Reaction(reactants=reaction.products, products=reaction.reactants)))
-        except Exception, e:
-            new_entry.write("ENTRY WAS NOT PARSED CORRECTLY.\n")
-            new_entry.write(str(e))
-            pass
-        entry_string = new_entry.getvalue()
-        entry_string = re.sub('^entry\(\n','',entry_string) # remove leading entry(
-        entry_string = re.sub('\s*index = -?\d+,\n','',entry_string) # remove the 'index = 23,' (or -1)line
-        new_entry_form = KineticsEntryEditForm(initial={'entry':entry_string })
+        new_entry_form = KineticsEntryEditForm(initial={'entry': ''})
     else:
         new_entry_form = None
 
@@ -2330,10 +2478,10 @@ def moleculeSearch(request):
 
         if adjlist is not None:
             if 'thermo' in request.POST:
-                return HttpResponseRedirect(reverse(thermoData, kwargs={'adjlist': adjlist}))
+                return HttpResponseRedirect(reverse(thermoData, kwargs={'adjlist': moleculeToURL(molecule)}))
 
             if 'transport' in request.POST:
-                return HttpResponseRedirect(reverse(transportData, kwargs={'adjlist': adjlist}))
+                return HttpResponseRedirect(reverse(transportData, kwargs={'adjlist': moleculeToURL(molecule)}))
 
             if 'reset' in request.POST:
                 form = MoleculeSearchForm()
@@ -2373,7 +2521,7 @@ def solvationSearch(request):
                     solvent = 'None'
         
             if 'solvation' in request.POST:
-                return HttpResponseRedirect(reverse(solvationData, kwargs={'solute_adjlist': solute_adjlist, 'solvent': solvent}))
+                return HttpResponseRedirect(reverse(solvationData, kwargs={'solute_adjlist': moleculeToURL(molecule), 'solvent': solvent}))
                     
             if 'reset' in request.POST:
                 form = SolvationSearchForm()
@@ -2415,7 +2563,7 @@ def EniSearch(request):
     Creates webpage form to display detergent and deposit structures upon entering smiles as well as returns binding constants
     between the detergent and deposit
     """
-    from tools import getAbrahamAB
+    from tools import getAbrahamABList
     if request.method == 'POST':
         form = EniSearchForm(request.POST, error_class=DivErrorList)
         if form.is_valid():
@@ -2432,8 +2580,7 @@ def EniSearch(request):
             deposit_smiles = deposit.toSMILES()
             deposit_structure = getStructureInfo(deposit)
             
-            detergentA, detergentB = getAbrahamAB(detergent_smiles)
-            depositA, depositB = getAbrahamAB(deposit_smiles)
+            (detergentA, detergentB), (depositA, depositB) = getAbrahamABList([detergent_smiles, deposit_smiles])
             
             # Estimating the binding strength assuming the the detergent to be the donor and dirt to be acceptor            
             logK_AB = 7.354*detergentA*depositB
@@ -2451,6 +2598,56 @@ def EniSearch(request):
             
     return render_to_response('EniSearch.html', {'detergentA': detergentA, 'detergentB': detergentB, 'depositA': depositA, 'depositB': depositB, 'logKAB': logK_AB, 'logKBA': logK_BA, 'form': form}, context_instance=RequestContext(request))
     
+def EniBatch(request):
+    """
+    Creates webpage form to screen a list of detergents against a list of
+    deposits, and returns the binding constants between each pair as a table,
+    CSV file or JSON.
+    """
+    from tools import getEniBindingStrengths
+    if request.method == 'POST':
+        form = EniBatchForm(request.POST, error_class=DivErrorList)
+        if form.is_valid():
+            detergents = [molecule.toSMILES() for molecule in form.cleaned_data['detergents']]
+            deposits = [molecule.toSMILES() for molecule in form.cleaned_data['deposits']]
+            detergentAB, depositAB, logK_AB, logK_BA = getEniBindingStrengths(detergents, deposits)
+
+            output = form.cleaned_data['format']
+            if output == 'json':
+                data = {
+                    'detergents': [{'smiles': smiles, 'A': A, 'B': B} for smiles, (A, B) in zip(detergents, detergentAB.tolist())],
+                    'deposits': [{'smiles': smiles, 'A': A, 'B': B} for smiles, (A, B) in zip(deposits, depositAB.tolist())],
+                    'logKAB': logK_AB.tolist(),
+                    'logKBA': logK_BA.tolist(),
+                }
+                return HttpResponse(json.dumps(data), content_type="application/json")
+            elif output == 'csv':
+                response = HttpResponse(content_type="text/csv")
+                response['Content-Disposition'] = 'attachment; filename="eni.csv"'
+                writer = csv.writer(response)
+                writer.writerow(['Detergent', 'Deposit', 'Detergent A', 'Detergent B', 'Deposit A', 'Deposit B', 'logK_AB', 'logK_BA'])
+                for i, detergent in enumerate(detergents):
+                    for j, deposit in enumerate(deposits):
+                        writer.writerow([detergent, deposit,
+                                         '{0:.3f}'.format(detergentAB[i,0]), '{0:.3f}'.format(detergentAB[i,1]),
+                                         '{0:.3f}'.format(depositAB[j,0]), '{0:.3f}'.format(depositAB[j,1]),
+                                         '{0:.2f}'.format(logK_AB[i,j]), '{0:.2f}'.format(logK_BA[i,j])])
+                return response
+
+            results = {
+                'detergents': zip(detergents, detergentAB.tolist()),
+                'deposits': zip(deposits, depositAB.tolist()),
+                'rows': zip(detergents, logK_AB.tolist(), logK_BA.tolist()),
+            }
+        else:
+            results = None
+    else:
+        form = EniBatchForm()
+        results = None
+
+    return render_to_response('EniBatch.html', {'form': form, 'results': results}, context_instance=RequestContext(request))
+
+@structureURLs('adjlist')
 def moleculeEntry(request,adjlist):
     """
     Returns an html page which includes the image of the molecule
@@ -2459,24 +2656,23 @@ def moleculeEntry(request,adjlist):
 
     Basically works as an equivalent of the molecule search function.
     """
-    adjlist = str(urllib.unquote(adjlist))
-    molecule = Molecule().fromAdjacencyList(adjlist)
+    molecule = moleculeFromURL(adjlist)
     structure = getStructureInfo(molecule)
     oldAdjlist=''
     try:
         oldAdjlist = molecule.toAdjacencyList(removeH=True,oldStyle=True)
     except:
         pass
-    return render_to_response('moleculeEntry.html',{'structure':structure,'molecule':molecule,'oldAdjlist':oldAdjlist}, context_instance=RequestContext(request))
+    return render_to_response('moleculeEntry.html',{'structure':structure,'molecule':molecule,'oldAdjlist':oldAdjlist,'key':adjlist}, context_instance=RequestContext(request))
 
+@structureURLs('adjlist', cls=Group)
 def groupEntry(request,adjlist):
     """
     Returns an html page which includes the image of the group.
 
     Basically works as an equivalent of the group search function.
     """
-    adjlist = str(urllib.unquote(adjlist))
-    group = Group().fromAdjacencyList(adjlist)
+    group = groupFromURL(adjlist)
     structure = getStructureInfo(group)
     
     return render_to_response('groupEntry.html',{'structure':structure,'group':group}, context_instance=RequestContext(request))
@@ -41,8 +41,8 @@ from django.utils.safestring import mark_safe
 import math
 import numpy
 
-from rmgweb.main.tools import getLaTeXScientificNotation, getStructureMarkup
-from rmgweb.main.models import UserProfile
+from rmgweb.main.tools import cachedRendering, getJSONArray, getLaTeXScientificNotation, getRateCoefficients, getStructureMarkup
+from rmgweb.main.unitContext import getConversionFactorFromSI, getUnitContext
 
 from rmgpy.quantity import Quantity
 from rmgpy.kinetics import *
@@ -142,30 +142,30 @@ def getRateCoefficientUnits(kinetics, user=None):
         3: 'm^6/(mol^2*s)',
         4: 'm^9/(mol^3*s)',
     }
-    if user and user.is_authenticated():
-        user_profile = UserProfile.objects.get(user=user)
-        if user_profile.rateCoefficientUnits == 'm^3,mol,s':
+    rateCoefficientUnits = getUnitContext(user).rateCoefficient
+    if rateCoefficientUnits:
+        if rateCoefficientUnits == 'm^3,mol,s':
             kunitsDict = {
                 1: 's^-1',
                 2: 'm^3/(mol*s)',
                 3: 'm^6/(mol^2*s)',
                 4: 'm^9/(mol^3*s)',
             }
-        elif user_profile.rateCoefficientUnits == 'cm^3,mol,s':
+        elif rateCoefficientUnits == 'cm^3,mol,s':
             kunitsDict = {
                 1: 's^-1',
                 2: 'cm^3/(mol*s)',
                 3: 'cm^6/(mol^2*s)',
                 4: 'cm^9/(mol^3*s)',
             }
-        elif user_profile.rateCoefficientUnits == 'm^3,molecule,s':
+        elif rateCoefficientUnits == 'm^3,molecule,s':
             kunitsDict = {
                 1: 's^-1',
                 2: 'm^3/(molecule*s)',
                 3: 'm^6/(molecule^2*s)',
                 4: 'm^9/(molecule^3*s)',
             }
-        elif user_profile.rateCoefficientUnits == 'cm^3,molecule,s':
+        elif rateCoefficientUnits == 'cm^3,molecule,s':
             kunitsDict = {
                 1: 's^-1',
                 2: 'cm^3/(molecule*s)',
@@ -175,13 +175,14 @@ def getRateCoefficientUnits(kinetics, user=None):
             
     kunits = kunitsDict[numReactants]
     kunits_low = kunitsDict[numReactants+1]
-    kfactor = Quantity(1, kunits).getConversionFactorFromSI()
+    kfactor = getConversionFactorFromSI(kunits)
     
     return kunits, kunits_low, kfactor, numReactants
 
 ################################################################################
 
 @register.filter
+@cachedRendering
 def render_kinetics_math(kinetics, user=None):
     """
     Return a math representation of the given `kinetics` using MathJax. If a
@@ -191,19 +192,14 @@ def render_kinetics_math(kinetics, user=None):
     if kinetics is None:
         return mark_safe("<p>There are no kinetics for this entry.</p>")
     # Define other units and conversion factors to use
-    if user and user.is_authenticated():
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = str(user_profile.temperatureUnits)
-        Punits = str(user_profile.pressureUnits)
-        Eunits = str(user_profile.energyUnits)
-    else:
-        Tunits = 'K'
-        Punits = 'Pa'
-        Eunits = 'J/mol'
-    kunits, kunits_low, kfactor, numReactants = getRateCoefficientUnits(kinetics, user=user)
-    Tfactor = Quantity(1, Tunits).getConversionFactorFromSI()
-    Pfactor = Quantity(1, Punits).getConversionFactorFromSI()
-    Efactor = Quantity(1, Eunits).getConversionFactorFromSI()
+    units = getUnitContext(user)
+    Tunits = units.temperature or 'K'
+    Punits = units.pressure or 'Pa'
+    Eunits = units.energy or 'J/mol'
+    kunits, kunits_low, kfactor, numReactants = getRateCoefficientUnits(kinetics, user=units)
+    Tfactor = getConversionFactorFromSI(Tunits)
+    Pfactor = getConversionFactorFromSI(Punits)
+    Efactor = getConversionFactorFromSI(Eunits)
     if kunits == 's^-1':
         kunits = 's^{-1}'   
     
@@ -381,42 +377,25 @@ k(T,P) = {0!s}
 
 ################################################################################
 
-@register.filter
-def get_rate_coefficients(kinetics, user=None):
+def getRateCoefficientData(kinetics, user=None):
     """
-    Generate and return a set of :math:`k(T,P)` data suitable for plotting
-    using Highcharts. If a `user` is specified, the user's preferred units
-    will be used; otherwise default units will be used.
-    If `user=='A_n_Ea'` then it fits an Arrhenius expression and returns
-    the parameters (and their units).
+    Return a dictionary of :math:`k(T,P)` data suitable for plotting the
+    given `kinetics` using Highcharts, or ``None`` if there are no kinetics.
+    If a `user` is specified, the user's preferred units will be used;
+    otherwise default units will be used.
     """
     if kinetics is None:
-        return "// There are no kinetics for this entry."
-
-    if user == "A_n_Ea":
-        # Not a user, but a request to just return the Arrhenius coefficients
-        return_A_n_Ea = True
-        user = None
-    else:
-        return_A_n_Ea = False
+        return None
 
     # Define other units and conversion factors to use
-    if user and user.is_authenticated():
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = str(user_profile.temperatureUnits)
-        Punits = str(user_profile.pressureUnits)
-        Eunits = str(user_profile.energyUnits)
-    else:
-        Tunits = 'K'
-        Punits = 'Pa'
-        Eunits = 'J/mol'
-    kunits, kunits_low, kfactor, numReactants = getRateCoefficientUnits(kinetics, user=user)
-    Tfactor = Quantity(1, Tunits).getConversionFactorFromSI()
-    Pfactor = Quantity(1, Punits).getConversionFactorFromSI()
-    Efactor = Quantity(1, Eunits).getConversionFactorFromSI()
+    units = getUnitContext(user)
+    Tunits = units.temperature or 'K'
+    Punits = units.pressure or 'Pa'
+    kunits, kunits_low, kfactor, numReactants = getRateCoefficientUnits(kinetics, user=units)
+    Tfactor = getConversionFactorFromSI(Tunits)
+    Pfactor = getConversionFactorFromSI(Punits)
         
     # Generate data to use for plots
-    Tdata = []; Pdata = []; kdata = []
     if kinetics.Tmin is not None and kinetics.Tmax is not None:
         if kinetics.Tmin.value_si == kinetics.Tmax.value_si:
             Tmin = kinetics.Tmin.value_si - 5
@@ -437,77 +416,96 @@ def get_rate_coefficients(kinetics, user=None):
     # Number of points in Tlist (ten times that in Pdep's Tlist2)
     points = 50
     
-    for Tinv in numpy.linspace(1.0 / Tmax, 1.0 / Tmin, points):
-        Tdata.append(1.0 / Tinv)
+    # Evaluate each grid in one call, with the temperatures evenly spaced in 1/T
+    Tdata = 1.0 / numpy.linspace(1.0 / Tmax, 1.0 / Tmin, points)
+    Tdata2 = 1.0 / numpy.linspace(1.0 / Tmax, 1.0 / Tmin, points / 10)
     if kinetics.isPressureDependent():
-        for logP in numpy.arange(math.log10(Pmin), math.log10(Pmax)+0.001, 1):
-            Pdata.append(10**logP)
-        for P in Pdata:
-            klist = []
-            for T in Tdata:
-                klist.append(kinetics.getRateCoefficient(T,P) * kfactor)
-            kdata.append(klist)
-    elif isinstance(kinetics, ArrheniusEP):
-        for T in Tdata:
-            kdata.append(kinetics.getRateCoefficient(T, dHrxn=0) * kfactor)
+        Pdata = 10 ** numpy.arange(math.log10(Pmin), math.log10(Pmax)+0.001, 1)
+        Pdata2 = 10 ** numpy.arange(math.log10(Pmin), math.log10(Pmax)+0.001, 0.1)
+        kdata = getRateCoefficients(kinetics, Tdata, Pdata) * kfactor
+        kdata2 = getRateCoefficients(kinetics, Tdata2, Pdata2) * kfactor
     else:
-        for T in Tdata:
-            kdata.append(kinetics.getRateCoefficient(T) * kfactor)
-    
-    Tdata2 = []; Pdata2 = []; kdata2 = []
-    for Tinv in numpy.linspace(1.0 / Tmax, 1.0 / Tmin, points / 10):
-        Tdata2.append(1.0 / Tinv)
+        Pdata = Pdata2 = numpy.array([])
+        kdata = getRateCoefficients(kinetics, Tdata) * kfactor
+        kdata2 = getRateCoefficients(kinetics, Tdata2) * kfactor
+
+    return {
+        'Tlist': Tdata * Tfactor,
+        'Plist': Pdata * Pfactor,
+        'klist': kdata,
+        'Tlist2': Tdata2 * Tfactor,
+        'Plist2': Pdata2 * Pfactor,
+        'klist2': kdata2,
+        'Tunits': Tunits,
+        'Punits': Punits,
+        'kunits': kunits,
+    }
+
+def getArrheniusFit(kinetics):
+    """
+    Fit an Arrhenius expression to the given `kinetics` in default units and
+    return a dictionary of the parameters (and their units), or ``None`` if
+    there are no kinetics. Pressure-dependent kinetics are fitted at the
+    highest pressure available.
+    """
+    data = getRateCoefficientData(kinetics)
+    if data is None:
+        return None
+
+    Eunits = 'J/mol'
+    Efactor = getConversionFactorFromSI(Eunits)
+    kunits, kunits_low, kfactor, numReactants = getRateCoefficientUnits(kinetics)
+
     if kinetics.isPressureDependent():
-        for logP in numpy.arange(math.log10(Pmin), math.log10(Pmax)+0.001, 0.1):
-            Pdata2.append(10**logP)
-        for P in Pdata2:
-            klist = []
-            for T in Tdata2:
-                klist.append(kinetics.getRateCoefficient(T,P) * kfactor)
-            kdata2.append(klist)
-    elif isinstance(kinetics, ArrheniusEP):
-        for T in Tdata2:
-            kdata2.append(kinetics.getRateCoefficient(T, dHrxn=0) * kfactor)
+        # Use the highest pressure we have available
+        klist = data['klist'][-1]
+        pressure_note = " (At {0} {1})".format(data['Plist'][-1], data['Punits'])
     else:
-        for T in Tdata2:
-            kdata2.append(kinetics.getRateCoefficient(T) * kfactor)
-    
-    if return_A_n_Ea:
-        "We are only interested in the (fitted) Arrhenius parameters (and their units)"
-        Tlist = numpy.array([T * Tfactor for T in Tdata], numpy.float64)
-        
-        if kinetics.isPressureDependent():
-            # Use the highest pressure we have available
-            klist = numpy.array(kdata[-1], numpy.float64)
-            pressure_note = " (At {0} {1})".format(Pdata[-1],Punits)
-        else:
-            klist = numpy.array(kdata, numpy.float64)
-            pressure_note = ""
+        klist = data['klist']
+        pressure_note = ""
 
-        kModel = Arrhenius().fitToData(Tlist, klist, kunits)
-    
-        return mark_safe("""A = {0}; n = {1}; Ea = {2}; Aunits = "{3}"; Eunits = "{4}"; Pnote = "{5}";""".format(
-                            kModel.A.value_si * kfactor,
-                            kModel.n.value_si,
-                            kModel.Ea.value_si * Efactor,
-                            kunits,
-                            Eunits,
-                            pressure_note
+    kModel = Arrhenius().fitToData(data['Tlist'], klist, kunits)
+
+    return {
+        'A': kModel.A.value_si * kfactor,
+        'n': kModel.n.value_si,
+        'Ea': kModel.Ea.value_si * Efactor,
+        'Aunits': kunits,
+        'Eunits': Eunits,
+        'Pnote': pressure_note,
+    }
+
+@register.filter
+def get_rate_coefficients(kinetics, user=None):
+    """
+    Generate and return a set of :math:`k(T,P)` data suitable for plotting
+    using Highcharts. If a `user` is specified, the user's preferred units
+    will be used; otherwise default units will be used.
+    If `user=='A_n_Ea'` then it fits an Arrhenius expression and returns
+    the parameters (and their units).
+    """
+    if kinetics is None:
+        return "// There are no kinetics for this entry."
+
+    if user == "A_n_Ea":
+        # Not a user, but a request to just return the Arrhenius coefficients
+        return mark_safe("""A = {A}; n = {n}; Ea = {Ea}; Aunits = "{Aunits}"; Eunits = "{Eunits}"; Pnote = "{Pnote}";""".format(
+                            **getArrheniusFit(kinetics)
                         ))
     
-    
+    data = getRateCoefficientData(kinetics, user)
     return mark_safe("""Tlist = {0};Plist = {1};klist = {2};
                         Tlist2 = {3};Plist2 = {4}; klist2 = {5};
                         Tunits = "{6}";Punits = "{7}";kunits = "{8}";""".format(
-                             [T * Tfactor for T in Tdata],
-                             [P * Pfactor for P in Pdata],
-                             kdata,
-                             [T * Tfactor for T in Tdata2],
-                             [P * Pfactor for P in Pdata2],
-                             kdata2,
-                             Tunits,
-                             Punits,
-                             kunits,
+                             getJSONArray(data['Tlist']),
+                             getJSONArray(data['Plist']),
+                             getJSONArray(data['klist']),
+                             getJSONArray(data['Tlist2']),
+                             getJSONArray(data['Plist2']),
+                             getJSONArray(data['klist2']),
+                             data['Tunits'],
+                             data['Punits'],
+                             data['kunits'],
                          ))
 
 
@@ -41,7 +41,7 @@ from django.utils.safestring import mark_safe
 import numpy
 
 from rmgweb.main.tools import getLaTeXScientificNotation, getStructureMarkup
-from rmgweb.main.models import UserProfile
+from rmgweb.main.unitContext import getConversionFactorFromSI, getUnitContext
 
 from rmgpy.quantity import Quantity, ArrayQuantity
 from rmgpy.statmech import *
@@ -58,15 +58,11 @@ def render_states_math(states, user=None):
     default units will be used.
     """
     # Define other units and conversion factors to use
-    if user and user.is_authenticated():
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = str(user_profile.temperatureUnits)
-        Eunits = str(user_profile.energyUnits)
-    else:
-        Tunits = 'K'
-        Eunits = 'kcal/mol'
-    Tfactor = Quantity(1, Tunits).getConversionFactorFromSI()
-    Efactor = Quantity(1, Eunits).getConversionFactorFromSI()
+    units = getUnitContext(user)
+    Tunits = units.temperature or 'K'
+    Eunits = units.energy or 'kcal/mol'
+    Tfactor = getConversionFactorFromSI(Tunits)
+    Efactor = getConversionFactorFromSI(Eunits)
     
     # The string that will be returned to the template
     result = ''
@@ -174,15 +170,11 @@ def get_states_data(states, user=None):
     """
     import rmgpy.constants as constants
     # Define other units and conversion factors to use
-    if user and user.is_authenticated():
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = str(user_profile.temperatureUnits)
-        Eunits = str(user_profile.energyUnits)
-    else:
-        Tunits = 'K'
-        Eunits = 'kcal/mol'
-    Tfactor = Quantity(1, Tunits).getConversionFactorFromSI()
-    Efactor = Quantity(1, Eunits).getConversionFactorFromSI()
+    units = getUnitContext(user)
+    Tunits = units.temperature or 'K'
+    Eunits = units.energy or 'kcal/mol'
+    Tfactor = getConversionFactorFromSI(Tunits)
+    Efactor = getConversionFactorFromSI(Eunits)
     Qunits = ''
     Qfactor = 1.0
     rhounits = 'per cm^-1' 
@@ -41,8 +41,8 @@ from django.core.urlresolvers import reverse
 
 import numpy
 
-from rmgweb.main.tools import getLaTeXScientificNotation, getStructureMarkup
-from rmgweb.main.models import UserProfile
+from rmgweb.main.tools import cachedRendering, getJSONArray, getLaTeXScientificNotation, getStructureMarkup
+from rmgweb.main.unitContext import getConversionFactorFromSI, getUnitContext
 
 from rmgpy.quantity import Quantity
 from rmgpy.thermo import *
@@ -50,6 +50,7 @@ from rmgpy.thermo import *
 ################################################################################
 
 @register.filter
+@cachedRendering
 def render_thermo_math(thermo, user=None):
     """
     Return a math representation of the given `thermo` using MathJax. If a
@@ -57,27 +58,19 @@ def render_thermo_math(thermo, user=None):
     default units will be used.
     """
     # Define other units and conversion factors to use
-    if user and user.is_authenticated():
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = str(user_profile.temperatureUnits)
-        Punits = str(user_profile.pressureUnits)
-        Cpunits = str(user_profile.heatCapacityUnits)
-        Hunits = str(user_profile.energyUnits)
-        Sunits = str(user_profile.heatCapacityUnits)
-        Gunits = str(user_profile.energyUnits)
-    else:
-        Tunits = 'K'
-        Punits = 'bar'
-        Cpunits = 'cal/(mol*K)'
-        Hunits = 'kcal/mol'
-        Sunits = 'cal/(mol*K)'
-        Gunits = 'kcal/mol'
-    Tfactor = Quantity(1, Tunits).getConversionFactorFromSI()
-    Pfactor = Quantity(1, Punits).getConversionFactorFromSI()
-    Cpfactor = Quantity(1, Cpunits).getConversionFactorFromSI()
-    Hfactor = Quantity(1, Hunits).getConversionFactorFromSI()
-    Sfactor = Quantity(1, Sunits).getConversionFactorFromSI()
-    Gfactor = Quantity(1, Gunits).getConversionFactorFromSI()
+    units = getUnitContext(user)
+    Tunits = units.temperature or 'K'
+    Punits = units.pressure or 'bar'
+    Cpunits = units.heatCapacity or 'cal/(mol*K)'
+    Hunits = units.energy or 'kcal/mol'
+    Sunits = units.heatCapacity or 'cal/(mol*K)'
+    Gunits = units.energy or 'kcal/mol'
+    Tfactor = getConversionFactorFromSI(Tunits)
+    Pfactor = getConversionFactorFromSI(Punits)
+    Cpfactor = getConversionFactorFromSI(Cpunits)
+    Hfactor = getConversionFactorFromSI(Hunits)
+    Sfactor = getConversionFactorFromSI(Sunits)
+    Gfactor = getConversionFactorFromSI(Gunits)
     
     # The string that will be returned to the template
     result = ''
@@ -265,39 +258,29 @@ def render_thermo_math(thermo, user=None):
 
 ################################################################################
 
-@register.filter
-def get_thermo_data(thermo, user=None):
+def getThermoPlotData(thermo, user=None):
     """
-    Generate and return a set of thermodynamics data suitable for plotting
-    using Highcharts. If a `user` is specified, the user's preferred units
-    will be used; otherwise default units will be used.
+    Return a dictionary of thermodynamics data suitable for plotting the
+    given `thermo` using Highcharts, or ``None`` if the model cannot be
+    plotted. If a `user` is specified, the user's preferred units will be
+    used; otherwise default units will be used.
     """
     
     if not isinstance(thermo, (ThermoData, Wilhoit, NASA)):
-        return ''
+        return None
     
     # Define other units and conversion factors to use
-    if user and user.is_authenticated():
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = str(user_profile.temperatureUnits)
-        Punits = str(user_profile.pressureUnits)
-        Cpunits = str(user_profile.heatCapacityUnits)
-        Hunits = str(user_profile.energyUnits)
-        Sunits = str(user_profile.heatCapacityUnits)
-        Gunits = str(user_profile.energyUnits)
-    else:
-        Tunits = 'K'
-        Punits = 'bar'
-        Cpunits = 'cal/(mol*K)'
-        Hunits = 'kcal/mol'
-        Sunits = 'cal/(mol*K)'
-        Gunits = 'kcal/mol'
-    Tfactor = Quantity(1, Tunits).getConversionFactorFromSI()
-    Pfactor = Quantity(1, Punits).getConversionFactorFromSI()
-    Cpfactor = Quantity(1, Cpunits).getConversionFactorFromSI()
-    Hfactor = Quantity(1, Hunits).getConversionFactorFromSI()
-    Sfactor = Quantity(1, Sunits).getConversionFactorFromSI()
-    Gfactor = Quantity(1, Gunits).getConversionFactorFromSI()
+    units = getUnitContext(user)
+    Tunits = units.temperature or 'K'
+    Cpunits = units.heatCapacity or 'cal/(mol*K)'
+    Hunits = units.energy or 'kcal/mol'
+    Sunits = units.heatCapacity or 'cal/(mol*K)'
+    Gunits = units.energy or 'kcal/mol'
+    Tfactor = getConversionFactorFromSI(Tunits)
+    Cpfactor = getConversionFactorFromSI(Cpunits)
+    Hfactor = getConversionFactorFromSI(Hunits)
+    Sfactor = getConversionFactorFromSI(Sunits)
+    Gfactor = getConversionFactorFromSI(Gunits)
         
     if thermo.Tmin is not None and thermo.Tmax is not None:
         Tmin = thermo.Tmin.value_si
@@ -308,17 +291,42 @@ def get_thermo_data(thermo, user=None):
     else:
         Tmin = 300
         Tmax = 2000
-    Tdata = []; Cpdata = []; Hdata = []; Sdata = []; Gdata = []
+    Tdata = numpy.arange(Tmin, Tmax+1, 10)
     
     try:
-        for T in numpy.arange(Tmin, Tmax+1, 10):
-            Tdata.append(T * Tfactor)
-            Cpdata.append(thermo.getHeatCapacity(T) * Cpfactor)
-            Hdata.append(thermo.getEnthalpy(T) * Hfactor)
-            Sdata.append(thermo.getEntropy(T) * Sfactor)
-            Gdata.append(thermo.getFreeEnergy(T) * Gfactor)
+        Cpdata = numpy.array([thermo.getHeatCapacity(T) for T in Tdata])
+        Hdata = numpy.array([thermo.getEnthalpy(T) for T in Tdata])
+        Sdata = numpy.array([thermo.getEntropy(T) for T in Tdata])
+        Gdata = numpy.array([thermo.getFreeEnergy(T) for T in Tdata])
+    except:
+        # don't fail completely if thermo data is incomplete
+        return None
+
+    return {
+        'Tlist': Tdata * Tfactor,
+        'Cplist': Cpdata * Cpfactor,
+        'Hlist': Hdata * Hfactor,
+        'Slist': Sdata * Sfactor,
+        'Glist': Gdata * Gfactor,
+        'Tunits': Tunits,
+        'Cpunits': Cpunits,
+        'Hunits': Hunits,
+        'Sunits': Sunits,
+        'Gunits': Gunits,
+    }
+
+@register.filter
+def get_thermo_data(thermo, user=None):
+    """
+    Generate and return a set of thermodynamics data suitable for plotting
+    using Highcharts. If a `user` is specified, the user's preferred units
+    will be used; otherwise default units will be used.
+    """
+    data = getThermoPlotData(thermo, user)
+    if data is None:
+        return ''
     
-        return mark_safe("""
+    return mark_safe("""
     Tlist = {0};
     Cplist = {1};
     Hlist = {2};
@@ -330,17 +338,14 @@ def get_thermo_data(thermo, user=None):
     Sunits = "{8!s}";
     Gunits = "{9!s}";
         """.format(
-            Tdata,
-            Cpdata, 
-            Hdata,
-            Sdata, 
-            Gdata, 
-            Tunits, 
-            Cpunits, 
-            Hunits,
-            Sunits,
-            Gunits,
+            getJSONArray(data['Tlist']),
+            getJSONArray(data['Cplist']),
+            getJSONArray(data['Hlist']),
+            getJSONArray(data['Slist']),
+            getJSONArray(data['Glist']),
+            data['Tunits'],
+            data['Cpunits'],
+            data['Hunits'],
+            data['Sunits'],
+            data['Gunits'],
     ))
-    except:
-        # don't fail completely if thermo data is incomplete
-        return ''
@@ -28,17 +28,382 @@
 #
 ################################################################################
 
+import cPickle
+import functools
+import hashlib
+import json
 import math
 import numpy
+import os
 import re
+import tempfile
+import threading
 import urllib
+from collections import OrderedDict
 
 from django.core.urlresolvers import reverse
+from django.http import Http404, HttpResponsePermanentRedirect
 
 import rmgpy.constants as constants
 from rmgpy.molecule.molecule import Molecule
 from rmgpy.molecule.group import Group
 
+import rmgweb.settings
+from rmgweb.main.unitContext import getUnitContext
+
+################################################################################
+
+class LRUCache(object):
+    """
+    A thread-safe dictionary-like cache that holds at most `size` items,
+    evicting the least recently used item when full.
+    """
+
+    def __init__(self, size=100):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def get(self, key, default=None):
+        """
+        Return the item stored under `key`, or `default` if there is none.
+        """
+        with self.lock:
+            try:
+                value = self.items.pop(key)
+            except KeyError:
+                return default
+            self.items[key] = value
+            return value
+
+    def set(self, key, value):
+        """
+        Store `value` under `key`, evicting the least recently used item if
+        the cache is full.
+        """
+        with self.lock:
+            self.items.pop(key, None)
+            self.items[key] = value
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all items from the cache.
+        """
+        with self.lock:
+            self.items.clear()
+
+def writeCacheFile(path, name, data):
+    """
+    Write `data` to the file `name` in the cache directory at `path`,
+    creating the directory if needed. The data is written to a temporary file
+    first so that other processes never read a partly written file.
+    """
+    filename = os.path.join(path, name)
+    try:
+        if not os.path.exists(path):
+            os.makedirs(path)
+        fd, tmp_path = tempfile.mkstemp(dir=path, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.rename(tmp_path, filename)
+    except (IOError, OSError), e:
+        print "Unable to write cache file {0}: {1!s}".format(filename, e)
+
+def readCacheFile(path, name):
+    """
+    Return the contents of the file `name` in the cache directory at `path`,
+    or ``None`` if there is no such file.
+    """
+    try:
+        with open(os.path.join(path, name), 'rb') as f:
+            return f.read()
+    except (IOError, OSError):
+        return None
+
+def touchCacheFile(path, name):
+    """
+    Mark the file `name` in the cache directory at `path` as recently used,
+    so that :func:`purgeCacheFiles` keeps it.
+    """
+    try:
+        os.utime(os.path.join(path, name), None)
+    except (IOError, OSError):
+        pass
+
+def purgeCacheFiles(path, suffix, maxFiles):
+    """
+    Delete the least recently used files ending in `suffix` from the cache
+    directory at `path` once there are more than `maxFiles` of them, leaving
+    nine tenths of `maxFiles`.
+    """
+    try:
+        names = [name for name in os.listdir(path) if name.endswith(suffix)]
+    except OSError:
+        return
+    if len(names) <= maxFiles:
+        return
+    files = []
+    for name in names:
+        try:
+            files.append((os.path.getmtime(os.path.join(path, name)), name))
+        except OSError:
+            pass
+    files.sort()
+    for mtime, name in files[:len(files) - maxFiles * 9 // 10]:
+        try:
+            os.remove(os.path.join(path, name))
+        except OSError:
+            pass
+
+class CacheDirectory(object):
+    """
+    Base class of the caches that keep files in the directory at `path`,
+    which is shared between processes. Every `purgeInterval` files written
+    by a process, the directory is purged down to `maxFiles` files with the
+    given `suffix`, or never if `maxFiles` is ``None``.
+    """
+
+    suffix = ''
+    purgeInterval = 100
+
+    def __init__(self, path, maxFiles=None):
+        self.path = path
+        self.maxFiles = maxFiles
+        self.writes = 0
+
+    def read(self, key):
+        """
+        Return the contents of the file for `key`, or ``None`` if there is
+        none.
+        """
+        data = readCacheFile(self.path, key + self.suffix)
+        if data is not None and self.maxFiles is not None:
+            touchCacheFile(self.path, key + self.suffix)
+        return data
+
+    def write(self, key, data):
+        """
+        Write `data` to the file for `key`, purging the directory from time
+        to time.
+        """
+        writeCacheFile(self.path, key + self.suffix, data)
+        self.writes += 1
+        if self.maxFiles is not None and self.writes % self.purgeInterval == 0:
+            purgeCacheFiles(self.path, self.suffix, self.maxFiles)
+            self.purged()
+
+    def purged(self):
+        """
+        Called after the directory has been purged.
+        """
+        pass
+
+class DrawingCache(CacheDirectory):
+    """
+    A content-addressed cache of structure drawings. Each drawing is stored
+    under a key made from the structure key of what it draws, in memory in
+    an :class:`LRUCache` of `size` drawings and on disk in the directory at
+    `path`, which is shared between processes, up to `maxFiles` drawings.
+    If `path` is ``None`` the drawings are only kept in memory.
+    """
+
+    suffix = '.svg'
+
+    def __init__(self, path, size=1000, maxFiles=None):
+        CacheDirectory.__init__(self, path, maxFiles)
+        self.memory = LRUCache(size)
+
+    def get(self, key):
+        """
+        Return the drawing stored under `key`, or ``None`` if there is none.
+        """
+        data = self.memory.get(key)
+        if data is None and self.path is not None:
+            data = self.read(key)
+            if data is None:
+                return None
+            self.memory.set(key, data)
+        return data
+
+    def set(self, key, data, persist=True):
+        """
+        Store the drawing `data` under `key`, on disk as well unless
+        `persist` is ``False``.
+        """
+        self.memory.set(key, data)
+        if persist and self.path is not None:
+            self.write(key, data)
+
+class StructureStore(CacheDirectory):
+    """
+    A store of the adjacency lists of the structures linked to from the site,
+    so that URLs can name a structure by a short key, a hash of its adjacency
+    list, instead of by the adjacency list itself. The adjacency lists are
+    stored on disk in the directory at `path`, which is shared between
+    processes, and the `size` most recently used are kept in memory. If
+    `path` is ``None`` they are only kept in memory, and keys stop resolving
+    once evicted. Structures that only come from clients are never written
+    to disk, so they are also only kept in memory. At most `maxFiles` are
+    kept on disk, the least recently used being deleted first.
+    """
+
+    keyPattern = re.compile(r'^[0-9a-f]{20}$')
+    suffix = '.adj'
+
+    def __init__(self, path, size=10000, maxFiles=None):
+        CacheDirectory.__init__(self, path, maxFiles)
+        self.memory = LRUCache(size)
+        # Keys recently found or written on disk, to save checking again
+        self.shared = LRUCache(size)
+        # Keys of the structures from clients, which are only kept in memory
+        self.transient = LRUCache(size)
+
+    def is_key(self, text):
+        """
+        Return ``True`` if `text` is a structure key rather than an adjacency
+        list. Adjacency lists always contain whitespace, so cannot match.
+        """
+        return self.keyPattern.match(text) is not None
+
+    def get_key(self, adjlist):
+        """
+        Return the key of the structure with adjacency list `adjlist`.
+        Whitespace and blank lines do not change the key.
+        """
+        lines = [line.strip() for line in adjlist.splitlines()]
+        return hashlib.sha1('\n'.join([line for line in lines if line])).hexdigest()[:20]
+
+    def add(self, adjlist, persist=True):
+        """
+        Store the adjacency list `adjlist` and return its key. If `persist`
+        is ``True`` it is also written to disk, so that the key keeps
+        resolving in every process; if ``False`` it is only kept in memory,
+        as for structures from clients. If `persist` is ``None`` a structure
+        already stored keeps the persistence it has, and a new one is
+        written to disk.
+        """
+        key = self.get_key(adjlist)
+        if key not in self.memory:
+            self.memory.set(key, adjlist)
+        if persist is None:
+            persist = key not in self.transient
+        if self.path is None or self.is_shared(key):
+            pass
+        elif persist:
+            self.write(key, adjlist)
+            self.shared.set(key, True)
+        else:
+            self.transient.set(key, True)
+        return key
+
+    def purged(self):
+        self.shared.clear()
+
+    def is_shared(self, key):
+        """
+        Return ``True`` if the structure stored under `key` is on disk, so
+        that the key resolves in every process.
+        """
+        if self.path is None:
+            return False
+        if key not in self.shared:
+            if not os.path.exists(os.path.join(self.path, key + '.adj')):
+                return False
+            self.shared.set(key, True)
+        return True
+
+    def get(self, key):
+        """
+        Return the adjacency list stored under `key`, or ``None`` if there is
+        none.
+        """
+        adjlist = self.memory.get(key)
+        if adjlist is None and self.path is not None:
+            adjlist = self.read(key)
+            if adjlist is None:
+                return None
+            self.memory.set(key, adjlist)
+        return adjlist
+
+# The structures linked to from the site, and the molecules and groups most
+# recently parsed from them
+structure_store = StructureStore(rmgweb.settings.STRUCTURE_STORE_PATH, rmgweb.settings.STRUCTURE_CACHE_SIZE, rmgweb.settings.STRUCTURE_STORE_MAX_FILES)
+parsed_structure_cache = LRUCache(rmgweb.settings.STRUCTURE_CACHE_SIZE)
+
+def getStructureKey(text, cls=Molecule):
+    """
+    Return the structure key for `text` taken from a URL, which is either
+    a key already or an (URL-quoted) adjacency list of an object of class
+    `cls`. Adjacency lists are parsed and kept in memory in canonical form,
+    but not written to disk, as they come from the client. Raises
+    :class:`Http404` if the adjacency list cannot be parsed.
+    """
+    if structure_store.is_key(text):
+        return text
+    try:
+        structure = cls().fromAdjacencyList(str(urllib.unquote(text)))
+    except Exception:
+        raise Http404
+    if cls is Molecule:
+        adjlist = structure.toAdjacencyList(removeH=False)
+    else:
+        adjlist = structure.toAdjacencyList()
+    key = structure_store.add(adjlist, persist=False)
+    parsed_structure_cache.set((cls, key), structure)
+    return key
+
+def structureFromURL(text, cls):
+    """
+    Return a new object of class `cls` (:class:`Molecule` or :class:`Group`)
+    for the structure key or adjacency list `text` taken from a URL. Raises
+    :class:`Http404` if the key is not known.
+    """
+    key = getStructureKey(text, cls)
+    structure = parsed_structure_cache.get((cls, key))
+    if structure is None:
+        adjlist = structure_store.get(key)
+        if adjlist is None:
+            raise Http404
+        structure = cls().fromAdjacencyList(adjlist)
+        parsed_structure_cache.set((cls, key), structure)
+    # Return a copy, since the caller is free to modify what it is given
+    return structure.copy(deep=True)
+
+def structureURLs(*names, **options):
+    """
+    Decorator for views whose keyword arguments `names` are structures taken
+    from the URL, as objects of class `cls` (:class:`Molecule` unless given
+    as a keyword option). Requests that give any of them as an adjacency list
+    rather than a structure key are redirected to the equivalent URL with
+    keys, if the site links to those structures. Otherwise the keys would
+    only resolve in this process, so the view is called with them directly.
+    """
+    cls = options.get('cls', Molecule)
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, **kwargs):
+            legacy = False
+            for name in names:
+                if kwargs.get(name) and not structure_store.is_key(kwargs[name]):
+                    kwargs[name] = getStructureKey(kwargs[name], cls)
+                    legacy = True
+            if legacy and all([structure_store.is_shared(kwargs[name]) for name in names if kwargs.get(name)]):
+                url = reverse(wrapper, kwargs=kwargs)
+                if request.META.get('QUERY_STRING'):
+                    url += '?' + request.META['QUERY_STRING']
+                return HttpResponsePermanentRedirect(url)
+            return view(request, **kwargs)
+        return wrapper
+    return decorator
+
 ################################################################################
 
 def moleculeToAdjlist(molecule):
@@ -46,91 +411,295 @@ def moleculeToAdjlist(molecule):
     Convert a given :class:`Molecule` object `molecule` to a string 
     representation of its structure suitable for a URL.
     """
-    mol = molecule.copy(deep=True)
-    mol.clearLabeledAtoms()
-    adjlist = mol.toAdjacencyList(removeH=False)
+    if molecule.containsLabeledAtom():
+        # Only copy the molecule if there are labels to clear from it
+        molecule = molecule.copy(deep=True)
+        molecule.clearLabeledAtoms()
+    adjlist = molecule.toAdjacencyList(removeH=False)
     return adjlist
 
-def moleculeToInfo(molecule):
+def moleculeToURL(molecule):
+    """
+    Return the structure key naming the given :class:`Molecule` object
+    `molecule` in URLs.
+    """
+    return structure_store.add(moleculeToAdjlist(molecule))
+
+def moleculeToInfo(molecule, persist=None):
     """
     Creates an html rendering which includes molecule structure image but
     also allows you to click on it to enter a molecule info page.
     """
-
-    from rmgweb.database.views import moleculeEntry
-    href = reverse(moleculeEntry, kwargs={'adjlist': molecule.toAdjacencyList()})
-    structureMarkup = getStructureMarkup(molecule)
-    markup = '<a href="'+ href + '">' + structureMarkup + '</a>'
-    return markup
+    return getInfoMarkup('molecule', molecule.toAdjacencyList(), persist)
 
 def moleculeFromURL(adjlist):
     """
-    Convert a given adjacency list `adjlist` from a URL to the corresponding
-    :class:`Molecule` object.
+    Convert a given structure key or adjacency list `adjlist` from a URL to
+    the corresponding :class:`Molecule` object.
     """
-    adjlist = str(urllib.unquote(adjlist))
-    molecule = Molecule().fromAdjacencyList(adjlist)
-    return molecule
+    return structureFromURL(adjlist, Molecule)
 
 ################################################################################
 
 def groupToURL(group):
     """
-    Convert a given :class:`Group` object `group` to a string 
-    representation of its structure suitable for a URL.
+    Return the structure key naming the given :class:`Group` object `group`
+    in URLs.
     """
-    gro = group.copy(deep=True)
-    gro.clearLabeledAtoms()
-    adjlist = gro.toAdjacencyList(removeH=False)
-    return adjlist
+    if group.containsLabeledAtom():
+        # Only copy the group if there are labels to clear from it
+        group = group.copy(deep=True)
+        group.clearLabeledAtoms()
+    return structure_store.add(group.toAdjacencyList())
 
-def groupToInfo(group):
+def groupToInfo(group, persist=None):
     """
     Creates an html rendering which includes group structure image but
     also allows you to click on it to enter a group info page.
     """
-
-    from rmgweb.database.views import groupEntry
-    href = reverse(groupEntry, kwargs={'adjlist': group.toAdjacencyList()})
-    structureMarkup = getStructureMarkup(group)
-    markup = '<a href="'+ href + '">' + structureMarkup + '</a>'
-    return markup
+    return getInfoMarkup('group', group.toAdjacencyList(), persist)
 
 def groupFromURL(adjlist):
     """
-    Convert a given adjacency list `adjlist` from a URL to the corresponding
-    :class:`Group` object.
-    """   
-    adjlist = str(urllib.unquote(adjlist))
-    group = Group().fromAdjacencyList(adjlist)
-    return group
+    Convert a given structure key or adjacency list `adjlist` from a URL to
+    the corresponding :class:`Group` object.
+    """
+    return structureFromURL(adjlist, Group)
 
 ################################################################################
 
-def getStructureInfo(object):
+# Markup of the structures drawn on the site, keyed on their adjacency lists
+# so that each structure is only serialized once per rendering
+structure_cache = LRUCache(rmgweb.settings.STRUCTURE_CACHE_SIZE)
+
+# Markup of database entries, keyed on the identity of the entry; the entry is
+# stored alongside its markup so that its id cannot be reused while cached
+entry_structure_cache = LRUCache(rmgweb.settings.STRUCTURE_CACHE_SIZE)
+
+def getInfoMarkup(kind, adjlist, persist=None):
+    """
+    Return the clickable markup for a structure of the given `kind`
+    (``'molecule'`` or ``'group'``) with adjacency list `adjlist`. The
+    structure is stored as by :meth:`StructureStore.add` with `persist`.
+    """
+    # Store the structure even if the markup is cached, as it may be
+    # persisted now where it was not before
+    url = structure_store.add(adjlist, persist)
+    key = ('info', kind, adjlist)
+    markup = structure_cache.get(key)
+    if markup is None:
+        from rmgweb.database.views import groupEntry, moleculeEntry
+        href = reverse(groupEntry if kind == 'group' else moleculeEntry, kwargs={'adjlist': url})
+        markup = '<a href="'+ href + '">' + getImageMarkup(kind, adjlist, adjlist, persist) + '</a>'
+        structure_cache.set(key, markup)
+    return markup
+
+def getImageMarkup(kind, adjlist, title, persist=None):
+    """
+    Return the ``<img>`` tag drawing a structure of the given `kind`
+    (``'molecule'`` or ``'group'``) with adjacency list `adjlist`. The
+    structure is stored as by :meth:`StructureStore.add` with `persist`.
+    """
+    url = structure_store.add(adjlist, persist)
+    key = ('image', kind, adjlist, title)
+    markup = structure_cache.get(key)
+    if markup is None:
+        if kind == 'group':
+            markup = '<img src="{0}" alt="{1}" title="{1}" />'.format(reverse('rmgweb.main.views.drawGroup', kwargs={'adjlist': url}), title)
+        else:
+            markup = '<img src="{0}" alt="{1}" title="{1}"/>'.format(reverse('rmgweb.main.views.drawMolecule', kwargs={'adjlist': url}), title)
+        structure_cache.set(key, markup)
+    return markup
+
+def getStructureInfo(object, persist=None):
     """ 
     Convert either a Entry, Molecule, Species, or Group object to its html 
     markup containing a clickable image of the group or molecule that contains 
-    a link to its information page.
+    a link to its information page. The structures of database entries are
+    always written to disk; others keep the persistence they already have
+    (see :meth:`StructureStore.add`) unless `persist` is given.
     """
     from rmgpy.data.base import Entry, LogicNode, LogicOr, LogicAnd
     from rmgpy.species import Species
     
     if isinstance(object, Entry):
-        object = object.item
+        cached = entry_structure_cache.get(id(object))
+        if cached is not None and cached[0] is object:
+            return cached[1]
+        markup = getStructureInfo(object.item, persist=True)
+        entry_structure_cache.set(id(object), (object, markup))
+        return markup
         
     if isinstance(object, Molecule):
-        return moleculeToInfo(object)
+        return moleculeToInfo(object, persist)
     elif isinstance(object, Species):
-        return moleculeToInfo(object.molecule[0])
+        return moleculeToInfo(object.molecule[0], persist)
     elif isinstance(object, Group):
-        return groupToInfo(object)
+        return groupToInfo(object, persist)
     elif isinstance(object, (LogicNode, LogicOr, LogicAnd)):
         return str(object)
     else:
         return ''
 ################################################################################
 
+def getLog10RateCoefficients(kineticsList, Tlist, P=1e5):
+    """
+    Return an array of log10 of the rate coefficient in SI units of each of
+    the kinetics models in `kineticsList` at each of the temperatures in
+    `Tlist` (in K) and the pressure `P` (in Pa). Arrhenius and ArrheniusEP
+    models are evaluated together in one vectorized pass; other models are
+    evaluated one at a time.
+    """
+    from rmgpy.kinetics import Arrhenius, ArrheniusEP
+    Tlist = numpy.array(Tlist, numpy.float64)
+    log10k = numpy.zeros((len(kineticsList), len(Tlist)))
+
+    arrhenius = []
+    A = []; n = []; T0 = []; Ea = []
+    for i, kinetics in enumerate(kineticsList):
+        if type(kinetics) is Arrhenius:
+            arrhenius.append(i)
+            A.append(kinetics.A.value_si); n.append(kinetics.n.value_si)
+            T0.append(kinetics.T0.value_si); Ea.append(kinetics.Ea.value_si)
+        elif type(kinetics) is ArrheniusEP:
+            arrhenius.append(i)
+            A.append(kinetics.A.value_si); n.append(kinetics.n.value_si)
+            T0.append(1.0); Ea.append(kinetics.getActivationEnergy(0.0))
+        else:
+            log10k[i,:] = [math.log10(kinetics.getRateCoefficient(T, P)) for T in Tlist]
+
+    if arrhenius:
+        A = numpy.array(A)[:,numpy.newaxis]
+        n = numpy.array(n)[:,numpy.newaxis]
+        T0 = numpy.array(T0)[:,numpy.newaxis]
+        Ea = numpy.array(Ea)[:,numpy.newaxis]
+        log10k[arrhenius,:] = numpy.log10(A) + n * numpy.log10(Tlist / T0) - Ea / (constants.R * Tlist * math.log(10))
+
+    return log10k
+
+def getRateCoefficients(kinetics, Tlist, Plist=None):
+    """
+    Return an array of the rate coefficient in SI units of the kinetics model
+    `kinetics` at each of the temperatures in `Tlist` (in K) or, if `Plist`
+    is given, a ``len(Plist)`` by ``len(Tlist)`` array at each of the
+    pressures in `Plist` (in Pa). Arrhenius, ArrheniusEP, MultiArrhenius,
+    PDepArrhenius, MultiPDepArrhenius and Chebyshev models are evaluated on
+    the whole grid with numpy; other models are evaluated point by point.
+    """
+    from rmgpy.kinetics import Arrhenius, ArrheniusEP, MultiArrhenius, \
+                               PDepArrhenius, MultiPDepArrhenius, Chebyshev
+    Tlist = numpy.array(Tlist, numpy.float64)
+
+    if Plist is not None:
+        Plist = numpy.array(Plist, numpy.float64)
+        if type(kinetics) is Chebyshev:
+            Tmin = kinetics.Tmin.value_si; Tmax = kinetics.Tmax.value_si
+            Pmin = math.log10(kinetics.Pmin.value_si); Pmax = math.log10(kinetics.Pmax.value_si)
+            Tred = (2.0 / Tlist - 1.0 / Tmin - 1.0 / Tmax) / (1.0 / Tmax - 1.0 / Tmin)
+            Pred = (2.0 * numpy.log10(Plist) - Pmin - Pmax) / (Pmax - Pmin)
+            return 10.0 ** numpy.polynomial.chebyshev.chebgrid2d(Pred, Tred, kinetics.coeffs.value_si.T)
+        elif type(kinetics) is PDepArrhenius:
+            kdata = numpy.zeros((len(Plist), len(Tlist)))
+            for i, P in enumerate(Plist):
+                # Interpolate linearly in log(k) and log(P) between the
+                # expressions at the adjacent pressures
+                Plow, Phigh, alow, ahigh = kinetics.getAdjacentExpressions(P)
+                klow = getRateCoefficients(alow, Tlist)
+                if Plow == Phigh:
+                    kdata[i,:] = klow
+                    continue
+                khigh = getRateCoefficients(ahigh, Tlist)
+                with numpy.errstate(divide='ignore', invalid='ignore'):
+                    kdata[i,:] = numpy.where(klow == khigh, klow,
+                        klow * 10 ** (math.log10(P / Plow) / math.log10(Phigh / Plow) * numpy.log10(khigh / klow)))
+            return kdata
+        elif type(kinetics) is MultiPDepArrhenius:
+            return sum([getRateCoefficients(pdepArrhenius, Tlist, Plist) for pdepArrhenius in kinetics.arrhenius])
+        elif kinetics.isPressureDependent():
+            return numpy.array([[kinetics.getRateCoefficient(T, P) for T in Tlist] for P in Plist])
+        else:
+            return numpy.tile(getRateCoefficients(kinetics, Tlist), (len(Plist), 1))
+
+    if type(kinetics) is Arrhenius:
+        A = kinetics.A.value_si; n = kinetics.n.value_si
+        T0 = kinetics.T0.value_si; Ea = kinetics.Ea.value_si
+        return A * (Tlist / T0) ** n * numpy.exp(-Ea / (constants.R * Tlist))
+    elif type(kinetics) is ArrheniusEP:
+        A = kinetics.A.value_si; n = kinetics.n.value_si
+        Ea = kinetics.getActivationEnergy(0.0)
+        return A * Tlist ** n * numpy.exp(-Ea / (constants.R * Tlist))
+    elif type(kinetics) is MultiArrhenius:
+        return sum([getRateCoefficients(arrhenius, Tlist) for arrhenius in kinetics.arrhenius])
+    else:
+        return numpy.array([kinetics.getRateCoefficient(T) for T in Tlist])
+
+################################################################################
+
+# Rendered template filter output, keyed on the filter, the units used and
+# the data rendered
+render_cache = LRUCache(rmgweb.settings.RENDER_CACHE_SIZE)
+
+def cachedRendering(function):
+    """
+    Decorator for template filters that render `data` in the units of `user`
+    as a deterministic function of the two. The output is cached on the
+    units and a hash of the pickled data, which holds its values at full
+    precision, so identical data is only rendered once however many entries
+    or pages show it, and data changed by a database reload gets a new key.
+    Data that cannot be pickled is rendered without the cache.
+    """
+    @functools.wraps(function)
+    def wrapper(data, user=None):
+        if data is None:
+            return function(data, user)
+        units = getUnitContext(user)
+        try:
+            pickled = cPickle.dumps(data, cPickle.HIGHEST_PROTOCOL)
+        except (cPickle.PicklingError, TypeError):
+            return function(data, units)
+        key = (function.__name__, units.signature, type(data), hashlib.sha1(pickled).hexdigest())
+        result = render_cache.get(key)
+        if result is None:
+            result = function(data, units)
+            render_cache.set(key, result)
+        return result
+    return wrapper
+
+def getJSONArray(data, digits=6):
+    """
+    Return the numeric array `data` as a compact JSON array, with each value
+    rounded to `digits` significant figures, for plotting in the browser.
+    JSON has no NaN or infinity, so those values are written as ``null``.
+    """
+    def roundValues(values):
+        if isinstance(values, list):
+            return [roundValues(value) for value in values]
+        if not numpy.isfinite(values):
+            return None
+        return float('{0:.{1:d}g}'.format(values, digits))
+    return json.dumps(roundValues(numpy.asarray(data).tolist()), separators=(',', ':'))
+
+def getJSONObject(data, digits=6):
+    """
+    Return the dictionary `data` as a compact JSON object, in which numeric
+    arrays are written as by :func:`getJSONArray` and other values as is,
+    except for NaN and infinite numbers, which are written as ``null``.
+    """
+    items = []
+    for key, value in sorted(data.items()):
+        if isinstance(value, numpy.ndarray):
+            value = getJSONArray(value, digits)
+        elif isinstance(value, dict):
+            value = getJSONObject(value, digits)
+        elif isinstance(value, float) and not numpy.isfinite(value):
+            value = 'null'
+        else:
+            value = json.dumps(value)
+        items.append('{0}:{1}'.format(json.dumps(key), value))
+    return '{' + ','.join(items) + '}'
+
+################################################################################
+
 def getLaTeXScientificNotation(value):
     """
     Return a LaTeX-formatted string containing the provided `value` in
@@ -157,27 +726,22 @@ def getStructureMarkup(item):
     from rmgpy.molecule.molecule import Molecule
     from rmgpy.molecule.group import Group
     from rmgpy.species import Species
-    import urllib
     
     if isinstance(item, Molecule):
         # We can draw Molecule objects, so use that instead of an adjacency list
         adjlist = item.toAdjacencyList(removeH=False)
-        url = urllib.quote(adjlist)
-        structure = '<img src="{0}" alt="{1}" title="{1}"/>'.format(reverse('rmgweb.main.views.drawMolecule', kwargs={'adjlist': url}), adjlist)
+        structure = getImageMarkup('molecule', adjlist, adjlist)
     elif isinstance(item, Species) and len(item.molecule) > 0:
         # We can draw Species objects, so use that instead of an adjacency list
         adjlist = item.molecule[0].toAdjacencyList(removeH=False)
-        url = urllib.quote(adjlist)
-        structure = '<img src="{0}" alt="{1}" title="{1}"/>'.format(reverse('rmgweb.main.views.drawMolecule', kwargs={'adjlist': url}), item.label)
+        structure = getImageMarkup('molecule', adjlist, item.label)
     elif isinstance(item, Species) and len(item.molecule) == 0:
         # We can draw Species objects, so use that instead of an adjacency list
         structure = item.label
     elif isinstance(item, Group):
         # We can draw Group objects, so use that instead of an adjacency list
         adjlist = item.toAdjacencyList()
-        url = urllib.quote(adjlist)
-        structure = '<img src="{0}" alt="{1}" title="{1}" />'.format(reverse('rmgweb.main.views.drawGroup', kwargs={'adjlist': url}), adjlist)
-        #structure += '<pre style="font-size:small;" class="adjacancy_list">{0}</pre>'.format(adjlist)
+        structure = getImageMarkup('group', adjlist, adjlist)
     elif isinstance(item, str) or isinstance(item, unicode):
         structure = item
     else:
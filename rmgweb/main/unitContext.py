@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#    RMG Website - A Django-powered website for Reaction Mechanism Generator
+#
+#    Copyright (c) 2011 Prof. William H. Green (whgreen@mit.edu) and the
+#    RMG Team (rmg_dev@mit.edu)
+#
+#    Permission is hereby granted, free of charge, to any person obtaining a
+#    copy of this software and associated documentation files (the 'Software'),
+#    to deal in the Software without restriction, including without limitation
+#    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#    and/or sell copies of the Software, and to permit persons to whom the
+#    Software is furnished to do so, subject to the following conditions:
+#
+#    The above copyright notice and this permission notice shall be included in
+#    all copies or substantial portions of the Software.
+#
+#    THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#    FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#    DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+from django.utils.functional import SimpleLazyObject
+
+from rmgpy.quantity import Quantity
+
+# Conversion factors from SI, keyed on units
+conversionFactors = {}
+
+def getConversionFactorFromSI(units):
+    """
+    Return the factor converting a value in SI units to `units`.
+    """
+    try:
+        return conversionFactors[units]
+    except KeyError:
+        factor = conversionFactors[units] = Quantity(1, units).getConversionFactorFromSI()
+        return factor
+
+class UnitContext(object):
+    """
+    The units in which a user wants quantities displayed, as set in their
+    profile. Each attribute is ``None`` for anonymous users, in which case
+    each template filter uses its own default units.
+    """
+
+    def __init__(self, profile=None):
+        self.temperature = str(profile.temperatureUnits) if profile else None
+        self.pressure = str(profile.pressureUnits) if profile else None
+        self.energy = str(profile.energyUnits) if profile else None
+        self.heatCapacity = str(profile.heatCapacityUnits) if profile else None
+        self.rateCoefficient = str(profile.rateCoefficientUnits) if profile else None
+
+    @property
+    def signature(self):
+        """
+        A tuple of the preferred units, for use in cache keys.
+        """
+        return (self.temperature, self.pressure, self.energy, self.heatCapacity, self.rateCoefficient)
+
+def getUnitContext(user):
+    """
+    Return the :class:`UnitContext` for `user`, which may already be a
+    unit context (as passed from templates) or a :class:`User`. The user's
+    profile is only read once per request, as the context is kept on the
+    user object.
+    """
+    if isinstance(user, UnitContext):
+        return user
+    if not user or not user.is_authenticated():
+        return UnitContext()
+    try:
+        return user.unitContext
+    except AttributeError:
+        from rmgweb.main.models import UserProfile
+        user.unitContext = UnitContext(UserProfile.objects.get(user=user))
+        return user.unitContext
+
+def getUnits(request):
+    """
+    Context processor to return the unit context of the requesting user as
+    `units`, for passing to the rendering template filters. The user's
+    profile is only read if a filter uses it.
+    """
+    user = getattr(request, 'user', None)
+    return {'units': SimpleLazyObject(lambda: getUnitContext(user))}
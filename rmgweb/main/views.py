@@ -30,7 +30,7 @@
 
 from django.shortcuts import render_to_response
 from django.template import RequestContext, loader
-from django.http import HttpResponse, HttpResponseRedirect, HttpResponseNotFound, HttpResponseServerError
+from django.http import Http404, HttpResponse, HttpResponseRedirect, HttpResponseNotFound, HttpResponseNotModified, HttpResponseServerError
 import django.contrib.auth.views
 from django.core.urlresolvers import reverse
 from django.contrib import auth
@@ -38,9 +38,14 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
+from django.utils.cache import patch_cache_control
+import StringIO
 import urllib, urllib2
 
+from rmgpy.molecule.group import Group
+
 from forms import *
+from rmgweb.main.tools import DrawingCache, groupFromURL, moleculeFromURL, structure_store, structureURLs
 import os
 import re
 
@@ -278,48 +283,84 @@ def cactusResolver(request, query):
     response = f.read()
     return HttpResponse(response, content_type="text/plain")
     
-def drawMolecule(request, adjlist):
+# Drawings of molecules and groups, keyed on their structure keys
+drawing_cache = DrawingCache(settings.DRAWING_CACHE_PATH, settings.DRAWING_CACHE_SIZE, settings.DRAWING_CACHE_MAX_FILES)
+
+def getDrawingResponse(request, key, draw, persist=True):
     """
-    Returns an image of the provided adjacency list `adjlist` for a molecule.
-    urllib is used to quote/unquote the adjacency list.
+    Return a response containing the SVG drawing stored under `key` in the
+    drawing cache, calling `draw()` to create it if it is not cached yet.
+    New drawings are only written to disk if `persist` is ``True``.
+    Since the key identifies the content of the drawing, it doubles as a
+    strong ETag and the drawing can be cached by browsers indefinitely.
     """
-    from rmgpy.molecule import Molecule
-    from rmgpy.molecule.draw import MoleculeDrawer
-    from rmgpy.molecule.adjlist import InvalidAdjacencyListError
-    from django.templatetags.static import static
-
-    adjlist = str(urllib.unquote(adjlist))
-
-    try:
-        molecule = Molecule().fromAdjacencyList(adjlist)
-    except InvalidAdjacencyListError:
-        response = HttpResponseRedirect(static('img/invalid_icon.png'))
+    etag = '"{0}"'.format(key)
+    if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        response = HttpResponseNotModified()
     else:
-        response = HttpResponse(content_type="image/svg+xml")
-        MoleculeDrawer().draw(molecule, format='svg', target=response)
-
+        svgdata = drawing_cache.get(key)
+        if svgdata is None:
+            svgdata = draw()
+            drawing_cache.set(key, svgdata, persist)
+        response = HttpResponse(svgdata, content_type="image/svg+xml")
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.DRAWING_CACHE_MAX_AGE)
     return response
 
-def drawGroup(request, adjlist):
+def getMoleculeSVG(molecule):
     """
-    Returns an image of the provided adjacency list `adjlist` for a molecular
-    pattern.  urllib is used to quote/unquote the adjacency list.
+    Return an SVG drawing of the given :class:`Molecule` object `molecule`.
     """
-    from rmgpy.molecule.group import Group
+    from rmgpy.molecule.draw import MoleculeDrawer
 
-    response = HttpResponse(content_type="image/svg+xml")
+    svgdata = StringIO.StringIO()
+    MoleculeDrawer().draw(molecule, format='svg', target=svgdata)
+    return svgdata.getvalue()
 
-    adjlist = str(urllib.unquote(adjlist))
-    pattern = Group().fromAdjacencyList(adjlist)
+@structureURLs('adjlist')
+def drawMolecule(request, adjlist):
+    """
+    Returns an image of the molecule with the structure key `adjlist`.
+    Requests naming the molecule by its adjacency list are redirected.
+    Only the drawings of molecules linked to from the site are kept on disk.
+    """
+    def draw():
+        return getMoleculeSVG(moleculeFromURL(adjlist))
+
+    return getDrawingResponse(request, 'molecule_' + adjlist, draw, structure_store.is_shared(adjlist))
 
-    # Create an svg drawing of the group
-    svgdata = pattern.draw('svg')
-    # Remove the scale and rotate transformations applied by pydot
-    svgdata = re.sub(r'scale\(0\.722222 0\.722222\) rotate\(0\) ', '', svgdata)
+def drawMoleculePreview(request, adjlist):
+    """
+    Returns an image of the molecule with the (URL-quoted) adjacency list
+    `adjlist`, as typed into a form. Nothing is stored, since such previews
+    change with every keystroke.
+    """
+    from rmgpy.molecule import Molecule
+    from django.templatetags.static import static
 
-    response.write(svgdata)
+    try:
+        molecule = Molecule().fromAdjacencyList(str(urllib.unquote(adjlist)))
+        svgdata = getMoleculeSVG(molecule)
+    except Exception:
+        return HttpResponseRedirect(static('img/invalid_icon.png'))
+    return HttpResponse(svgdata, content_type="image/svg+xml")
 
-    return response
+@structureURLs('adjlist', cls=Group)
+def drawGroup(request, adjlist):
+    """
+    Returns an image of the molecular pattern with the structure key
+    `adjlist`. Requests naming the pattern by its adjacency list are
+    redirected. Only the drawings of patterns linked to from the site are
+    kept on disk.
+    """
+    def draw():
+        pattern = groupFromURL(adjlist)
+        # Create an svg drawing of the group
+        svgdata = pattern.draw('svg')
+        # Remove the scale and rotate transformations applied by pydot
+        return re.sub(r'scale\(0\.722222 0\.722222\) rotate\(0\) ', '', svgdata)
+
+    return getDrawingResponse(request, 'group_' + adjlist, draw, structure_store.is_shared(adjlist))
 
 @login_required
 def restartWSGI(request):
@@ -119,6 +119,7 @@ TEMPLATES = [
                 "django.core.context_processors.request",  # adds 'request' to every view
                 # Custom context processors
                 'rmgweb.main.gitContext.getCommits', # gets git commit hashes
+                'rmgweb.main.unitContext.getUnits', # gets the user's preferred units
             ],
             'loaders': [
                 # insert your TEMPLATE_LOADERS here
@@ -143,6 +144,8 @@ MIDDLEWARE_CLASSES = (
 
 ROOT_URLCONF = 'rmgweb.urls'
 
+WSGI_APPLICATION = 'rmgweb.wsgi.application'
+
 
 INSTALLED_APPS = (
     'django.contrib.auth',
@@ -166,3 +169,86 @@ INSTALLED_APPS = (
 # Settings relating to user account management
 LOGIN_URL = '/login'
 LOGIN_REDIRECT_URL = '/'
+
+# Settings relating to the in-memory copy of the RMG database
+# Path of a pickled snapshot of the fully loaded RMG database. New worker
+# processes load this snapshot instead of parsing the whole database, as long
+# as the database on disk has not changed since it was written.
+# Set to None to always parse the database.
+DATABASE_SNAPSHOT_PATH = os.path.join(PROJECT_PATH, 'cache', 'database.pkl')
+
+# Minimum number of seconds between checks of the database files for changes.
+# Changes saved through the website are picked up immediately by the process
+# that saved them; other processes will see them within this interval.
+DATABASE_CHECK_INTERVAL = 10
+
+# Load the entire RMG database when rmgweb.wsgi is imported. Use this with
+# servers that import the application once and then fork their workers
+# (e.g. gunicorn --preload), so that all workers share one copy of the
+# database in memory instead of each loading their own. Under mod_wsgi each
+# process still loads its own copy, but when it starts rather than when it
+# serves its first request.
+DATABASE_PRELOAD = False
+
+# Number of kinetics searches whose generated reactions are kept in memory
+KINETICS_SEARCH_CACHE_SIZE = 100
+
+# Number of worker processes used to search the kinetics families in parallel.
+# The workers are forked from the web server process, so they share its loaded
+# database. Set to 1 to search the families in the web server process itself.
+KINETICS_SEARCH_PROCESSES = 1
+
+# Number of species whose estimated thermo is kept in memory
+THERMO_CACHE_SIZE = 1000
+
+# Settings relating to the RMG-Java PopulateReactions service
+RMG_JAVA_HOST = 'localhost'
+RMG_JAVA_PORT = 5000
+# Socket timeout in seconds
+RMG_JAVA_TIMEOUT = 10
+# Maximum number of simultaneous connections to the service from each process
+RMG_JAVA_CONNECTIONS = 4
+# Seconds to wait after failing to connect before trying the service again
+RMG_JAVA_RETRY_INTERVAL = 60
+# Directory in which responses from the service are cached, or None to disable
+RMG_JAVA_CACHE_PATH = os.path.join(PROJECT_PATH, 'cache', 'rmgjava')
+# Seconds to keep a cached response, or None to keep it until purged with
+# "python manage.py purge_rmgjava_cache"
+RMG_JAVA_CACHE_TTL = 30 * 24 * 60 * 60
+
+# Number of entries shown on each page of a database table. Add "stream=1" to
+# the query string to stream the whole table instead.
+DATABASE_TABLE_PAGE_SIZE = 100
+
+# Number of rendered structures (molecule and group images and links) kept in
+# memory, keyed on their adjacency lists and on the database entries drawn
+STRUCTURE_CACHE_SIZE = 10000
+
+# Directory in which drawings of molecules and groups are cached, named after
+# a hash of their adjacency lists, or None to only cache them in memory
+DRAWING_CACHE_PATH = os.path.join(PROJECT_PATH, 'cache', 'drawings')
+# Number of drawings kept in memory by each process
+DRAWING_CACHE_SIZE = 1000
+# Number of drawings kept on disk, the least recently used being deleted
+# first, or None to keep them all
+DRAWING_CACHE_MAX_FILES = 100000
+# Seconds for which browsers may reuse a drawing without asking again
+DRAWING_CACHE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Directory in which the adjacency lists of the structures linked to from the
+# site are stored, so that URLs can name them by a short hash. Clearing it
+# breaks links that were handed out before.
+STRUCTURE_STORE_PATH = os.path.join(PROJECT_PATH, 'cache', 'structures')
+# Number of adjacency lists kept on disk, the least recently used being
+# deleted first, or None to keep them all
+STRUCTURE_STORE_MAX_FILES = 100000
+
+# Number of rendered kinetics and thermo blocks kept in memory
+RENDER_CACHE_SIZE = 2000
+
+# Number of rendered kinetics family and library trees kept in memory
+KINETICS_TREE_CACHE_SIZE = 100
+
+# Number of plots of kinetics and thermo search results kept in memory, in
+# the units they were requested in
+PLOT_DATA_CACHE_SIZE = 1000
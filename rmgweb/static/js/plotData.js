@@ -0,0 +1,71 @@
+///////////////////////////////////////////////////////////////////////////////
+//
+//  plotData.js - Loading of plot data for results pages
+//
+//  Copyright (c) 2011 Prof. William H. Green (whgreen@mit.edu) and the
+//  RMG Team (rmg_dev@mit.edu)
+//
+//  Permission is hereby granted, free of charge, to any person obtaining a
+//  copy of this software and associated documentation files (the 'Software'),
+//  to deal in the Software without restriction, including without limitation
+//  the rights to use, copy, modify, merge, publish, distribute, sublicense,
+//  and/or sell copies of the Software, and to permit persons to whom the
+//  Software is furnished to do so, subject to the following conditions:
+//
+//  The above copyright notice and this permission notice shall be included in
+//  all copies or substantial portions of the Software.
+//
+//  THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+//  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+//  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+//  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+//  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+//  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+//  DEALINGS IN THE SOFTWARE.
+//
+////////////////////////////////////////////////////////////////////////////////
+/**
+ * Call `callback` once the element with the given `id` has been scrolled
+ * into view, or at once if the browser cannot tell.
+ */
+function whenVisible(id, callback) {
+    var element = document.getElementById(id);
+    if (!element || !('IntersectionObserver' in window)) {
+        callback();
+        return;
+    }
+    var observer = new IntersectionObserver(function(entries) {
+        for (var i = 0; i < entries.length; i++) {
+            if (entries[i].isIntersecting) {
+                observer.disconnect();
+                callback();
+                return;
+            }
+        }
+    }, {rootMargin: '200px'});
+    observer.observe(element);
+}
+
+/**
+ * Fetch the plot data of several results of the current page in parallel.
+ * Each of the `loaders` has the 1-based index of its `result` and an `add`
+ * function taking its data. The data are added in result order once every
+ * request has finished, after which `plot` is called. Results whose data
+ * could not be loaded are left out.
+ */
+function loadPlotData(loaders, plot) {
+    var results = new Array(loaders.length);
+    var requests = $.map(loaders, function(loader, i) {
+        var done = $.Deferred();
+        $.getJSON(window.location.pathname, {plot: loader.result})
+            .done(function(data) { results[i] = data; })
+            .always(function() { done.resolve(); });
+        return done;
+    });
+    $.when.apply($, requests).done(function() {
+        for (var i = 0; i < loaders.length; i++) {
+            if (results[i]) loaders[i].add(results[i]);
+        }
+        plot();
+    });
+}
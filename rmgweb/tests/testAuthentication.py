@@ -89,3 +89,16 @@ class postLogInTest(TestCase):
         response = self.client.get('/logout')
 
         self.assertEqual(response.status_code, 200)
+
+    def test_unit_context(self):
+        """
+        Test that the user's profile is only read once for their units
+        """
+        from rmgweb.main.unitContext import getUnitContext
+
+        user = User.objects.get(username='testuser')
+        with self.assertNumQueries(1):
+            units = getUnitContext(user)
+            self.assertTrue(getUnitContext(user) is units)
+        self.assertEqual(units.temperature, 'K')
+        self.assertTrue(getUnitContext(units) is units)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#	RMG Website - A Django-powered website for Reaction Mechanism Generator
+#
+#	Copyright (c) 2011 Prof. William H. Green (whgreen@mit.edu) and the
+#	RMG Team (rmg_dev@mit.edu)
+#
+#	Permission is hereby granted, free of charge, to any person obtaining a
+#	copy of this software and associated documentation files (the 'Software'),
+#	to deal in the Software without restriction, including without limitation
+#	the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#	and/or sell copies of the Software, and to permit persons to whom the
+#	Software is furnished to do so, subject to the following conditions:
+#
+#	The above copyright notice and this permission notice shall be included in
+#	all copies or substantial portions of the Software.
+#
+#	THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#	FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#	DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy
+
+from django.test import TestCase
+
+from rmgpy.data.base import Entry
+from rmgpy.molecule import Molecule
+
+from rmgweb.main.tools import cachedRendering, DrawingCache, getJSONObject, LRUCache, StructureStore, getStructureInfo, moleculeToAdjlist, structure_cache
+
+class LRUCacheTests(TestCase):
+    def test_get_set(self):
+        cache = LRUCache(size=2)
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('b', 2), 2)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+        self.assertTrue('c' in cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_clear(self):
+        cache = LRUCache(size=2)
+        cache.set('a', 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class DrawingCacheTests(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_shared_on_disk(self):
+        cache = DrawingCache(self.path)
+        key = 'molecule_0123456789abcdef0123'
+        self.assertEqual(cache.get(key), None)
+        cache.set(key, '<svg/>')
+        self.assertEqual(DrawingCache(self.path).get(key), '<svg/>')
+
+class StructureStoreTests(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_key(self):
+        store = StructureStore(self.path)
+        key = store.get_key('1 C u0 p0 c0\n')
+        self.assertTrue(store.is_key(key))
+        self.assertFalse(store.is_key('1 C u0 p0 c0'))
+        self.assertEqual(key, store.get_key('\n  1 C u0 p0 c0'))
+
+    def test_shared_on_disk(self):
+        store = StructureStore(self.path)
+        key = store.add('1 C u0 p0 c0')
+        self.assertEqual(StructureStore(self.path).get(key), '1 C u0 p0 c0')
+        self.assertEqual(store.get(store.get_key('1 O u0 p2 c0')), None)
+
+    def test_not_persisted(self):
+        store = StructureStore(self.path)
+        key = store.add('1 C u0 p0 c0', persist=False)
+        self.assertEqual(store.get(key), '1 C u0 p0 c0')
+        self.assertFalse(store.is_shared(key))
+        self.assertEqual(StructureStore(self.path).get(key), None)
+        store.add('1 C u0 p0 c0')
+        self.assertTrue(store.is_shared(key))
+
+    def test_keeps_persistence(self):
+        store = StructureStore(self.path)
+        key = store.add('1 C u0 p0 c0', persist=False)
+        store.add('1 C u0 p0 c0', persist=None)
+        self.assertFalse(store.is_shared(key))
+        key = store.add('1 O u0 p2 c0', persist=None)
+        self.assertTrue(store.is_shared(key))
+
+    def test_purge(self):
+        store = StructureStore(self.path, maxFiles=10)
+        store.purgeInterval = 5
+        for i in range(20):
+            store.add('1 C u0 p0 c0\n' * (i + 1))
+        self.assertTrue(len(os.listdir(self.path)) <= 10)
+
+class StructureCacheTests(TestCase):
+    def test_transient_molecules(self):
+        """
+        Test that equal molecules share one cached markup
+        """
+        structure_cache.clear()
+        markup = getStructureInfo(Molecule().fromSMILES('CCO'))
+        count = len(structure_cache)
+        self.assertEqual(getStructureInfo(Molecule().fromSMILES('CCO')), markup)
+        self.assertEqual(len(structure_cache), count)
+
+    def test_entry(self):
+        """
+        Test that an entry renders the same markup as its item
+        """
+        molecule = Molecule().fromSMILES('CCO')
+        entry = Entry(index=1, label='ethanol', item=molecule)
+        self.assertEqual(getStructureInfo(entry), getStructureInfo(molecule))
+        self.assertEqual(getStructureInfo(entry), getStructureInfo(molecule))
+
+    def test_moleculeToAdjlist(self):
+        """
+        Test that atom labels are cleared without modifying the molecule
+        """
+        molecule = Molecule().fromSMILES('CCO')
+        molecule.atoms[0].label = '*1'
+        self.assertTrue('*1' not in moleculeToAdjlist(molecule))
+        self.assertTrue(molecule.containsLabeledAtom())
+
+class RenderCacheTests(TestCase):
+    def test_cached_rendering(self):
+        """
+        Test that a filter only renders the same data once
+        """
+        calls = []
+        @cachedRendering
+        def render_test(data, user=None):
+            calls.append(data)
+            return '{0} {1}'.format(data, user.temperature)
+
+        self.assertEqual(render_test(1.5), '1.5 None')
+        self.assertEqual(render_test(1.5), '1.5 None')
+        self.assertEqual(render_test(2.5), '2.5 None')
+        self.assertEqual(calls, [1.5, 2.5])
+
+    def test_full_precision(self):
+        """
+        Test that data differing beyond the precision of its repr are
+        rendered separately
+        """
+        calls = []
+        @cachedRendering
+        def render_test(data, user=None):
+            calls.append(data)
+            return repr(data)
+
+        render_test(numpy.array([1.0]))
+        render_test(numpy.array([1.0 + 1e-12]))
+        self.assertEqual(len(calls), 2)
+
+class JSONTests(TestCase):
+    def test_non_finite(self):
+        """
+        Test that NaN and infinite values are written as null
+        """
+        data = {'x': numpy.array([1.0, float('nan'), float('inf')]), 'y': float('-inf'), 'z': {'a': float('nan')}}
+        self.assertEqual(json.loads(getJSONObject(data)), {'x': [1.0, None, None], 'y': None, 'z': {'a': None}})
@@ -0,0 +1,33 @@
+from django.test import TestCase
+from rmgpy.data.base import Entry
+from rmgweb.database.forms import DatabaseTableFilterForm
+
+class DatabaseTableFilterTest(TestCase):
+
+    def setUp(self):
+        self.entries = [
+            (Entry(index=1, label='C'), 'Group additivity'),
+            (Entry(index=2, label='C-CH3'), 'Group additivity'),
+            (Entry(index=3, label='CH4'), 'NASA'),
+        ]
+        self.dataFormats = ['Group additivity', 'NASA']
+
+    def test_no_filter(self):
+        """
+        Test that an empty filter keeps every entry
+        """
+        form = DatabaseTableFilterForm({}, dataFormats=self.dataFormats)
+        self.assertEqual(form.filter(self.entries), self.entries)
+
+    def test_filter(self):
+        """
+        Test filtering by label, index range and data format
+        """
+        form = DatabaseTableFilterForm({'label': 'ch'}, dataFormats=self.dataFormats)
+        self.assertEqual([entry.index for entry, dataFormat in form.filter(self.entries)], [2, 3])
+
+        form = DatabaseTableFilterForm({'start': '2', 'end': '2'}, dataFormats=self.dataFormats)
+        self.assertEqual([entry.index for entry, dataFormat in form.filter(self.entries)], [2])
+
+        form = DatabaseTableFilterForm({'format': 'NASA'}, dataFormats=self.dataFormats)
+        self.assertEqual([entry.index for entry, dataFormat in form.filter(self.entries)], [3])
@@ -0,0 +1,86 @@
+from django.test import TestCase
+import json
+import numpy
+from rmgpy.kinetics import Arrhenius, ArrheniusEP, MultiArrhenius, PDepArrhenius, Chebyshev
+from rmgweb.main.tools import getJSONObject, getRateCoefficients
+from rmgweb.main.templatetags.render_kinetics import getArrheniusFit, getRateCoefficientData
+
+class RateCoefficientsTest(TestCase):
+
+    def setUp(self):
+        self.Tlist = numpy.array([300., 500., 1000., 1500.])
+        self.Plist = numpy.array([1e3, 1e4, 1e5, 1e6])
+        self.arrhenius = Arrhenius(A=(1e6, 'cm^3/(mol*s)'), n=1.5, Ea=(10., 'kJ/mol'), T0=(1, 'K'))
+
+    def assertMatchesModel(self, kinetics, kdata, P=None):
+        for i, T in enumerate(self.Tlist):
+            if P is None:
+                k = kinetics.getRateCoefficient(T)
+            else:
+                k = kinetics.getRateCoefficient(T, P)
+            self.assertAlmostEqual(kdata[i] / k, 1.0, 6)
+
+    def test_arrhenius(self):
+        """
+        Test the vectorized pressure-independent models
+        """
+        self.assertMatchesModel(self.arrhenius, getRateCoefficients(self.arrhenius, self.Tlist))
+
+        kinetics = ArrheniusEP(A=(1e6, 'cm^3/(mol*s)'), n=1.5, alpha=0.5, E0=(10., 'kJ/mol'))
+        kdata = getRateCoefficients(kinetics, self.Tlist)
+        for i, T in enumerate(self.Tlist):
+            self.assertAlmostEqual(kdata[i] / kinetics.getRateCoefficient(T, dHrxn=0), 1.0, 6)
+
+        kinetics = MultiArrhenius(arrhenius=[self.arrhenius, Arrhenius(A=(1e8, 'cm^3/(mol*s)'), n=0., Ea=(30., 'kJ/mol'), T0=(1, 'K'))])
+        self.assertMatchesModel(kinetics, getRateCoefficients(kinetics, self.Tlist))
+
+    def test_pressure_dependent(self):
+        """
+        Test the vectorized pressure-dependent models
+        """
+        kinetics = PDepArrhenius(
+            pressures=([1e-2, 1e0, 1e2], 'bar'),
+            arrhenius=[
+                Arrhenius(A=(1e5, 'cm^3/(mol*s)'), n=1., Ea=(10., 'kJ/mol'), T0=(1, 'K')),
+                Arrhenius(A=(1e6, 'cm^3/(mol*s)'), n=1., Ea=(12., 'kJ/mol'), T0=(1, 'K')),
+                Arrhenius(A=(1e7, 'cm^3/(mol*s)'), n=1., Ea=(15., 'kJ/mol'), T0=(1, 'K')),
+            ],
+        )
+        kdata = getRateCoefficients(kinetics, self.Tlist, self.Plist)
+        for j, P in enumerate(self.Plist):
+            self.assertMatchesModel(kinetics, kdata[j], P)
+
+        kinetics = Chebyshev(
+            coeffs=numpy.array([[11.67, 0.2, -0.1], [-0.5, 0.1, 0.02], [0.1, -0.05, 0.01], [0.02, 0.01, -0.005]]),
+            kunits='cm^3/(mol*s)',
+            Tmin=(300, 'K'), Tmax=(2000, 'K'),
+            Pmin=(0.01, 'bar'), Pmax=(100, 'bar'),
+        )
+        kdata = getRateCoefficients(kinetics, self.Tlist, self.Plist)
+        for j, P in enumerate(self.Plist):
+            self.assertMatchesModel(kinetics, kdata[j], P)
+
+class PlotDataTest(TestCase):
+
+    def setUp(self):
+        self.arrhenius = Arrhenius(A=(1e6, 'cm^3/(mol*s)'), n=1.5, Ea=(10., 'kJ/mol'), T0=(1, 'K'))
+
+    def test_plot_data(self):
+        """
+        Test that the plot data are sent as JSON in the default units
+        """
+        data = json.loads(getJSONObject(getRateCoefficientData(self.arrhenius)))
+        self.assertEqual(len(data['Tlist']), len(data['klist']))
+        self.assertEqual(data['Plist'], [])
+        self.assertEqual(data['kunits'], 'm^3/(mol*s)')
+        self.assertIsNone(getRateCoefficientData(None))
+
+    def test_arrhenius_fit(self):
+        """
+        Test that fitting an Arrhenius expression recovers its parameters
+        """
+        fit = getArrheniusFit(self.arrhenius)
+        self.assertAlmostEqual(fit['A'] / self.arrhenius.A.value_si, 1.0, 4)
+        self.assertAlmostEqual(fit['n'], 1.5, 4)
+        self.assertAlmostEqual(fit['Ea'] / 10000., 1.0, 4)
+        self.assertEqual(fit['Pnote'], '')
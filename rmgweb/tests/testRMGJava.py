@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#	RMG Website - A Django-powered website for Reaction Mechanism Generator
+#
+#	Copyright (c) 2011 Prof. William H. Green (whgreen@mit.edu) and the
+#	RMG Team (rmg_dev@mit.edu)
+#
+#	Permission is hereby granted, free of charge, to any person obtaining a
+#	copy of this software and associated documentation files (the 'Software'),
+#	to deal in the Software without restriction, including without limitation
+#	the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#	and/or sell copies of the Software, and to permit persons to whom the
+#	Software is furnished to do so, subject to the following conditions:
+#
+#	The above copyright notice and this permission notice shall be included in
+#	all copies or substantial portions of the Software.
+#
+#	THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#	FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#	DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+import os
+import shutil
+import socket
+import SocketServer
+import tempfile
+import threading
+import time
+
+from django.test import TestCase
+
+from rmgweb.database.rmgjava import RMGJavaCache, RMGJavaClient, RMGJavaError
+
+class PopulateReactionsHandler(SocketServer.StreamRequestHandler):
+    """
+    A stand-in for the RMG-Java PopulateReactions service, which replies to
+    each input with a response naming the number of reactants it was sent.
+    """
+    def handle(self):
+        reactants = 0
+        for line in iter(self.rfile.readline, ''):
+            if line.startswith('END'):
+                break
+            if line.startswith('reactant'):
+                reactants += 1
+        self.wfile.write('response {0:d}\n'.format(reactants) + 'x' * 100000)
+
+class SilentHandler(SocketServer.StreamRequestHandler):
+    """
+    A stand-in for a service that accepts connections but never responds.
+    """
+    def handle(self):
+        time.sleep(1)
+
+class ClosingHandler(SocketServer.StreamRequestHandler):
+    """
+    A stand-in for a service that closes connections without responding.
+    """
+    def handle(self):
+        pass
+
+class ThreadingTCPServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    daemon_threads = True
+
+class RMGJavaClientTests(TestCase):
+    def setUp(self):
+        self.server = ThreadingTCPServer(('localhost', 0), PopulateReactionsHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_query(self):
+        client = RMGJavaClient(port=self.port)
+        response = client.query('reactant1 (molecule/cm3) 1\n\nEND\n')
+        self.assertTrue(response.startswith('response 1\n'))
+        self.assertEqual(len(response), len('response 1\n') + 100000)
+
+    def test_query_many(self):
+        client = RMGJavaClient(port=self.port, connections=2)
+        requests = ['reactant1 (molecule/cm3) 1\n\n' * n + 'END\n' for n in range(1, 6)]
+        responses = client.query_many(requests)
+        for n, response in enumerate(responses):
+            self.assertTrue(response.startswith('response {0:d}\n'.format(n + 1)))
+
+    def test_circuit_breaker(self):
+        # Find a port with nothing listening on it
+        sock = socket.socket()
+        sock.bind(('localhost', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+
+        client = RMGJavaClient(port=port, retryInterval=60)
+        self.assertRaises(RMGJavaError, client.query, 'END\n')
+        self.assertFalse(client.is_available())
+        # Pointing the client at a running service doesn't help until the retry interval has passed
+        client.port = self.port
+        self.assertRaises(RMGJavaError, client.query, 'END\n')
+        client.retryInterval = 0
+        self.assertTrue(client.query('END\n').startswith('response 0\n'))
+        self.assertTrue(client.is_available())
+
+    def check_failure(self, handler, **kwargs):
+        server = ThreadingTCPServer(('localhost', 0), handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            client = RMGJavaClient(port=server.server_address[1], retryInterval=60, **kwargs)
+            self.assertRaises(RMGJavaError, client.query, 'END\n')
+            self.assertFalse(client.is_available())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_timeout_trips_breaker(self):
+        self.check_failure(SilentHandler, timeout=0.1)
+
+    def test_empty_response_trips_breaker(self):
+        self.check_failure(ClosingHandler)
+
+class RMGJavaCacheTests(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_get_set(self):
+        cache = RMGJavaCache(self.path)
+        key = (('InChI=1S/CH4/h1H4', 'C'),)
+        self.assertEqual(cache.get(key), None)
+        cache.set(key, [[['reactant1', '1 C u0']], ['reactant1 --> product1']])
+        self.assertEqual(cache.get(key), [[['reactant1', '1 C u0']], ['reactant1 --> product1']])
+
+    def test_expired(self):
+        cache = RMGJavaCache(self.path, ttl=60)
+        cache.set('old', 1)
+        cache.set('new', 2)
+        # Make the first response older than the time to live
+        filename = cache.get_filename('old')
+        os.utime(filename, (os.stat(filename).st_atime, os.stat(filename).st_mtime - 120))
+        self.assertEqual(cache.get('old'), None)
+        self.assertEqual(cache.get('new'), 2)
+        self.assertEqual(cache.purge(expiredOnly=True), 1)
+        self.assertEqual(cache.purge(), 1)
+        self.assertEqual(cache.get('new'), None)
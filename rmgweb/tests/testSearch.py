@@ -1,4 +1,13 @@
+from django.core.urlresolvers import reverse
 from django.test import TestCase
+import cPickle
+import json
+from rmgpy.molecule import Molecule
+from rmgpy.data.kinetics import DepositoryReaction
+from rmgpy.species import Species
+from rmgweb.database import views
+from rmgweb.main.tools import moleculeToURL
+from rmgweb.database.tools import database, generateFamilyReactions, generateReactions, getAllSpeciesThermoData, getSearchPool, releaseSearchPool, resolveDepositoryReaction
 
 
 class KineticsTest(TestCase):
@@ -177,3 +186,165 @@ multiplicity 2
 
         self.assertEqual(response.status_code, 302)
 
+
+class EniBatchTest(TestCase):
+
+    def test_eni_batch_json(self):
+        """
+        Test that the Eni batch screening returns a binding strength matrix
+        """
+        import json
+
+        response = self.client.post('/database/eni/batch/', {'detergents': 'CCO\nCC(=O)O',
+                                                             'deposits': 'c1ccccc1\nCN\nO',
+                                                             'format': 'json'})
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(len(data['detergents']), 2)
+        self.assertEqual(len(data['deposits']), 3)
+        self.assertEqual(len(data['logKAB']), 2)
+        self.assertEqual(len(data['logKAB'][0]), 3)
+        self.assertAlmostEqual(data['logKAB'][1][2], 7.354 * data['detergents'][1]['A'] * data['deposits'][2]['B'])
+
+
+class KineticsSearchPoolTest(TestCase):
+
+    def test_family_reactions(self):
+        """
+        Test that depository estimates from a search worker are resolved to
+        the entries of the depository
+        """
+        database.load('kinetics')
+        reactants = [Molecule().fromSMILES('C'), Molecule().fromSMILES('[OH]')]
+        # The results are pickled on their way back from the worker process
+        results = cPickle.loads(cPickle.dumps(generateFamilyReactions(('H_Abstraction', reactants, None, True)), -1))
+        count = 0
+        for reaction, kineticsList in results:
+            for rxn, reference in kineticsList:
+                if reference is not None:
+                    resolveDepositoryReaction(database, rxn, reference)
+                    self.assertEqual(rxn.depository.label, reference[0])
+                    self.assertIs(rxn.entry, database.get_entry(rxn.depository, reference[1]))
+                    count += 1
+        self.assertTrue(count > 0)
+
+    def test_replaced_pool(self):
+        """
+        Test that a pool replaced after the database is reloaded can still be
+        used by the searches that were using it
+        """
+        database.load('kinetics')
+        pool = getSearchPool(database)
+        database.versions['kinetics'] += 1
+        newPool = getSearchPool(database)
+        self.assertIsNot(newPool, pool)
+        self.assertEqual(pool.map(abs, [-1, -2]), [1, 2])
+        releaseSearchPool(pool)
+        releaseSearchPool(newPool)
+
+
+class ReactionCacheTest(TestCase):
+
+    def test_copies(self):
+        """
+        Test that changing the reactions of a search does not change the
+        cached results, while the database entries are still shared
+        """
+        database.load('kinetics')
+        reactants = [Molecule().fromSMILES('C'), Molecule().fromSMILES('[OH]')]
+        first = generateReactions(database, reactants, only_families=['H_Abstraction'])
+        for reaction in first:
+            reaction.kinetics = None
+            reaction.reactants[0].thermo = None
+        second = generateReactions(database, reactants, only_families=['H_Abstraction'])
+        self.assertEqual(len(first), len(second))
+        for reaction1, reaction2 in zip(first, second):
+            self.assertIsNotNone(reaction2.kinetics)
+            if isinstance(reaction2, DepositoryReaction):
+                self.assertIs(reaction1.entry, reaction2.entry)
+                self.assertIs(reaction1.depository, reaction2.depository)
+
+
+class ThermoCacheTest(TestCase):
+
+    def test_copies(self):
+        """
+        Test that changing the estimated thermo does not change the cache
+        """
+        database.load('thermo')
+        first = getAllSpeciesThermoData(Species().fromSMILES('CCO'), database)
+        for data, library, entry in first:
+            data.comment = 'changed'
+        second = getAllSpeciesThermoData(Species().fromSMILES('CCO'), database)
+        self.assertEqual(len(first), len(second))
+        for (data1, library1, entry1), (data2, library2, entry2) in zip(first, second):
+            self.assertIsNot(data1, data2)
+            self.assertNotEqual(data2.comment, 'changed')
+            self.assertIs(entry1, entry2)
+
+    def test_resonance_copies(self):
+        """
+        Test that species given cached resonance structures get their own
+        copies of all of them
+        """
+        database.load('thermo')
+        first = Species().fromSMILES('C=C[CH2]')
+        getAllSpeciesThermoData(first, database)
+        second = Species().fromSMILES('C=C[CH2]')
+        getAllSpeciesThermoData(second, database)
+        self.assertEqual(len(first.molecule), len(second.molecule))
+        self.assertTrue(len(second.molecule) > 1)
+        for molecule1, molecule2 in zip(first.molecule, second.molecule):
+            self.assertIsNot(molecule1, molecule2)
+            self.assertTrue(molecule1.isIsomorphic(molecule2))
+
+
+class PlotDataTest(TestCase):
+
+    def test_kinetics_plot_data(self):
+        """
+        Test that the kinetics of a single result are sent as JSON
+        """
+        url = reverse(views.kineticsData, kwargs={'reactant1': moleculeToURL(Molecule().fromSMILES('C')),
+                                                  'reactant2': moleculeToURL(Molecule().fromSMILES('[OH]'))})
+        response = self.client.get(url, {'plot': 1})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(len(data['Tlist']), len(data['klist']))
+        self.assertIn('A', data['fit'])
+
+        self.assertEqual(self.client.get(url, {'plot': 0}).status_code, 404)
+        self.assertEqual(self.client.get(url, {'plot': 'x'}).status_code, 404)
+
+        # Repeated requests for the same plot are answered from the cache
+        views.plot_data_cache.clear()
+        response = self.client.get(url, {'plot': 1})
+        self.assertEqual(len(views.plot_data_cache), 1)
+        self.assertEqual(self.client.get(url, {'plot': 1}).content, response.content)
+        self.assertEqual(len(views.plot_data_cache), 1)
+
+    def test_new_entry(self):
+        """
+        Test that the new kinetics entry is only made when asked for
+        """
+        url = reverse(views.kineticsData, kwargs={'reactant1': moleculeToURL(Molecule().fromSMILES('C')),
+                                                  'reactant2': moleculeToURL(Molecule().fromSMILES('[OH]')),
+                                                  'product1': moleculeToURL(Molecule().fromSMILES('[CH3]')),
+                                                  'product2': moleculeToURL(Molecule().fromSMILES('O'))})
+        response = self.client.get(url)
+        self.assertEqual(response.context['new_entry_form'].initial['entry'], '')
+        response = self.client.get(url, {'new_entry': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('label = ', response.content)
+        self.assertNotIn('index = ', response.content)
+
+    def test_thermo_plot_data(self):
+        """
+        Test that the thermo of a single result is sent as JSON
+        """
+        url = reverse(views.thermoData, kwargs={'adjlist': moleculeToURL(Molecule().fromSMILES('CCO'))})
+        response = self.client.get(url, {'plot': 1})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(len(data['Tlist']), len(data['Cplist']))
@@ -4,12 +4,14 @@ from django.utils.encoding import iri_to_uri
 from rmgpy.species import Species
 from rmgpy.reaction import Reaction
 from rmgweb.database.views import getReactionUrl
+from rmgpy.molecule import Molecule
+from rmgweb.main.tools import moleculeFromURL, moleculeToURL, structure_store
 
 class urlTest(TestCase):
 
     def test_kinetics_search(self):
         """
-        Test whether url is only encoded once
+        Test whether the search redirects to a url naming the reactants by key
         """
 
         reactant1 = """
@@ -30,13 +32,13 @@ multiplicity 2
                                                                    'resonance': False})
 
         base_url = 'http://testserver/database/kinetics/results/reactant1={0}__reactant2={1}__res=False'
-        expected_url = iri_to_uri(base_url.format(reactant1, reactant2))
+        expected_url = base_url.format(structure_store.get_key(reactant1), structure_store.get_key(reactant2))
 
         self.assertRedirects(response, expected_url)
 
     def test_getReactionURL(self):
         """
-        Test whether url is only encoded once
+        Test whether the reaction url names the species by key
         """
 
         reactant1 = Species().fromSMILES('[CH3]')
@@ -48,9 +50,36 @@ multiplicity 2
         url = getReactionUrl(reaction, resonance=False)
 
         base_url = '/database/kinetics/reaction/reactant1={0}__reactant2={1}__product1={2}__res=False'
-        expected_url = iri_to_uri(base_url.format(reactant1.toAdjacencyList(),
-                                                  reactant2.toAdjacencyList(),
-                                                  product1.toAdjacencyList()))
+        expected_url = base_url.format(structure_store.get_key(reactant1.toAdjacencyList()),
+                                       structure_store.get_key(reactant2.toAdjacencyList()),
+                                       structure_store.get_key(product1.toAdjacencyList()))
 
         self.assertEqual(url, expected_url)
 
+
+        self.assertTrue(moleculeFromURL(url.split('reactant1=')[1].split('__')[0]).isIsomorphic(reactant1.molecule[0]))
+
+    def test_legacy_url(self):
+        """
+        Test whether urls naming a structure by adjacency list are redirected
+        """
+        adjlist = """
+1 C u0 p0 c0 {2,S} {3,S} {4,S} {5,S}
+2 H u0 p0 c0 {1,S}
+3 H u0 p0 c0 {1,S}
+4 H u0 p0 c0 {1,S}
+5 H u0 p0 c0 {1,S}
+"""
+        key = moleculeToURL(Molecule().fromAdjacencyList(adjlist))
+        response = self.client.get(iri_to_uri('/database/molecule/' + adjlist) + '?plot=1')
+        self.assertEqual(response.status_code, 301)
+        self.assertTrue(response['Location'].endswith('/database/molecule/' + key + '?plot=1'))
+
+    def test_invalid_url(self):
+        """
+        Test that structures which cannot be parsed are not found, nor stored
+        """
+        adjlist = 'not an adjacency list'
+        response = self.client.get(iri_to_uri('/database/molecule/' + adjlist))
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(structure_store.get(structure_store.get_key(adjlist)))
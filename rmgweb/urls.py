@@ -86,6 +86,7 @@ urlpatterns = [
     url(r'^pdep/', include('rmgweb.pdep.urls')),
 
     # Molecule drawing
+    url(r'^molecule/preview/(?P<adjlist>[\S\s]+)$', rmgweb.main.views.drawMoleculePreview),
     url(r'^molecule/(?P<adjlist>[\S\s]+)$', rmgweb.main.views.drawMolecule),
     url(r'^group/(?P<adjlist>[\S\s]+)$', rmgweb.main.views.drawGroup),
     